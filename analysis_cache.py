@@ -0,0 +1,114 @@
+# analysis_cache.py
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import gemini_service
+
+# 모델 파일(models/) 옆에 저장되는 분석 결과 캐시
+ANALYSIS_CACHE_DIR = os.path.join('models', '.analysis_cache')
+MEMORY_CACHE_SIZE = 64
+# 이보다 큰 모델은 처음 ANALYSIS_MAX_TABLES개 테이블만 보내 분석 (프롬프트 크기 제한)
+ANALYSIS_MAX_MODEL_CHARS = 50000
+ANALYSIS_MAX_TABLES = 5
+
+_memory_cache = OrderedDict()
+_memory_lock = threading.Lock()
+# 같은 모델을 동시에 분석하지 않도록 키별 잠금
+_key_locks = {}
+
+
+def model_content_hash(model_json_str):
+    """모델 JSON의 내용 해시 (공백/키 순서 차이는 무시)."""
+    try:
+        canonical = json.dumps(json.loads(model_json_str), sort_keys=True, ensure_ascii=False)
+    except (TypeError, ValueError):
+        canonical = model_json_str
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()
+
+def _analysis_input(model_json_str):
+    """Gemini에 보낼 모델 JSON. 너무 큰 모델은 앞쪽 테이블만 남겨 간소화합니다."""
+    if len(model_json_str) <= ANALYSIS_MAX_MODEL_CHARS:
+        return model_json_str
+    try:
+        model = json.loads(model_json_str)
+    except (TypeError, ValueError):
+        return model_json_str
+    return json.dumps({"tables": model.get("tables", [])[:ANALYSIS_MAX_TABLES]}, ensure_ascii=False)
+
+def _remember(key, result):
+    with _memory_lock:
+        _memory_cache[key] = result
+        _memory_cache.move_to_end(key)
+        while len(_memory_cache) > MEMORY_CACHE_SIZE:
+            _memory_cache.popitem(last=False)
+
+def _recall(key):
+    with _memory_lock:
+        result = _memory_cache.get(key)
+        if result is not None:
+            _memory_cache.move_to_end(key)
+        return result
+
+def _disk_path(key):
+    return os.path.join(ANALYSIS_CACHE_DIR, f"{key}.json")
+
+def _load_from_disk(key):
+    try:
+        with open(_disk_path(key), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def _save_to_disk(key, result):
+    try:
+        os.makedirs(ANALYSIS_CACHE_DIR, exist_ok=True)
+        tmp_path = f"{_disk_path(key)}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(result, f, ensure_ascii=False)
+        os.replace(tmp_path, _disk_path(key))
+    except OSError as e:
+        print(f"모델 분석 캐시 저장 실패: {e}")
+
+def get_model_analysis(model_json_str, content_key=None):
+    """
+    gemini_service.get_model_analysis_and_strategy의 캐시 적용 버전.
+    메모리 LRU -> 디스크 순으로 조회하고, 없을 때만 Gemini를 호출합니다.
+    성공(status 'ok')한 결과만 캐시합니다.
+    content_key는 미리 계산한 model_content_hash 값입니다. (모델 레지스트리에서 재사용, 다시 파싱하지 않음)
+    50KB가 넘는 모델은 간소화해서 분석하지만 캐시 키는 원본 모델 기준이므로,
+    의존성 분석 화면과 데이터 생성이 같은 결과를 공유합니다.
+
+    Returns:
+        dict: get_model_analysis_and_strategy와 같은 형식 (캐시 히트면 'cached': True 포함)
+    """
+    key = content_key or model_content_hash(model_json_str)
+    cached = _recall(key)
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    with _memory_lock:
+        key_lock = _key_locks.setdefault(key, threading.Lock())
+
+    with key_lock:
+        # 잠금을 기다리는 동안 다른 요청이 분석을 끝냈을 수 있음
+        cached = _recall(key) or _load_from_disk(key)
+        if cached is not None:
+            _remember(key, cached)
+            return {**cached, "cached": True}
+
+        result = gemini_service.get_model_analysis_and_strategy(_analysis_input(model_json_str))
+        if result.get('status') == 'ok':
+            _remember(key, result)
+            _save_to_disk(key, result)
+        return result
+
+def get_model_analysis_text(model_json_str, content_key=None):
+    """데이터 생성용: 분석에 성공하면 분석 텍스트, 아니면 빈 문자열을 반환합니다."""
+    try:
+        result = get_model_analysis(model_json_str, content_key)
+    except Exception:
+        return ""  # AI 분석 실패해도 무시
+    return result.get('analysis', "") if result.get('status') == 'ok' else ""
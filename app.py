@@ -3,12 +3,19 @@ from flask import Flask, render_template, Response, stream_with_context, request
 import os
 import json
 import time
-import glob
 import threading
+from datetime import datetime
 from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import gemini_service
+import analysis_cache
+import checkpoints
 import data_generator as dg
+import column_plans as cp
 import dependency_analyzer as da
+import generation_jobs
+import metrics
+import model_registry
+import output_writers as ow
 
 app = Flask(__name__)
 
@@ -16,9 +23,35 @@ app = Flask(__name__)
 OUTPUT_DIR = "output_data"
 MODELS_DIR = "models"
 
+analysis_cache.ANALYSIS_CACHE_DIR = os.path.join(MODELS_DIR, '.analysis_cache')
+
+# 모델 파일 목록/파싱 결과 캐시 (파일이 바뀌었을 때만 다시 읽음)
+registry = model_registry.ModelRegistry(MODELS_DIR)
+
 # --- Global State for Simplicity ---
 chat_history = []
 
+# 데이터 생성과 겹쳐서 실행되는 모델 분석용 스레드
+analysis_executor = ThreadPoolExecutor(max_workers=4)
+
+# 백그라운드 생성 작업 (브라우저 연결과 무관하게 실행, 작업별 출력 디렉터리 사용)
+job_manager = generation_jobs.JobManager(OUTPUT_DIR)
+
+def warm_up():
+    """
+    처음 요청에서 지연 로딩될 무거운 모듈과 클라이언트(pandas, Faker, LLM 백엔드)를 미리 초기화합니다.
+    pre-fork 서버(e.g., gunicorn --preload)의 마스터 프로세스에서 실행하면 워커가 초기화된 상태를 물려받습니다.
+    APP_WARM_UP=1이면 app 모듈 import 시 자동으로 실행합니다.
+    """
+    started = time.perf_counter()
+    dg.warm_up()
+    gemini_service.get_backend()
+    registry.list_models()
+    print(f"워밍업 완료 ({time.perf_counter() - started:.2f}초)")
+
+if os.getenv('APP_WARM_UP', '0') not in ('0', 'false', 'False'):
+    warm_up()
+
 # --- 기존 라우트들 (변경 없음) ---
 @app.route('/')
 def index():
@@ -33,18 +66,16 @@ def modeler():
 
 @app.route('/generator')
 def generator():
-    model_files = [os.path.basename(f) for f in glob.glob(os.path.join(MODELS_DIR, "model_*.json"))]
+    model_files = registry.list_models()
     return render_template('generator.html', model_files=model_files)
 
 @app.route('/get-model/<filename>')
 def get_model(filename):
-    filepath = os.path.join(MODELS_DIR, filename)
-    if not os.path.exists(filepath): 
-        return jsonify({"error": "File not found"}), 404
     try:
-        with open(filepath, 'r', encoding='utf-8') as f: 
-            model_data = json.load(f)
-        return jsonify(model_data)
+        # 파싱 검증을 마친 원본 JSON을 그대로 응답 (다시 직렬화하지 않음)
+        return Response(registry.get(filename).model_str, mimetype='application/json')
+    except FileNotFoundError:
+        return jsonify({"error": "File not found"}), 404
     except Exception as e:
         return jsonify({"error": f"파일 읽기 오류: {str(e)}"}), 500
 
@@ -52,24 +83,24 @@ def get_model(filename):
 @app.route('/analyze-dependencies/<filename>')
 def analyze_dependencies_route(filename):
     """개선된 의존성 분석 - 타임아웃과 비동기 처리"""
-    filepath = os.path.join(MODELS_DIR, filename)
-    if not os.path.exists(filepath):
-        return jsonify({"error": "모델 파일을 찾을 수 없습니다."}), 404
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            model_str = f.read()
-            model = json.loads(model_str)
+        entry = registry.get(filename)
+    except FileNotFoundError:
+        return jsonify({"error": "모델 파일을 찾을 수 없습니다."}), 404
     except Exception as e:
         return jsonify({"error": f"모델 파일 파싱 오류: {str(e)}"}), 400
 
     # 1. 빠른 규칙 기반 분석 먼저 수행
     try:
-        generation_order = da.get_generation_order(model)
+        dependency_info = entry.dependency_info
+        generation_order = dependency_info['order']
         if generation_order is None:
-            return jsonify({"error": "모델에 순환 참조가 발견되었습니다. 모델을 수정해주세요."}), 400
+            return jsonify({
+                "error": f"모델에 순환 참조가 발견되었습니다. 모델을 수정해주세요. ({da.describe_cycles(dependency_info['cycles'])})",
+                "cycles": dependency_info['cycles']
+            }), 400
         
-        dependencies, _ = da.analyze_dependencies(model)
+        dependencies = dependency_info['dependencies']
         
     except Exception as e:
         return jsonify({"error": f"의존성 분석 오류: {str(e)}"}), 500
@@ -81,16 +112,8 @@ def analyze_dependencies_route(filename):
         """AI 분석을 별도 스레드에서 실행"""
         nonlocal llm_analysis
         try:
-            # 모델 크기 확인 및 제한
-            if len(model_str) > 50000:  # 50KB 초과시 간소화
-                simplified_model = {
-                    "tables": model.get("tables", [])[:5]  # 처음 5개 테이블만
-                }
-                simplified_str = json.dumps(simplified_model, ensure_ascii=False)
-            else:
-                simplified_str = model_str
-            
-            llm_analysis_result = gemini_service.get_model_analysis_and_strategy(simplified_str)
+            # 데이터 생성과 같은 입력/캐시 키로 분석 (큰 모델의 간소화는 analysis_cache에서 처리)
+            llm_analysis_result = analysis_cache.get_model_analysis(entry.model_str, entry.content_hash)
             
             if llm_analysis_result.get('status') == 'ok':
                 llm_analysis = llm_analysis_result.get('analysis', "")
@@ -132,6 +155,16 @@ def api_status():
             "message": f"API 상태 확인 실패: {str(e)}"
         })
 
+@app.route('/metrics')
+def metrics_route():
+    """Prometheus 수집용 생성 지표 (컬럼/테이블별 생성 시간, LLM 지연 시간, 재시도/대체 횟수, 기록 바이트, 작업 수)."""
+    job_counts = {status: 0 for status in ('queued', 'running') + generation_jobs.FINISHED_STATUSES}
+    for job in job_manager.list():
+        job_counts[job.status] = job_counts.get(job.status, 0) + 1
+    for status, count in job_counts.items():
+        metrics.registry.set('datagen_jobs', count, status=status)
+    return Response(metrics.registry.render_prometheus(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
 @app.route('/chat', methods=['POST'])
 def chat():
     global chat_history
@@ -179,10 +212,7 @@ def save_model():
 
         timestamp = int(time.time())
         filename = f"model_{timestamp}.json"
-        filepath = os.path.join(MODELS_DIR, filename)
-
-        with open(filepath, 'w', encoding='utf-8') as f:
-            json.dump(model_data, f, ensure_ascii=False, indent=4)
+        registry.save(filename, model_data)
 
         success_message = f"성공적으로 모델을 **'{filename}'** 파일로 저장했습니다. 이제 [데이터 생성기 페이지]({url_for('generator')})로 이동하여 데이터를 생성할 수 있습니다."
         return jsonify({"status": "ok", "message": success_message, "filename": filename})
@@ -200,14 +230,10 @@ def estimate_tokens():
     if not filename: 
         return jsonify({"error": "Filename is required."}), 400
     
-    filepath = os.path.join(MODELS_DIR, filename)
-    if not os.path.exists(filepath): 
-        return jsonify({"error": "Model file not found."}), 404
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            model_str = f.read()
-            model = json.loads(model_str)
+        model = registry.get(filename).model
+    except FileNotFoundError:
+        return jsonify({"error": "Model file not found."}), 404
     except Exception as e:
         return jsonify({"error": f"모델 파일 읽기 오류: {str(e)}"}), 500
     
@@ -225,10 +251,11 @@ def estimate_tokens():
             
             for column in table.get('columns', []):
                 if '[LLM]' in column.get('description', ''):
-                    # 간단한 토큰 추정 (실제 API 호출 대신)
+                    # 간단한 토큰 추정 (실제 API 호출 대신), 출력 토큰 한도에 맞춘 배치 수만큼 프롬프트 반복
                     column_desc_length = len(column.get('description', ''))
                     estimated_prompt_tokens = (column_desc_length + 100) * 1.3  # 대략적 추정
-                    total_estimated_prompt_tokens += estimated_prompt_tokens
+                    num_batches = -(-num_rows // dg.llm_batch_size())
+                    total_estimated_prompt_tokens += estimated_prompt_tokens * num_batches
                     total_llm_rows_for_candidates += num_rows
         
         estimated_candidates_tokens = total_llm_rows_for_candidates * AVG_RESPONSE_TOKENS_PER_ITEM
@@ -252,24 +279,27 @@ def generate_sample():
     if not filename: 
         return jsonify({"error": "Filename is required."}), 400
     
-    filepath = os.path.join(MODELS_DIR, filename)
-    if not os.path.exists(filepath): 
-        return jsonify({"error": "Model file not found."}), 404
-    
     try:
-        with open(filepath, 'r', encoding='utf-8') as f: 
-            model = json.load(f)
+        entry = registry.get(filename)
+        model = entry.model
+    except FileNotFoundError:
+        return jsonify({"error": "Model file not found."}), 404
     except Exception as e:
         return jsonify({"error": f"모델 파일 읽기 오류: {str(e)}"}), 500
     
     try:
-        generation_order = da.get_generation_order(model)
+        dependency_info = entry.dependency_info
+        generation_order = dependency_info['order']
         if generation_order is None: 
-            return jsonify({"error": "Circular dependency detected."}), 400
+            return jsonify({
+                "error": f"Circular dependency detected: {da.describe_cycles(dependency_info['cycles'])}",
+                "cycles": dependency_info['cycles']
+            }), 400
         
         model_tables_map = {t['table_name']: t for t in model.get('tables', [])}
         sample_size = 5
         sample_data = {}
+        generation_plan = {}
         generated_data_dfs = {}
         
         for table_name in generation_order:
@@ -280,6 +310,8 @@ def generate_sample():
             num_rows = int(quantities.get(table_name, sample_size))
             
             try:
+                plan = cp.build_table_plan(table_name, columns_list, options)
+                generation_plan[table_name] = cp.describe_table_plan(plan)
                 df, _, _ = dg.generate_table_data(
                     table_name, columns_list, min(num_rows, sample_size), 
                     related_data=generated_data_dfs, options=options
@@ -290,119 +322,161 @@ def generate_sample():
                 # 개별 테이블 생성 실패시에도 다른 테이블은 계속 처리
                 sample_data[table_name] = [{"error": f"테이블 생성 실패: {str(e)}"}]
         
-        return jsonify(sample_data)
+        # 각 컬럼에 어떤 생성 규칙이 매칭되었는지 함께 반환 (테이블 이름과 겹치지 않도록 샘플과 분리)
+        return jsonify({"samples": sample_data, "plan": generation_plan})
         
     except Exception as e:
         return jsonify({"error": f"샘플 생성 중 오류: {str(e)}"}), 500
 
-@app.route('/start-generation')
-def start_generation():
-    """데이터 생성 - 에러 처리 및 타임아웃 개선"""
-    filename = request.args.get('filename')
-    options_str = request.args.get('options', '{}')
-    
-    try: 
-        options = json.loads(options_str)
-    except json.JSONDecodeError: 
-        options = {}
+def _submit_generation_job(params):
+    """
+    생성 요청 파라미터(쿼리 문자열 또는 JSON)를 검증하고 백그라운드 생성 작업을 등록합니다.
+
+    Returns:
+        tuple: (GenerationJob 또는 None, 오류 메시지 또는 None, HTTP 상태 코드)
+    """
+    filename = params.get('filename')
+    options = params.get('options', '{}')
+    if isinstance(options, str):
+        try: 
+            options = json.loads(options)
+        except json.JSONDecodeError: 
+            options = {}
     
     if not filename: 
-        return "Error: Filename is required.", 400
-    
-    filepath = os.path.join(MODELS_DIR, filename)
-    if not os.path.exists(filepath): 
-        return "Error: Model file not found.", 404
+        return None, "Error: Filename is required.", 400
     
     try:
-        with open(filepath, 'r', encoding='utf-8') as f:
-            model_str = f.read()
-            model = json.loads(model_str)
+        entry = registry.get(filename)
+        model = entry.model
+    except FileNotFoundError:
+        return None, "Error: Model file not found.", 404
     except Exception as e:
-        def error_stream(): 
-            yield log_streamer(event_type="error", data={"message": f"모델 파일 읽기 오류: {str(e)}"})
-        return Response(stream_with_context(error_stream()), mimetype='text/event-stream')
+        return None, f"모델 파일 읽기 오류: {str(e)}", 400
     
-    generation_order = da.get_generation_order(model)
-    if generation_order is None:
-        def error_stream(): 
-            yield log_streamer(event_type="error", data={"message": "모델에 순환 참조가 발견되었습니다."})
-        return Response(stream_with_context(error_stream()), mimetype='text/event-stream')
+    dependency_info = entry.dependency_info
+    generation_levels = dependency_info['levels']
+    if generation_levels is None:
+        return None, f"모델에 순환 참조가 발견되었습니다: {da.describe_cycles(dependency_info['cycles'])}", 400
     
-    # AI 분석은 선택적으로 수행 (실패해도 데이터 생성은 계속)
-    model_analysis_text = ""
+    table_names = {table.get('table_name') for table in model.get('tables', [])}
+    quantities = {key: value for key, value in params.items() if key in table_names}
     try:
-        llm_analysis_result = gemini_service.get_model_analysis_and_strategy(model_str)
-        if llm_analysis_result.get('status') == 'ok':
-            model_analysis_text = llm_analysis_result.get('analysis', "")
-    except:
-        pass  # AI 분석 실패해도 무시
+        chunk_size = int(params.get('chunk_size', dg.DEFAULT_CHUNK_SIZE))
+    except ValueError:
+        chunk_size = dg.DEFAULT_CHUNK_SIZE
+    output_format = params.get('format', 'csv')
+    compression = params.get('compression') or None
+    try:
+        ow.resolve_compression(output_format, compression)
+        reference_time = params.get('reference_time') or None
+        if reference_time:
+            reference_time = datetime.fromisoformat(reference_time).isoformat()
+        # 시드를 지정하면 같은 시드/청크 크기/기준 시각으로 같은 데이터를 다시 만들 수 있음
+        seed = int(params['seed']) if params.get('seed') not in (None, '') else None
+        if seed is not None and seed < 0:
+            raise ValueError("시드는 0 이상의 정수여야 합니다.")
+        shard_count = max(int(params.get('shards') or 1), 1)
+    except ValueError as e:
+        return None, str(e), 400
     
-    model_tables_map = {t['table_name']: t for t in model.get('tables', [])}
-    quantities = request.args.to_dict(flat=True)
+    # AI 분석은 백그라운드에서 수행하고, LLM 컬럼이 있는 테이블만 분석 결과를 기다림 (실패해도 데이터 생성은 계속)
+    analysis_future = analysis_executor.submit(analysis_cache.get_model_analysis_text, entry.model_str, entry.content_hash)
     
-    def log_streamer(event_type, data):
-        data['type'] = event_type
-        return f"data: {json.dumps(data)}\n\n"
+    job = job_manager.submit(
+        filename, model, generation_levels, quantities, options,
+        model_str=entry.model_str, content_hash=entry.content_hash, model_analysis=analysis_future, chunk_size=chunk_size,
+        output_format=output_format, compression=compression,
+        seed=seed, reference_time=reference_time, shard_count=shard_count
+    )
+    return job, None, 202
+
+def log_streamer(event_type, data):
+    data['type'] = event_type
+    return f"data: {json.dumps(data)}\n\n"
+
+def _stream_job_events(job, after_seq=0):
+    # 연결이 끊겨도 작업은 계속 진행되며, /jobs/<id>/events?after=<seq>로 다시 이어 받을 수 있음
+    yield log_streamer(event_type="job", data={"job_id": job.job_id, "status": job.status})
+    for event in job.iter_events(after_seq):
+        if event is None:
+            yield ": keep-alive\n\n"
+            continue
+        yield log_streamer(event_type=event['type'], data=event)
+
+@app.route('/start-generation')
+def start_generation():
+    """생성 작업을 등록하고 그 진행 이벤트를 SSE로 전달합니다."""
+    job, error, status_code = _submit_generation_job(request.args.to_dict(flat=True))
+    if job is None:
+        def error_stream(): 
+            yield log_streamer(event_type="error", data={"message": error})
+        return Response(stream_with_context(error_stream()), mimetype='text/event-stream')
     
-    def generate_and_log():
-        if not os.path.exists(OUTPUT_DIR): 
-            os.makedirs(OUTPUT_DIR)
-        
-        generated_data_dfs = {}
-        total_prompt_tokens, total_candidates_tokens = 0, 0
-        
-        yield log_streamer(event_type="token_update", data={'prompt_tokens': 0, 'candidates_tokens': 0})
-        
-        for table_name in generation_order:
-            table_details = model_tables_map.get(table_name)
-            if not table_details: continue
-            
-            columns_list = table_details.get("columns", [])
-            num_rows = int(quantities.get(table_name, 0))
-            
-            if num_rows == 0:
-                yield log_streamer(event_type="log", data={'message': f"-> **{table_name}** (0개) 건너뜁니다."})
-                continue
-            
-            yield log_streamer(event_type="log", data={'message': f"-> **{table_name}** ({num_rows}개) 생성 시작..."})
-            
-            try:
-                df, prompt_tokens, candidates_tokens = dg.generate_table_data(
-                    table_name, columns_list, num_rows, 
-                    related_data=generated_data_dfs, 
-                    options=options,
-                    model_analysis=model_analysis_text
-                )
-                
-                total_prompt_tokens += prompt_tokens
-                total_candidates_tokens += candidates_tokens
-                
-                file_path = os.path.join(OUTPUT_DIR, f'{table_name}.csv')
-                df.to_csv(file_path, index=False, encoding='utf-8-sig')
-                generated_data_dfs[table_name] = df
-                
-                log_message = f"   '{table_name}.csv' 저장 완료."
-                if (prompt_tokens + candidates_tokens) > 0:
-                    log_message += f" (입력: {prompt_tokens}, 출력: {candidates_tokens})"
-                
-                yield log_streamer(event_type="log", data={'message': log_message})
-                yield log_streamer(event_type="token_update", data={'prompt_tokens': total_prompt_tokens, 'candidates_tokens': total_candidates_tokens})
-                
-            except Exception as e:
-                error_msg = f"   **{table_name}** 생성 실패: {str(e)}"
-                yield log_streamer(event_type="log", data={'message': error_msg})
-                # 실패해도 다음 테이블 계속 처리
-            
-            time.sleep(0.5)
-        
-        completion_message = "✅ 모든 데이터 생성이 완료되었습니다!"
-        yield log_streamer(event_type="complete", data={
-            'message': completion_message, 
-            'prompt_tokens': total_prompt_tokens, 
-            'candidates_tokens': total_candidates_tokens
-        })
+    return Response(stream_with_context(_stream_job_events(job)), mimetype='text/event-stream')
+
+@app.route('/jobs', methods=['GET', 'POST'])
+def jobs_route():
+    if request.method == 'GET':
+        return jsonify([job.to_dict() for job in job_manager.list()])
     
-    return Response(stream_with_context(generate_and_log()), mimetype='text/event-stream')
+    params = request.get_json(silent=True) or request.form.to_dict(flat=True)
+    params = {key: value if isinstance(value, (dict, list)) else str(value) for key, value in params.items()}
+    job, error, status_code = _submit_generation_job(params)
+    if job is None:
+        return jsonify({"error": error}), status_code
+    return jsonify(job.to_dict()), status_code
+
+@app.route('/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    if request.method == 'DELETE':
+        # 재개하지 않을 작업의 부분 결과와 체크포인트 삭제
+        if not job_manager.discard(job_id):
+            return jsonify({"error": f"삭제할 수 없는 작업입니다. ({job.status})"}), 409
+        return jsonify({"job_id": job_id, "deleted": True})
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    try:
+        after_seq = int(request.args.get('after') or request.headers.get('Last-Event-ID') or 0)
+    except ValueError:
+        after_seq = 0
+    return Response(stream_with_context(_stream_job_events(job, after_seq)), mimetype='text/event-stream')
+
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({"error": "작업을 찾을 수 없습니다."}), 404
+    if not job_manager.cancel(job_id):
+        return jsonify({"error": f"이미 종료된 작업입니다. ({job.status})"}), 409
+    return jsonify(job.to_dict())
+
+@app.route('/jobs/<job_id>/resume', methods=['POST'])
+def resume_job(job_id):
+    checkpoint_dir = os.path.join(job_manager.jobs_dir, f"{job_id}.partial", generation_jobs.CHECKPOINT_DIR_NAME)
+    model_analysis = ""
+    if checkpoints.load_model_analysis(checkpoint_dir) is None:
+        # 모델 분석이 끝나기 전에 중단된 작업: 분석을 다시 요청 (캐시에 있으면 바로 반환)
+        manifest = checkpoints.load_job_manifest(checkpoint_dir)
+        if manifest is not None:
+            # 작업 시작 때와 같은 모델 문자열로 요청해야 분석 캐시 키와 LLM 값 캐시 키가 같아짐
+            model_str = manifest.get('model_str') or json.dumps(manifest['model'])
+            model_analysis = analysis_executor.submit(analysis_cache.get_model_analysis_text, model_str, manifest.get('content_hash'))
+    try:
+        job = job_manager.resume(job_id, model_analysis=model_analysis)
+    except LookupError as e:
+        return jsonify({"error": str(e)}), 404
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 409
+    return jsonify(job.to_dict()), 202
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
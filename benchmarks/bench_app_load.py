@@ -0,0 +1,166 @@
+# benchmarks/bench_app_load.py
+"""
+로컬 LLM 백엔드(LLM_BACKEND=local)로 Flask 앱 전체를 띄우고 여러 클라이언트가 동시에 요청하는 부하 테스트.
+네트워크/API 키 없이 LLM 경로(샘플 생성, 대화 스트림, 모델 분석)를 포함한 처리량과 지연 시간을 측정합니다.
+
+요청 종류 (클라이언트마다 순서대로 반복):
+    sample     POST /generate-sample  (LLM 컬럼 포함 샘플 생성)
+    chat       POST /chat             (대화 스트림을 끝까지 읽음)
+    analyze    GET  /analyze-dependencies/<모델>
+    model      GET  /get-model/<모델>
+
+사용법:
+    python benchmarks/bench_app_load.py --clients 32 --duration 20 --latency 0.2 --failure-rate 0.05
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+LOAD_MODEL = {"tables": [
+    {"table_name": "users", "columns": [
+        {"column_name": "user_id", "data_type": "INT", "description": "사용자 ID"},
+        {"column_name": "name", "data_type": "VARCHAR(100)", "description": "이름"},
+    ]},
+    {"table_name": "products", "columns": [
+        {"column_name": "product_id", "data_type": "INT", "description": "상품 ID"},
+        {"column_name": "product_name", "data_type": "VARCHAR(100)", "description": "[LLM] 상품명"},
+    ]},
+    {"table_name": "reviews", "columns": [
+        {"column_name": "review_id", "data_type": "INT", "description": "리뷰 ID"},
+        {"column_name": "user_id", "data_type": "INT", "description": "작성자"},
+        {"column_name": "product_id", "data_type": "INT", "description": "상품"},
+        {"column_name": "comment", "data_type": "TEXT", "description": "[LLM] 상품 리뷰 내용"},
+    ]},
+]}
+MODEL_FILE = "model_load.json"
+
+
+def _request(base_url, kind):
+    if kind == 'sample':
+        body = {"filename": MODEL_FILE, "quantities": {"users": 5, "products": 5, "reviews": 5}, "options": {}}
+        req = urllib.request.Request(f"{base_url}/generate-sample", data=json.dumps(body).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    elif kind == 'chat':
+        req = urllib.request.Request(f"{base_url}/chat", data=json.dumps({"message": "쇼핑몰 모델을 만들어 주세요"}).encode(),
+                                     headers={'Content-Type': 'application/json'})
+    elif kind == 'analyze':
+        req = urllib.request.Request(f"{base_url}/analyze-dependencies/{MODEL_FILE}")
+    else:
+        req = urllib.request.Request(f"{base_url}/get-model/{MODEL_FILE}")
+    with urllib.request.urlopen(req, timeout=120) as response:
+        response.read()
+        return response.status
+
+def _client(base_url, kinds, deadline, results, lock):
+    i = 0
+    while time.perf_counter() < deadline:
+        kind = kinds[i % len(kinds)]
+        i += 1
+        started = time.perf_counter()
+        try:
+            ok = _request(base_url, kind) < 400
+        except (urllib.error.URLError, OSError):
+            ok = False
+        with lock:
+            results.setdefault(kind, []).append((time.perf_counter() - started, ok))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--clients', type=int, default=16, help='동시 클라이언트 수')
+    parser.add_argument('--duration', type=float, default=10.0, help='측정 시간 (초)')
+    parser.add_argument('--latency', type=float, default=0.1, help='로컬 백엔드 요청당 지연 시간 (초)')
+    parser.add_argument('--latency-per-token', type=float, default=0.0, help='로컬 백엔드 출력 토큰당 지연 시간 (초)')
+    parser.add_argument('--failure-rate', type=float, default=0.0, help='로컬 백엔드 실패 주입 확률 (0~1)')
+    parser.add_argument('--kinds', nargs='+', default=['sample', 'chat', 'analyze', 'model'],
+                        choices=['sample', 'chat', 'analyze', 'model'], help='보낼 요청 종류')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    # gemini_service는 import 시점에 백엔드를 고르므로 app import 전에 설정
+    os.environ['LLM_BACKEND'] = 'local'
+    os.environ['LOCAL_LLM_LATENCY'] = str(args.latency)
+    os.environ['LOCAL_LLM_LATENCY_PER_TOKEN'] = str(args.latency_per_token)
+    os.environ['LOCAL_LLM_FAILURE_RATE'] = str(args.failure_rate)
+    os.environ.setdefault('LLM_CACHE_ENABLED', '0')
+
+    work_dir = tempfile.mkdtemp(prefix='bench_app_load_')
+    cwd = os.getcwd()
+    try:
+        # 모듈이 stdout에 출력하는 진행 메시지는 stderr로 보냄 (stdout은 결과 전용)
+        with contextlib.redirect_stdout(sys.stderr):
+            # app은 현재 디렉터리 기준으로 models/ 와 output_data/ 를 사용
+            os.chdir(work_dir)
+            os.makedirs('models')
+            with open(os.path.join('models', MODEL_FILE), 'w', encoding='utf-8') as f:
+                json.dump(LOAD_MODEL, f, ensure_ascii=False)
+
+            from werkzeug.serving import make_server
+            import app as app_module
+            import gemini_service
+
+            logging.getLogger('werkzeug').setLevel(logging.ERROR)  # 요청별 접근 로그 생략
+            server = make_server('127.0.0.1', 0, app_module.app, threaded=True)
+            threading.Thread(target=server.serve_forever, daemon=True).start()
+            base_url = f"http://127.0.0.1:{server.server_port}"
+
+            results, lock = {}, threading.Lock()
+            started = time.perf_counter()
+            deadline = started + args.duration
+            with ThreadPoolExecutor(max_workers=args.clients) as executor:
+                for client_index in range(args.clients):
+                    # 클라이언트마다 시작 요청 종류를 달리해 요청이 섞이도록 함
+                    kinds = args.kinds[client_index % len(args.kinds):] + args.kinds[:client_index % len(args.kinds)]
+                    executor.submit(_client, base_url, kinds, deadline, results, lock)
+            elapsed = time.perf_counter() - started
+            server.shutdown()
+
+            summary = {
+                "clients": args.clients,
+                "elapsed_sec": round(elapsed, 2),
+                "requests_per_sec": round(sum(len(samples) for samples in results.values()) / elapsed, 1),
+                "llm_backend_calls": gemini_service.get_backend().calls,
+                "llm_backend_failures": gemini_service.get_backend().failures,
+                "endpoints": {},
+            }
+            for kind, samples in sorted(results.items()):
+                latencies = np.array([latency for latency, _ in samples]) * 1000
+                summary["endpoints"][kind] = {
+                    "requests": len(samples),
+                    "errors": sum(1 for _, ok in samples if not ok),
+                    "p50_ms": round(float(np.percentile(latencies, 50)), 1),
+                    "p95_ms": round(float(np.percentile(latencies, 95)), 1),
+                    "max_ms": round(float(latencies.max()), 1),
+                }
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(summary, indent=2))
+        return
+
+    print(f"clients={summary['clients']} elapsed={summary['elapsed_sec']}s "
+          f"throughput={summary['requests_per_sec']} req/s "
+          f"llm_calls={summary['llm_backend_calls']} llm_failures={summary['llm_backend_failures']}")
+    print(f"{'endpoint':<10}{'requests':>10}{'errors':>8}{'p50(ms)':>10}{'p95(ms)':>10}{'max(ms)':>10}")
+    for kind, stats in summary["endpoints"].items():
+        print(f"{kind:<10}{stats['requests']:>10}{stats['errors']:>8}{stats['p50_ms']:>10}{stats['p95_ms']:>10}{stats['max_ms']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+# benchmarks/bench_dependency_analyzer.py
+"""
+합성 스키마(테이블 100 ~ 50,000개)로 의존성 분석 시간을 측정합니다.
+각 테이블은 기본 키 하나와 앞쪽 테이블을 참조하는 외래 키 0~fk_per_table개를 가집니다.
+--legacy-max 이하 크기에서는 이전 구현(list.pop(0) + 전체 테이블 스캔)과 결과/시간을 비교합니다.
+
+사용법:
+    python benchmarks/bench_dependency_analyzer.py --sizes 100 1000 5000 50000
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dependency_analyzer as da
+
+
+def synthetic_model(num_tables, fk_per_table=3, seed=0):
+    rnd = random.Random(seed)
+    tables = []
+    for i in range(num_tables):
+        columns = [{"column_name": f"tbl_{i}_id", "data_type": "INT", "description": ""}]
+        for parent in sorted(set(rnd.randrange(i) for _ in range(rnd.randint(0, fk_per_table)))) if i else []:
+            columns.append({"column_name": f"tbl_{parent}_id", "data_type": "INT", "description": ""})
+        columns.append({"column_name": "name", "data_type": "VARCHAR(100)", "description": ""})
+        tables.append({"table_name": f"tbl_{i}", "columns": columns})
+    # 순서 의존성을 없애기 위해 테이블 순서를 섞음
+    rnd.shuffle(tables)
+    return {"tables": tables}
+
+def legacy_generation_order(model):
+    """이전 구현 (비교용)."""
+    dependencies, _ = da.analyze_dependencies(model)
+    all_tables = [table.get('table_name') for table in model.get('tables', []) if table.get('table_name')]
+    in_degree = {table: len(dependencies.get(table, [])) for table in all_tables}
+    queue = [table for table in all_tables if in_degree[table] == 0]
+    sorted_order = []
+    while queue:
+        current_table = queue.pop(0)
+        sorted_order.append(current_table)
+        for table in all_tables:
+            if current_table in dependencies.get(table, []):
+                in_degree[table] -= 1
+                if in_degree[table] == 0:
+                    queue.append(table)
+    return sorted_order if len(sorted_order) == len(all_tables) else None
+
+def _timed(func, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000, 20000, 50000])
+    parser.add_argument('--fk-per-table', type=int, default=3)
+    parser.add_argument('--legacy-max', type=int, default=5000, help='이전 구현과 비교할 최대 테이블 수')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    results = []
+    for size in args.sizes:
+        model = synthetic_model(size, args.fk_per_table)
+        da._analysis_cache.clear()
+        analysis, cold = _timed(da.analyze_model, model)
+        _, warm = _timed(da.analyze_model, model)
+
+        # 순환 참조 진단: 마지막 테이블이 첫 테이블을 참조하도록 만들어 측정
+        cyclic = json.loads(json.dumps(model))
+        leaf = next(t for t in cyclic['tables'] if len(t['columns']) > 2)
+        root_name = leaf['columns'][1]['column_name'][:-3]
+        next(t for t in cyclic['tables'] if t['table_name'] == root_name)['columns'].append(
+            {"column_name": f"{leaf['table_name']}_id", "data_type": "INT", "description": ""}
+        )
+        cyclic_analysis, cycle_time = _timed(da.analyze_model, cyclic)
+
+        row = {
+            "tables": size,
+            "edges": sum(len(deps) for deps in analysis['dependencies'].values()),
+            "levels": len(analysis['levels']),
+            "cold_ms": round(cold * 1000, 1),
+            "cached_ms": round(warm * 1000, 2),
+            "cycle_diagnosis_ms": round(cycle_time * 1000, 1),
+            "cycle_found": bool(cyclic_analysis['cycles']),
+            "legacy_ms": None,
+        }
+        if size <= args.legacy_max:
+            legacy_order, legacy_time = _timed(legacy_generation_order, model)
+            assert legacy_order == analysis['order'], "이전 구현과 생성 순서가 다릅니다."
+            row["legacy_ms"] = round(legacy_time * 1000, 1)
+        results.append(row)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'tables':>8}{'edges':>9}{'levels':>8}{'cold(ms)':>11}{'cached(ms)':>12}{'cycle(ms)':>11}{'legacy(ms)':>12}")
+    for r in results:
+        legacy = f"{r['legacy_ms']:,}" if r['legacy_ms'] is not None else '-'
+        print(f"{r['tables']:>8,}{r['edges']:>9,}{r['levels']:>8}{r['cold_ms']:>11,}{r['cached_ms']:>12}{r['cycle_diagnosis_ms']:>11,}{legacy:>12}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+# benchmarks/bench_faker_pools.py
+"""
+Faker 프로바이더별로 셀 단위 호출과 값 풀 샘플링(faker_pools)의 처리량을 비교합니다.
+
+사용법:
+    python benchmarks/bench_faker_pools.py --rows 1000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import numpy as np
+from faker import Faker
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import faker_pools
+
+PROVIDERS = ['name', 'email', 'address', 'phone', 'company', 'catch_phrase', 'text', 'word']
+# 셀 단위 호출은 느리므로 일부만 측정해 환산
+PER_CELL_SAMPLE_ROWS = 20_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='풀 샘플링으로 생성할 행 수')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    fake = Faker(faker_pools.DEFAULT_LOCALE)
+    rng = np.random.default_rng(0)
+    results = []
+    for provider in PROVIDERS:
+        generate = faker_pools.PROVIDERS[provider]
+        started = time.perf_counter()
+        for _ in range(PER_CELL_SAMPLE_ROWS):
+            generate(fake)
+        per_cell_rate = PER_CELL_SAMPLE_ROWS / (time.perf_counter() - started)
+
+        # 풀 로드/생성 시간은 제외하고 샘플링만 측정
+        faker_pools.sample(provider, rng, 1)
+        started = time.perf_counter()
+        values = faker_pools.sample(provider, rng, args.rows)
+        pool_rate = args.rows / (time.perf_counter() - started)
+
+        results.append({
+            "provider": provider,
+            "per_cell_rows_per_sec": int(per_cell_rate),
+            "pool_rows_per_sec": int(pool_rate),
+            "speedup": round(pool_rate / per_cell_rate, 1),
+            "distinct_in_100k": len(set(values[:100_000])),
+        })
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"rows={args.rows:,} pool_size={faker_pools.POOL_SIZE:,} combine={faker_pools.COMBINE_PARTS}")
+    print(f"{'provider':<14}{'per-cell/s':>14}{'pool/s':>16}{'speedup':>10}{'distinct/100k':>15}")
+    for r in results:
+        print(f"{r['provider']:<14}{r['per_cell_rows_per_sec']:>14,}{r['pool_rows_per_sec']:>16,}{r['speedup']:>10}{r['distinct_in_100k']:>15,}")
+
+
+if __name__ == '__main__':
+    main()
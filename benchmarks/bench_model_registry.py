@@ -0,0 +1,89 @@
+# benchmarks/bench_model_registry.py
+"""
+모델 파일 수천 개가 있는 models/ 디렉터리에서 모델 목록 조회와 모델 로드(파싱 + 의존성 분석) 시간을
+이전 방식(매 요청 glob + json.load + analyze_model)과 model_registry 캐시로 비교합니다.
+
+사용법:
+    python benchmarks/bench_model_registry.py --models 2000 --tables 200 --requests 200
+"""
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import dependency_analyzer as da
+import model_registry
+from bench_dependency_analyzer import synthetic_model
+
+
+def legacy_list(models_dir):
+    return [os.path.basename(f) for f in glob.glob(os.path.join(models_dir, "model_*.json"))]
+
+def legacy_load(models_dir, filename):
+    with open(os.path.join(models_dir, filename), 'r', encoding='utf-8') as f:
+        model = json.loads(f.read())
+    return model, da.analyze_model(model)
+
+def _per_request_ms(func, requests):
+    started = time.perf_counter()
+    for _ in range(requests):
+        func()
+    return (time.perf_counter() - started) * 1000 / requests
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--models', type=int, default=2000, help='models/ 디렉터리의 모델 파일 수')
+    parser.add_argument('--tables', type=int, default=200, help='측정 대상 모델의 테이블 수')
+    parser.add_argument('--requests', type=int, default=200, help='반복 요청 수')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as models_dir:
+        small = json.dumps(synthetic_model(5), ensure_ascii=False, indent=4)
+        for i in range(args.models):
+            with open(os.path.join(models_dir, f"model_{i:06d}.json"), 'w', encoding='utf-8') as f:
+                f.write(small)
+        large_name = f"model_{args.models:06d}.json"
+        with open(os.path.join(models_dir, large_name), 'w', encoding='utf-8') as f:
+            json.dump(synthetic_model(args.tables), f, ensure_ascii=False, indent=4)
+        large_size = os.path.getsize(os.path.join(models_dir, large_name))
+
+        registry = model_registry.ModelRegistry(models_dir)
+        # 이전 방식은 요청마다 da.analyze_model의 LRU 캐시 키 계산까지 포함
+        results = {
+            "models": args.models + 1,
+            "large_model_kb": round(large_size / 1024, 1),
+            "list_legacy_ms": round(_per_request_ms(lambda: legacy_list(models_dir), args.requests), 3),
+            "list_registry_ms": round(_per_request_ms(registry.list_models, args.requests), 3),
+            "load_legacy_ms": round(_per_request_ms(lambda: legacy_load(models_dir, large_name), args.requests), 3),
+        }
+        registry.get(large_name).dependency_info
+        results["load_registry_ms"] = round(_per_request_ms(
+            lambda: registry.get(large_name).dependency_info, args.requests), 4)
+
+        # 여러 모델을 번갈아 요청 (캐시 크기 이내)
+        names = random.Random(0).sample(legacy_list(models_dir), min(model_registry.MODEL_CACHE_SIZE, args.models))
+        for name in names:
+            registry.get(name)
+        cycle = iter(names * (args.requests // len(names) + 1))
+        results["load_registry_mixed_ms"] = round(_per_request_ms(lambda: registry.get(next(cycle)).model, args.requests), 4)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"models={results['models']:,} large_model={results['large_model_kb']}KB requests={args.requests}")
+    print(f"{'':<22}{'legacy(ms)':>12}{'registry(ms)':>14}")
+    print(f"{'list models':<22}{results['list_legacy_ms']:>12}{results['list_registry_ms']:>14}")
+    print(f"{'load + analyze':<22}{results['load_legacy_ms']:>12}{results['load_registry_ms']:>14}")
+    print(f"{'load (mixed models)':<22}{'-':>12}{results['load_registry_mixed_ms']:>14}")
+
+
+if __name__ == '__main__':
+    main()
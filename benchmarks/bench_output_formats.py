@@ -0,0 +1,117 @@
+# benchmarks/bench_output_formats.py
+"""
+기본 이커머스 모델(models.DATA_MODEL)로 출력 형식별 쓰기 시간과 파일 크기를 비교합니다.
+생성된 청크와 자식 테이블용으로 보관하는 키 컬럼의 메모리 사용량(테이블별)도 함께 출력합니다.
+
+사용법:
+    python benchmarks/bench_output_formats.py --rows 1000000 --chunk-size 100000
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import data_generator as dg
+import output_writers as ow
+from models import DATA_MODEL
+
+# (형식, 압축) 조합
+CASES = [
+    ('csv', None),
+    ('parquet', 'snappy'),
+    ('parquet', 'zstd'),
+    ('feather', 'lz4'),
+    ('feather', 'zstd'),
+]
+
+
+def _guess_data_type(column_name):
+    """DATA_MODEL에는 컬럼명만 있으므로 벤치마크용 데이터 타입을 추정합니다."""
+    if column_name.endswith('_id') or column_name in ('quantity', 'rating'):
+        return 'INT'
+    if 'price' in column_name:
+        return 'DECIMAL(10,2)'
+    if column_name.endswith('_at') or 'date' in column_name:
+        return 'TIMESTAMP'
+    return 'VARCHAR(255)'
+
+def default_model_tables():
+    return {
+        table_name: [{"column_name": col, "data_type": _guess_data_type(col), "description": ""} for col in spec['columns']]
+        for table_name, spec in DATA_MODEL.items()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=200_000, help='테이블당 행 수')
+    parser.add_argument('--chunk-size', type=int, default=dg.DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    tables = default_model_tables()
+    # 쓰기 시간만 측정하도록 청크를 미리 생성 (부모 키는 1..rows 범위)
+    related_data = {}
+    chunks_by_table = {}
+    for table_name in ('users', 'products', 'orders', 'order_items', 'reviews'):
+        chunks = [chunk for chunk, _, _ in dg.iter_table_chunks(
+            table_name, tables[table_name], args.rows, related_data=related_data, chunk_size=args.chunk_size
+        )]
+        chunks_by_table[table_name] = chunks
+        key_columns = [col for col in chunks[0].columns if col.endswith('_id')]
+        related_data[table_name] = pd.concat([chunk[key_columns] for chunk in chunks], ignore_index=True)
+
+    memory = {
+        table_name: {
+            "chunks_mb": round(sum(chunk.memory_usage(deep=True).sum() for chunk in chunks) / 1024 / 1024, 2),
+            "retained_keys_mb": round(related_data[table_name].memory_usage(deep=True).sum() / 1024 / 1024, 2),
+            "dtypes": {column: str(dtype) for column, dtype in chunks[0].dtypes.items()},
+        }
+        for table_name, chunks in chunks_by_table.items()
+    }
+
+    results = []
+    for output_format, compression in CASES:
+        output_dir = tempfile.mkdtemp(prefix='bench_output_')
+        try:
+            started = time.perf_counter()
+            total_bytes = 0
+            for table_name, chunks in chunks_by_table.items():
+                with ow.open_table_writer(output_dir, table_name, output_format, compression, tables[table_name]) as writer:
+                    for chunk in chunks:
+                        writer.write(chunk)
+                total_bytes += writer.bytes_written
+            elapsed = time.perf_counter() - started
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+        results.append({
+            "format": output_format,
+            "compression": compression or "none",
+            "write_seconds": round(elapsed, 3),
+            "total_mb": round(total_bytes / 1024 / 1024, 2),
+            "rows_per_sec": int(args.rows * len(chunks_by_table) / elapsed),
+        })
+
+    if args.json:
+        print(json.dumps({"memory": memory, "writes": results}, indent=2))
+        return
+
+    print(f"rows/table={args.rows:,} chunk_size={args.chunk_size:,} tables={len(chunks_by_table)}")
+    print(f"{'table':<14}{'chunks(MB)':>12}{'keys(MB)':>10}  dtypes")
+    for table_name, usage in memory.items():
+        dtypes = ", ".join(f"{column}:{dtype}" for column, dtype in usage['dtypes'].items())
+        print(f"{table_name:<14}{usage['chunks_mb']:>12}{usage['retained_keys_mb']:>10}  {dtypes}")
+    print()
+    print(f"{'format':<10}{'compression':<14}{'write(s)':>10}{'size(MB)':>12}{'rows/s':>14}")
+    for r in results:
+        print(f"{r['format']:<10}{r['compression']:<14}{r['write_seconds']:>10}{r['total_mb']:>12}{r['rows_per_sec']:>14,}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,76 @@
+# benchmarks/bench_retention.py
+"""
+여러 테이블이 서로 참조하는 대형 모델을 생성하며, 자식 테이블용으로 보관하는 부모 키 컬럼의
+최대 메모리(동시에 참조 중인 부모들)와 보관한 키 전체 크기(모든 부모를 끝까지 보관할 때)를 비교합니다.
+
+사용법:
+    python benchmarks/bench_retention.py --tables 40 --rows 500000 --fk-per-table 3
+    python benchmarks/bench_retention.py --tables 40 --rows 500000 --spill-dir /tmp
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 모듈이 stdout에 출력하는 진행 메시지는 stderr로 보냄 (stdout은 결과 전용)
+with contextlib.redirect_stdout(sys.stderr):
+    import dependency_analyzer as da
+    import generation_runner as runner
+    from bench_dependency_analyzer import synthetic_model
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tables', type=int, default=40, help='테이블 수')
+    parser.add_argument('--rows', type=int, default=200_000, help='테이블당 행 수')
+    parser.add_argument('--fk-per-table', type=int, default=3, help='테이블당 최대 외래 키 수')
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--spill-dir', default=None, help='부모 키 컬럼을 파일로 내려 둘 디렉터리')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    model = synthetic_model(args.tables, fk_per_table=args.fk_per_table)
+    levels = da.get_generation_levels(model)
+    quantities = {table['table_name']: args.rows for table in model['tables']}
+    output_dir = tempfile.mkdtemp(prefix='bench_retention_')
+    final_event = None
+    try:
+        with contextlib.redirect_stdout(sys.stderr):
+            started = time.perf_counter()
+            for event in runner.run_generation(model, levels, quantities, {}, output_dir=output_dir, max_workers=args.workers,
+                                               chunk_size=args.chunk_size, seed=0, spill_dir=args.spill_dir):
+                if event['type'] == 'complete':
+                    final_event = event
+            elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+    retained = final_event['retained_key_bytes']
+    result = {
+        "tables": args.tables,
+        "levels": len(levels),
+        "rows_per_table": args.rows,
+        "spill": bool(args.spill_dir),
+        "elapsed_sec": round(elapsed, 2),
+        "retained_peak_mb": round(retained['peak'] / 1024 / 1024, 2),
+        "retained_total_mb": round(retained['total'] / 1024 / 1024, 2),
+    }
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+
+    print(f"tables={result['tables']} levels={result['levels']} rows/table={args.rows:,} spill={result['spill']}")
+    print(f"elapsed                 {result['elapsed_sec']:>10} s")
+    print(f"retained keys (peak)    {result['retained_peak_mb']:>10} MB")
+    print(f"retained keys (total)   {result['retained_total_mb']:>10} MB")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+# benchmarks/bench_shared_keys.py
+"""
+부모 키를 워커 작업에 넘기는 비용을 부모 크기별로 비교합니다.
+
+    frame   키 컬럼 DataFrame을 작업 인자로 pickle해 넘기는 방식 (작업마다 키 전체 복사)
+    mapped  .npy 파일로 한 번 기록하고 경로만 담긴 ForeignKeyIndex를 넘기는 방식 (워커에서 메모리 맵)
+
+각 방식으로 ProcessPoolExecutor에 자식 테이블 작업을 보내고, 작업 하나가 외래 키 청크 하나를
+샘플링해 돌아오기까지의 시간과 pickle된 인자 크기를 측정합니다.
+
+사용법:
+    python benchmarks/bench_shared_keys.py --sizes 100000 1000000 10000000 --tasks 32
+"""
+import argparse
+import json
+import os
+import pickle
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import foreign_keys as fk
+
+
+def _sample_task(related_data, num_rows, seed):
+    index = fk.get_foreign_key_index(related_data, ('users',), 'user_id')
+    return int(index.sample(num_rows, np.random.default_rng(seed))[0])
+
+def _run(executor, related_data, tasks, chunk_rows):
+    started = time.perf_counter()
+    futures = [executor.submit(_sample_task, related_data, chunk_rows, seed) for seed in range(tasks)]
+    for future in futures:
+        future.result()
+    return (time.perf_counter() - started) / tasks
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100_000, 1_000_000, 10_000_000], help='부모 키 개수')
+    parser.add_argument('--tasks', type=int, default=32, help='방식/크기별 작업 수')
+    parser.add_argument('--chunk-rows', type=int, default=10_000, help='작업당 샘플링할 외래 키 수')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix='bench_shared_keys_')
+    results = []
+    try:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            for size in args.sizes:
+                keys = pd.DataFrame({'user_id': np.arange(1, size + 1, dtype=np.int32)})
+                cases = {
+                    'frame': {'users': keys},
+                    'mapped': {'users': {'user_id': fk.save_keys(os.path.join(work_dir, f"users_{size}.npy"), keys['user_id'].to_numpy())}},
+                }
+                for name, related_data in cases.items():
+                    _run(executor, related_data, args.workers, args.chunk_rows)  # 워커 준비
+                    results.append({
+                        "parent_keys": size,
+                        "mode": name,
+                        "payload_bytes": len(pickle.dumps(related_data)),
+                        "ms_per_task": round(_run(executor, related_data, args.tasks, args.chunk_rows) * 1000, 2),
+                    })
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"tasks={args.tasks} workers={args.workers} chunk_rows={args.chunk_rows:,}")
+    print(f"{'parent_keys':>12}{'mode':>8}{'payload':>14}{'ms/task':>10}")
+    for r in results:
+        print(f"{r['parent_keys']:>12,}{r['mode']:>8}{r['payload_bytes']:>14,}{r['ms_per_task']:>10}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+# benchmarks/bench_startup.py
+"""
+새 프로세스의 시작 시간(콜드 스타트)을 측정합니다. 측정마다 새 파이썬 프로세스를 띄웁니다.
+
+측정 항목:
+    import:<모듈>   모듈 import 시간 (app, generation_runner, data_generator, gemini_service)
+    first_request   app import + 첫 샘플 생성 요청 (/generate-sample) 응답까지 (지연 로딩 비용 포함)
+    warm_up         app.warm_up() 시간 (pre-fork 서버 마스터에서 한 번만 지불)
+    forked_request  마스터에서 warm_up 후 fork한 자식 프로세스의 첫 샘플 생성 요청 시간
+
+사용법:
+    python benchmarks/bench_startup.py --runs 5
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = ('app', 'generation_runner', 'data_generator', 'gemini_service')
+
+SAMPLE_MODEL = {"tables": [
+    {"table_name": "users", "columns": [
+        {"column_name": "user_id", "data_type": "INT", "description": "사용자 ID"},
+        {"column_name": "name", "data_type": "VARCHAR(100)", "description": "이름"},
+        {"column_name": "created_at", "data_type": "TIMESTAMP", "description": "가입일"},
+    ]},
+]}
+
+# 자식 프로세스에서 실행할 측정 코드 (결과는 마지막 줄에 JSON으로 출력)
+IMPORT_CODE = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+print(json.dumps({{'seconds': time.perf_counter() - started}}))
+"""
+
+REQUEST_CODE = """
+import json, os, sys, time
+started = time.perf_counter()
+import app
+warm_up_seconds = None
+if {fork}:
+    warm_started = time.perf_counter()
+    app.warm_up()
+    warm_up_seconds = time.perf_counter() - warm_started
+    read_fd, write_fd = os.pipe()
+    if os.fork() == 0:
+        request_started = time.perf_counter()
+        response = app.app.test_client().post('/generate-sample', json={{'filename': 'model_startup.json', 'quantities': {{'users': 5}}}})
+        os.write(write_fd, json.dumps({{'status': response.status_code, 'seconds': time.perf_counter() - request_started}}).encode())
+        os._exit(0)
+    os.close(write_fd)
+    child = json.loads(os.read(read_fd, 4096))
+    os.wait()
+    print(json.dumps({{'seconds': child['seconds'], 'status': child['status'], 'warm_up': warm_up_seconds}}))
+else:
+    response = app.app.test_client().post('/generate-sample', json={{'filename': 'model_startup.json', 'quantities': {{'users': 5}}}})
+    print(json.dumps({{'seconds': time.perf_counter() - started, 'status': response.status_code}}))
+"""
+
+
+def _run(code, cwd, env):
+    result = subprocess.run([sys.executable, '-c', code], cwd=cwd, env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=5, help='항목별 측정 횟수 (중앙값 보고)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    env = {**os.environ, 'PYTHONPATH': ROOT, 'LLM_BACKEND': os.getenv('LLM_BACKEND', 'local'), 'APP_WARM_UP': '0'}
+    work_dir = tempfile.mkdtemp(prefix='bench_startup_')
+    try:
+        os.makedirs(os.path.join(work_dir, 'models'))
+        with open(os.path.join(work_dir, 'models', 'model_startup.json'), 'w', encoding='utf-8') as f:
+            json.dump(SAMPLE_MODEL, f, ensure_ascii=False)
+
+        samples = {}
+        for _ in range(args.runs):
+            for module in MODULES:
+                samples.setdefault(f"import:{module}", []).append(_run(IMPORT_CODE.format(module=module), work_dir, env)['seconds'])
+            cold = _run(REQUEST_CODE.format(fork=False), work_dir, env)
+            forked = _run(REQUEST_CODE.format(fork=True), work_dir, env)
+            if cold['status'] != 200 or forked['status'] != 200:
+                raise RuntimeError(f"샘플 생성 요청 실패: {cold['status']}, {forked['status']}")
+            samples.setdefault('first_request', []).append(cold['seconds'])
+            samples.setdefault('warm_up', []).append(forked['warm_up'])
+            samples.setdefault('forked_request', []).append(forked['seconds'])
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {name: round(statistics.median(values) * 1000, 1) for name, values in samples.items()}
+    if args.json:
+        print(json.dumps({'runs': args.runs, 'median_ms': results}, indent=2))
+        return
+
+    print(f"runs={args.runs} (중앙값)")
+    for name, milliseconds in results.items():
+        print(f"{name:<28}{milliseconds:>10.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,314 @@
+# benchmarks/bench_suite.py
+"""
+데이터 생성 파이프라인 벤치마크 모음. Gemini 대신 로컬 LLM 백엔드(local_llm.LocalBackend)를 사용하므로 API 키 없이 실행됩니다.
+
+시나리오:
+    columns     컬럼 유형별 generate_table_data 처리량 (행/초)
+    fk_heavy    외래 키 컬럼이 많은 테이블 (uniform / zipf 분포)
+    llm_heavy   LLM 컬럼이 많은 테이블 (로컬 백엔드 지연 시간 설정 가능, LLM 캐시 비활성화)
+    dependency  대형 스키마 의존성 분석 (get_generation_order, 캐시 없이)
+    end_to_end  이커머스 모델 전체 생성 (run_generation, 총 행 수 10k/1M/10M 등)
+
+결과는 --output으로 JSON 파일에 저장하고, --baseline으로 저장된 결과와 비교합니다.
+기준보다 --tolerance 이상 느려진 지표가 있으면 종료 코드 1을 반환합니다.
+
+사용법:
+    python benchmarks/bench_suite.py --quick --output baseline.json
+    python benchmarks/bench_suite.py --quick --baseline baseline.json
+    python benchmarks/bench_suite.py --only end_to_end --sizes 10k 1M 10M --output e2e.json
+"""
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 모듈이 stdout에 출력하는 경고/진행 메시지는 stderr로 보냄 (stdout은 --json 결과 전용)
+with contextlib.redirect_stdout(sys.stderr):
+    import data_generator as dg
+    import dependency_analyzer as da
+    import gemini_service
+    import generation_runner as runner
+    import llm_cache
+    import local_llm
+    from bench_dependency_analyzer import synthetic_model
+    from bench_output_formats import default_model_tables
+
+SCENARIOS = ('columns', 'fk_heavy', 'llm_heavy', 'dependency', 'end_to_end')
+
+# 컬럼 유형별 측정 대상: (지표 이름, 컬럼 정의). 테이블 이름은 'bench'
+COLUMN_CASES = [
+    ('primary_key', {"column_name": "bench_id", "data_type": "INT"}),
+    ('int', {"column_name": "score", "data_type": "INT"}),
+    ('decimal', {"column_name": "weight", "data_type": "DECIMAL(10,2)"}),
+    ('price', {"column_name": "price", "data_type": "DECIMAL(10,2)"}),
+    ('datetime', {"column_name": "created_at", "data_type": "TIMESTAMP"}),
+    ('boolean', {"column_name": "is_active", "data_type": "BOOLEAN"}),
+    ('status', {"column_name": "status", "data_type": "VARCHAR(20)"}),
+    ('foreign_key', {"column_name": "user_id", "data_type": "INT"}),
+    ('faker_name', {"column_name": "name", "data_type": "VARCHAR(100)"}),
+    ('faker_email', {"column_name": "email", "data_type": "VARCHAR(100)"}),
+    ('faker_address', {"column_name": "address", "data_type": "VARCHAR(255)"}),
+    ('faker_phone', {"column_name": "phone", "data_type": "VARCHAR(20)"}),
+    ('faker_text', {"column_name": "description", "data_type": "TEXT"}),
+    ('faker_word', {"column_name": "tag", "data_type": "VARCHAR(50)"}),
+]
+
+# 이커머스 모델 전체 생성 시 테이블별 행 수 비율
+END_TO_END_SHARES = {'users': 0.10, 'products': 0.01, 'orders': 0.30, 'order_items': 0.50, 'reviews': 0.09}
+
+PRESETS = {
+    'default': {'rows': 1_000_000, 'fk_rows': 1_000_000, 'llm_rows': 20_000, 'schema_sizes': [1_000, 10_000],
+                'sizes': ['10k', '1M']},
+    'quick': {'rows': 100_000, 'fk_rows': 200_000, 'llm_rows': 2_000, 'schema_sizes': [1_000],
+              'sizes': ['10k', '200k']},
+}
+
+
+def parse_size(text):
+    """'10k', '1M', '2.5M', '10000' 형식의 행 수."""
+    text = str(text).strip().lower().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:], 1)
+    number = text[:-1] if multiplier > 1 else text
+    return int(float(number) * multiplier)
+
+def _result(name, value, unit, higher_is_better=True, **info):
+    return {"name": name, "value": value, "unit": unit, "higher_is_better": higher_is_better, **info}
+
+def _best_of(repeat, func):
+    """func를 repeat번 실행해 가장 짧은 시간과 마지막 반환값을 돌려줍니다."""
+    best, result = None, None
+    for _ in range(max(repeat, 1)):
+        started = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+def bench_columns(args):
+    related_data = {'users': pd.DataFrame({'user_id': np.arange(1, 100_001)})}
+    results = []
+    for case_name, column in COLUMN_CASES:
+        columns = [{**column, "description": ""}]
+        # 값 풀 로드와 plan 컴파일은 측정에서 제외
+        dg.generate_table_data('bench', columns, 10, related_data=related_data, seed=0)
+        elapsed, _ = _best_of(args.repeat, lambda: dg.generate_table_data(
+            'bench', columns, args.rows, related_data=related_data, seed=0))
+        results.append(_result(f"columns.{case_name}", int(args.rows / elapsed), "rows/s"))
+    return results
+
+def bench_fk_heavy(args, fk_columns=8, parent_rows=100_000):
+    related_data = {f"dim{i}": pd.DataFrame({f"dim{i}_id": np.arange(1, parent_rows + 1)}) for i in range(fk_columns)}
+    columns = [{"column_name": "fact_id", "data_type": "INT", "description": ""}]
+    columns += [{"column_name": f"dim{i}_id", "data_type": "INT", "description": ""} for i in range(fk_columns)]
+    results = []
+    for distribution in ('uniform', 'zipf'):
+        options = {'fact': {f"dim{i}_id": {'distribution': distribution} for i in range(fk_columns)}}
+        dg.generate_table_data('fact', columns, 10, related_data=related_data, options=options, seed=0)
+        elapsed, _ = _best_of(args.repeat, lambda: dg.generate_table_data(
+            'fact', columns, args.fk_rows, related_data=related_data, options=options, seed=0))
+        results.append(_result(f"fk_heavy.{distribution}", int(args.fk_rows / elapsed), "rows/s", fk_columns=fk_columns))
+    return results
+
+def _local_backend(args):
+    return local_llm.LocalBackend(latency=args.llm_latency, latency_per_token=args.llm_latency_per_token)
+
+def bench_llm_heavy(args, llm_columns=4):
+    columns = [{"column_name": "review_id", "data_type": "INT", "description": ""}]
+    columns += [
+        {"column_name": f"comment_{i}", "data_type": "TEXT", "description": f"[LLM] 상품 리뷰 문장 {i}"}
+        for i in range(llm_columns)
+    ]
+    # 캐시를 쓰면 두 번째 반복부터 LLM 호출이 없으므로 비활성화
+    cache_enabled, llm_cache.CACHE_ENABLED = llm_cache.CACHE_ENABLED, False
+    backend = _local_backend(args)
+    previous_backend = gemini_service.set_backend(backend)
+    try:
+        elapsed, (_, prompt_tokens, candidates_tokens) = _best_of(args.repeat, lambda: dg.generate_table_data(
+            'review', columns, args.llm_rows, model_analysis="", seed=0))
+    finally:
+        gemini_service.set_backend(previous_backend)
+        llm_cache.CACHE_ENABLED = cache_enabled
+    return [_result(
+        "llm_heavy.rows_per_sec", int(args.llm_rows / elapsed), "rows/s",
+        llm_columns=llm_columns, llm_latency=args.llm_latency, llm_calls=backend.calls // max(args.repeat, 1),
+        prompt_tokens=prompt_tokens, candidates_tokens=candidates_tokens
+    )]
+
+def bench_dependency(args):
+    results = []
+    for size in args.schema_sizes:
+        model = synthetic_model(size)
+        def cold():
+            da._analysis_cache.clear()
+            return da.get_generation_order(model)
+        elapsed, _ = _best_of(args.repeat, cold)
+        results.append(_result(f"dependency.tables_{size}", round(elapsed * 1000, 2), "ms", higher_is_better=False))
+    return results
+
+def _end_to_end_model():
+    tables = default_model_tables()
+    return {"tables": [{"table_name": name, "columns": columns} for name, columns in tables.items()]}
+
+def bench_end_to_end(args):
+    model = _end_to_end_model()
+    levels = da.get_generation_levels(model)
+    results = []
+    for size_text in args.sizes:
+        total_rows = parse_size(size_text)
+        quantities = {name: max(int(total_rows * share), 1) for name, share in END_TO_END_SHARES.items()}
+        actual_rows = sum(quantities.values())
+
+        def run():
+            output_dir = tempfile.mkdtemp(prefix='bench_suite_')
+            try:
+                for event in runner.run_generation(
+                    model, levels, quantities, {}, model_analysis="", output_dir=output_dir,
+                    max_workers=args.workers, chunk_size=args.chunk_size, output_format=args.format, seed=0
+                ):
+                    if event['type'] == 'log' and '실패' in event['message']:
+                        raise RuntimeError(event['message'])
+                return sum(os.path.getsize(os.path.join(output_dir, f)) for f in os.listdir(output_dir))
+            finally:
+                shutil.rmtree(output_dir, ignore_errors=True)
+
+        elapsed, output_bytes = _best_of(args.repeat, run)
+        results.append(_result(
+            f"end_to_end.{size_text}", int(actual_rows / elapsed), "rows/s",
+            rows=actual_rows, seconds=round(elapsed, 3), output_bytes=output_bytes, format=args.format
+        ))
+    return results
+
+def _git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def compare(results, baseline, tolerance):
+    """
+    기준 결과와 비교합니다.
+
+    Returns:
+        tuple: (비교 행 리스트, 회귀 지표 이름 리스트)
+    """
+    baseline_by_name = {item['name']: item for item in baseline.get('results', [])}
+    rows, regressions = [], []
+    for item in results:
+        base = baseline_by_name.get(item['name'])
+        if base is None or not base['value']:
+            rows.append((item['name'], None, item['value'], None, ''))
+            continue
+        change = (item['value'] - base['value']) / base['value']
+        if not item['higher_is_better']:
+            change = -change
+        status = ''
+        if change < -tolerance:
+            status = 'REGRESSION'
+            regressions.append(item['name'])
+        elif change > tolerance:
+            status = 'faster'
+        rows.append((item['name'], base['value'], item['value'], change, status))
+    return rows, regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=SCENARIOS, help='실행할 시나리오 (기본값: 전체)')
+    parser.add_argument('--quick', action='store_true', help='작은 크기로 빠르게 실행 (CI용)')
+    parser.add_argument('--rows', type=int, help='컬럼 유형별 측정 행 수')
+    parser.add_argument('--fk-rows', type=int, help='fk_heavy 측정 행 수')
+    parser.add_argument('--llm-rows', type=int, help='llm_heavy 측정 행 수')
+    parser.add_argument('--schema-sizes', type=int, nargs='+', help='dependency 측정 테이블 수')
+    parser.add_argument('--sizes', nargs='+', help='end_to_end 총 행 수 (e.g., 10k 1M 10M)')
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet', 'feather'], help='end_to_end 출력 형식')
+    parser.add_argument('--chunk-size', type=int, default=dg.DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help='end_to_end 워커 프로세스 수')
+    parser.add_argument('--llm-latency', type=float, default=0.05, help='로컬 LLM 백엔드 요청당 지연 시간 (초)')
+    parser.add_argument('--llm-latency-per-token', type=float, default=0.0, help='로컬 LLM 백엔드 출력 토큰당 추가 지연 시간 (초)')
+    parser.add_argument('--repeat', type=int, default=3, help='시나리오별 반복 횟수 (가장 빠른 값 사용)')
+    parser.add_argument('--output', help='결과를 저장할 JSON 파일')
+    parser.add_argument('--baseline', help='비교할 기준 결과 JSON 파일')
+    parser.add_argument('--tolerance', type=float, default=0.10, help='회귀로 판단할 성능 저하 비율 (기본값 0.10)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    preset = PRESETS['quick' if args.quick else 'default']
+    for key, value in preset.items():
+        if getattr(args, key) is None:
+            setattr(args, key, value)
+    scenarios = args.only or SCENARIOS
+
+    # 분석 텍스트가 필요한 경로도 네트워크 없이 실행
+    gemini_service.set_backend(_local_backend(args))
+    functions = {
+        'columns': bench_columns, 'fk_heavy': bench_fk_heavy, 'llm_heavy': bench_llm_heavy,
+        'dependency': bench_dependency, 'end_to_end': bench_end_to_end,
+    }
+    results = []
+    for scenario in scenarios:
+        print(f"[{scenario}] 측정 중...", file=sys.stderr)
+        with contextlib.redirect_stdout(sys.stderr):
+            results.extend(functions[scenario](args))
+
+    report = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec='seconds'),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scenarios": list(scenarios),
+            "params": {key: getattr(args, key) for key in (
+                'rows', 'fk_rows', 'llm_rows', 'schema_sizes', 'sizes', 'format', 'chunk_size', 'workers',
+                'llm_latency', 'llm_latency_per_token', 'repeat')},
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        rows, regressions = compare(results, baseline, args.tolerance)
+        report["comparison"] = {
+            "baseline_revision": baseline.get('meta', {}).get('git_revision'),
+            "tolerance": args.tolerance,
+            "regressions": regressions,
+        }
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    elif args.baseline:
+        print(f"기준: {args.baseline} ({report['comparison']['baseline_revision']}), 허용 저하 {args.tolerance:.0%}")
+        print(f"{'metric':<28}{'baseline':>14}{'current':>14}{'change':>10}  status")
+        for name, base, value, change, status in rows:
+            base_text = f"{base:,}" if base is not None else '-'
+            change_text = f"{change:+.1%}" if change is not None else 'new'
+            print(f"{name:<28}{base_text:>14}{value:>14,}{change_text:>10}  {status}")
+    else:
+        print(f"{'metric':<28}{'value':>14}  unit")
+        for item in results:
+            print(f"{item['name']:<28}{item['value']:>14,}  {item['unit']}")
+
+    if regressions:
+        print(f"성능 회귀 {len(regressions)}건: {', '.join(regressions)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+# benchmarks/bench_unique_values.py
+"""
+고유 값 컬럼 생성 속도를 일반 생성, 그리고 중복이 나오면 다시 뽑는 재시도 방식과 비교합니다.
+
+    plain    고유 표시 없는 같은 규칙 (중복 허용)
+    unique   행 번호 순열/접미사로 만드는 고유 값 생성 (column_plans._unique_generator)
+    retry    일반 규칙으로 뽑고, 이미 나온 값은 고유해질 때까지 다시 뽑는 방식 (행 수가 값 공간에 가까울수록 느려짐)
+
+사용법:
+    python benchmarks/bench_unique_values.py --rows 1000000 --chunk-size 100000
+"""
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 모듈이 stdout에 출력하는 진행 메시지는 stderr로 보냄 (stdout은 결과 전용)
+with contextlib.redirect_stdout(sys.stderr):
+    import column_plans as cp
+
+COLUMNS = {
+    'email': {"column_name": "email", "data_type": "VARCHAR(100)", "description": "이메일"},
+    'phone': {"column_name": "phone", "data_type": "VARCHAR(20)", "description": "전화번호"},
+    'name': {"column_name": "nickname", "data_type": "VARCHAR(30)", "description": "별명"},
+    'int': {"column_name": "member_no", "data_type": "INT", "description": "회원 번호"},
+}
+
+
+def _generate(generator, rows, chunk_size):
+    rng = np.random.default_rng(0)
+    started = time.perf_counter()
+    values = [generator.generate(min(chunk_size, rows - start), {}, rng, None, start + 1) for start in range(0, rows, chunk_size)]
+    return time.perf_counter() - started, np.concatenate([np.asarray(chunk, dtype=object) for chunk in values])
+
+def _generate_with_retry(generator, rows, chunk_size, max_seconds):
+    rng = np.random.default_rng(0)
+    seen = set()
+    started = time.perf_counter()
+    for start in range(0, rows, chunk_size):
+        for value in generator.generate(min(chunk_size, rows - start), {}, rng, None, start + 1):
+            while value in seen:
+                if time.perf_counter() - started > max_seconds:
+                    return None
+                value = generator.generate(1, {}, rng, None, start + 1)[0]
+            seen.add(value)
+    return time.perf_counter() - started
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--columns', nargs='+', default=list(COLUMNS), choices=list(COLUMNS))
+    parser.add_argument('--retry-timeout', type=float, default=60.0, help='retry 방식을 포기하는 시간 (초)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        for name in args.columns:
+            plain = cp.compile_column_plan('bench', COLUMNS[name])
+            unique = cp.compile_column_plan('bench', COLUMNS[name], {'unique': True})
+            _generate(plain, 1000, 1000)  # 값 풀 준비
+            plain_seconds, plain_values = _generate(plain, args.rows, args.chunk_size)
+            unique_seconds, unique_values = _generate(unique, args.rows, args.chunk_size)
+            retry_seconds = _generate_with_retry(plain, args.rows, args.chunk_size, args.retry_timeout)
+            results.append({
+                "column": name,
+                "plain_sec": round(plain_seconds, 3),
+                "plain_distinct": len(set(plain_values.tolist())),
+                "unique_sec": round(unique_seconds, 3),
+                "unique_distinct": len(set(unique_values.tolist())),
+                "retry_sec": round(retry_seconds, 3) if retry_seconds is not None else None,
+            })
+
+    if args.json:
+        print(json.dumps({"rows": args.rows, "results": results}, indent=2))
+        return
+
+    print(f"rows={args.rows:,} chunk_size={args.chunk_size:,} (retry 제한 {args.retry_timeout}초)")
+    print(f"{'column':<8}{'plain(s)':>10}{'distinct':>12}{'unique(s)':>11}{'distinct':>12}{'retry(s)':>10}")
+    for r in results:
+        retry = r['retry_sec'] if r['retry_sec'] is not None else 'timeout'
+        print(f"{r['column']:<8}{r['plain_sec']:>10}{r['plain_distinct']:>12,}{r['unique_sec']:>11}{r['unique_distinct']:>12,}{retry:>10}")
+
+
+if __name__ == '__main__':
+    main()
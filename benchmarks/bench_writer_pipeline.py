@@ -0,0 +1,88 @@
+# benchmarks/bench_writer_pipeline.py
+"""
+청크 기록 방식(generation_runner.WRITER_MODE)별로 이커머스 모델 전체 생성 시간을 비교합니다.
+
+    sync     생성 스레드에서 바로 기록 (생성과 기록이 번갈아 실행)
+    thread   기록 스레드 (pyarrow처럼 GIL을 놓는 writer에서 겹쳐 실행)
+    process  기록 프로세스 (pandas CSV 인코딩도 생성과 겹쳐 실행, 청크 pickle 비용 추가)
+
+CPU가 하나뿐인 환경에서는 겹쳐 실행할 수 없으므로 sync가 가장 빠릅니다.
+
+사용법:
+    python benchmarks/bench_writer_pipeline.py --rows 1000000 --format csv --repeat 2
+"""
+import argparse
+import contextlib
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 모듈이 stdout에 출력하는 진행 메시지는 stderr로 보냄 (stdout은 결과 전용)
+with contextlib.redirect_stdout(sys.stderr):
+    import dependency_analyzer as da
+    import generation_runner as runner
+    from bench_output_formats import default_model_tables
+
+MODES = ('sync', 'thread', 'process')
+
+
+def _run_once(model, levels, quantities, args):
+    output_dir = tempfile.mkdtemp(prefix='bench_writer_')
+    stall = {}
+    try:
+        started = time.perf_counter()
+        for event in runner.run_generation(model, levels, quantities, {}, output_dir=output_dir, max_workers=args.workers,
+                                           chunk_size=args.chunk_size, output_format=args.format, seed=0):
+            if event['type'] == 'progress':
+                stall[(event['table'], event['shard'])] = event['writer_stall_seconds']
+        return time.perf_counter() - started, sum(stall.values())
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=500_000, help='테이블당 행 수 (products는 1,000행)')
+    parser.add_argument('--format', default='csv', choices=['csv', 'parquet', 'feather'])
+    parser.add_argument('--chunk-size', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--queue-size', type=int, default=runner.WRITER_QUEUE_SIZE, help='기록 큐 크기')
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=MODES)
+    parser.add_argument('--repeat', type=int, default=2, help='방식별 반복 횟수 (중앙값 보고)')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력')
+    args = parser.parse_args()
+
+    tables = default_model_tables()
+    model = {"tables": [{"table_name": name, "columns": columns} for name, columns in tables.items()]}
+    levels = da.get_generation_levels(model)
+    quantities = {name: (1000 if name == 'products' else args.rows) for name in tables}
+    runner.WRITER_QUEUE_SIZE = args.queue_size
+
+    results = []
+    with contextlib.redirect_stdout(sys.stderr):
+        for mode in args.modes:
+            runner.WRITER_MODE = mode
+            samples = [_run_once(model, levels, quantities, args) for _ in range(args.repeat)]
+            results.append({
+                "mode": mode,
+                "seconds": round(statistics.median(seconds for seconds, _ in samples), 2),
+                "stall_seconds": round(statistics.median(stall for _, stall in samples), 2),
+            })
+
+    if args.json:
+        print(json.dumps({"cpus": os.cpu_count(), "format": args.format, "rows": args.rows, "results": results}, indent=2))
+        return
+
+    print(f"cpus={os.cpu_count()} format={args.format} rows/table={args.rows:,} queue={args.queue_size} (중앙값 {args.repeat}회)")
+    print(f"{'mode':<10}{'seconds':>10}{'stall(s)':>10}")
+    for r in results:
+        print(f"{r['mode']:<10}{r['seconds']:>10}{r['stall_seconds']:>10}")
+
+
+if __name__ == '__main__':
+    main()
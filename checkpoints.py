@@ -0,0 +1,138 @@
+# checkpoints.py
+import json
+import os
+
+from lazy_imports import lazy_import
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 작업 소유권 확인 없이 동작
+    fcntl = None
+
+pd = lazy_import('pandas')
+
+# 체크포인트 디렉터리 구조
+#   job.json                  작업 파라미터 (재개 시 같은 설정으로 다시 실행)
+#   owner.lock                작업을 실행 중인 서버 프로세스의 pid (실행하는 동안 flock으로 잠금)
+#   model_analysis.txt        LLM 컬럼 생성에 사용한 모델 분석 텍스트 (LLM 캐시 키 유지)
+#   tables/<table>.<shard>.json  테이블(샤드)별 완료 청크 수, 출력 파일 크기, 토큰/LLM 통계
+#   keys/<table>.<shard>.<chunk>.pkl  자식 테이블이 참조할 키 컬럼 (청크별)
+JOB_MANIFEST = 'job.json'
+MODEL_ANALYSIS_FILE = 'model_analysis.txt'
+OWNER_LOCK = 'owner.lock'
+
+
+def write_json_atomic(path, data):
+    """임시 파일에 쓴 뒤 이름을 바꿔, 중간에 종료되어도 이전 내용 또는 새 내용만 남도록 저장합니다."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+def read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+def save_job_manifest(checkpoint_dir, manifest):
+    write_json_atomic(os.path.join(checkpoint_dir, JOB_MANIFEST), manifest)
+
+def load_job_manifest(checkpoint_dir):
+    return read_json(os.path.join(checkpoint_dir, JOB_MANIFEST))
+
+def acquire_job_owner(checkpoint_dir):
+    """
+    작업의 소유권을 얻고 잠금 파일에 현재 pid를 기록합니다.
+    반환한 파일 객체를 release_job_owner로 넘길 때까지(또는 프로세스가 종료될 때까지) 소유권이 유지됩니다.
+
+    Returns:
+        file: 소유권 핸들
+        None: 다른 실행 중인 작업이 이미 소유한 경우
+    """
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    handle = open(os.path.join(checkpoint_dir, OWNER_LOCK), 'a+')
+    if fcntl is not None:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            handle.close()
+            return None
+    handle.seek(0)
+    handle.truncate()
+    handle.write(str(os.getpid()))
+    handle.flush()
+    return handle
+
+def release_job_owner(handle):
+    if handle is None:
+        return
+    if fcntl is not None:
+        fcntl.flock(handle, fcntl.LOCK_UN)
+    handle.close()
+
+def job_owner_alive(checkpoint_dir):
+    """작업을 소유한 프로세스(이 프로세스 포함)가 아직 실행 중이면 True. 잠금은 프로세스가 종료되면 풀립니다."""
+    if fcntl is None:
+        return False
+    try:
+        handle = open(os.path.join(checkpoint_dir, OWNER_LOCK), 'r')
+    except OSError:
+        return False
+    with handle:
+        try:
+            fcntl.flock(handle, fcntl.LOCK_SH | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(handle, fcntl.LOCK_UN)
+        return False
+
+def save_model_analysis(checkpoint_dir, text):
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    tmp_path = os.path.join(checkpoint_dir, f"{MODEL_ANALYSIS_FILE}.{os.getpid()}.tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text or "")
+    os.replace(tmp_path, os.path.join(checkpoint_dir, MODEL_ANALYSIS_FILE))
+
+def load_model_analysis(checkpoint_dir):
+    """저장된 모델 분석 텍스트. 저장된 적이 없으면 None."""
+    try:
+        with open(os.path.join(checkpoint_dir, MODEL_ANALYSIS_FILE), 'r', encoding='utf-8') as f:
+            return f.read()
+    except OSError:
+        return None
+
+def _table_state_path(checkpoint_dir, table_name, shard_index):
+    return os.path.join(checkpoint_dir, 'tables', f"{table_name}.{shard_index:05d}.json")
+
+def _chunk_keys_path(checkpoint_dir, table_name, shard_index, chunk_index):
+    return os.path.join(checkpoint_dir, 'keys', f"{table_name}.{shard_index:05d}.{chunk_index:06d}.pkl")
+
+def load_table_state(checkpoint_dir, table_name, shard_index=0):
+    """
+    테이블(샤드)의 체크포인트 상태.
+
+    Returns:
+        dict: {'chunks_done', 'rows_done', 'bytes', 'prompt_tokens', 'candidates_tokens', 'llm_stats', 'complete'}
+        None: 체크포인트가 없는 경우
+    """
+    return read_json(_table_state_path(checkpoint_dir, table_name, shard_index))
+
+def save_table_state(checkpoint_dir, table_name, shard_index, state):
+    write_json_atomic(_table_state_path(checkpoint_dir, table_name, shard_index), state)
+
+def save_chunk_keys(checkpoint_dir, table_name, shard_index, chunk_index, keys_df):
+    path = _chunk_keys_path(checkpoint_dir, table_name, shard_index, chunk_index)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    keys_df.to_pickle(tmp_path)
+    os.replace(tmp_path, path)
+
+def load_chunk_keys(checkpoint_dir, table_name, shard_index, chunk_count):
+    """완료된 청크 0..chunk_count-1의 키 컬럼 DataFrame 리스트."""
+    return [
+        pd.read_pickle(_chunk_keys_path(checkpoint_dir, table_name, shard_index, chunk_index))
+        for chunk_index in range(chunk_count)
+    ]
@@ -0,0 +1,539 @@
+# column_plans.py
+import json
+import math
+import re
+import zlib
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import faker_pools
+import foreign_keys as fk
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+STATUS_VALUES = ['completed', 'shipped', 'pending', 'cancelled']
+CATEGORY_VALUES = ['의류', '가전', '식품', '도서', '스포츠']
+
+# 컴파일된 컬럼 생성기 캐시 크기 (컬럼 정의 + 옵션 조합 기준)
+PLAN_CACHE_SIZE = 4096
+
+# 데이터 타입 이름(괄호 앞 부분) -> 생성 시점에 적용할 dtype
+INTEGER_DTYPES = {
+    'tinyint': 'int8', 'smallint': 'int16', 'mediumint': 'int32', 'int': 'int32', 'integer': 'int32',
+    'serial': 'int32', 'bigint': 'int64', 'bigserial': 'int64',
+}
+FLOAT_TYPES = ('float', 'double', 'real')
+DECIMAL_TYPES = ('decimal', 'numeric')
+DATETIME_TYPES = ('timestamp', 'datetime', 'date')
+BOOLEAN_TYPES = ('bool', 'boolean')
+STRING_TYPES = ('char', 'varchar', 'nchar', 'nvarchar', 'text', 'tinytext', 'mediumtext', 'longtext', 'string', 'uuid')
+# 문자열 dtype을 나타내는 표식 (pyarrow 유무에 따라 실제 dtype은 string_dtype()에서 결정)
+STRING_DTYPE = 'string'
+# TIMESTAMP/DATE 컬럼 dtype (날짜 생성기는 초 단위로 만들고 cast_values에서 나노초로 맞춤)
+DATETIME_DTYPE = 'datetime64[ns]'
+
+_BASE_TYPE_PATTERN = re.compile(r'[a-z]+')
+
+# 고유 값 컬럼 표시 (설명의 태그, 옵션 {"unique": true}, 또는 데이터 타입의 UNIQUE)
+UNIQUE_TAG = '[UNIQUE]'
+# 고유 값 접미사: 행 번호를 섞은 고정 길이 36진수 코드 (36^6 ≈ 21억 행까지 고유)
+UNIQUE_CODE_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+UNIQUE_CODE_WIDTH = 6
+# 행 번호 순열 (x * a + b) mod m 의 곱수 후보 (소수). m과 서로소인 첫 값을 사용
+_PERMUTATION_MULTIPLIERS = (2654435761, 2246822519, 3266489917, 668265263, 374761393)
+# int64 곱셈이 넘치지 않는 순열 도메인 상한
+_MAX_PERMUTATION_DOMAIN = 3_000_000_000
+_INT32_MAX = 2**31 - 1
+
+# '최근 2년' 같은 상대 날짜 규칙의 기준 시각 (None이면 현재 시각)
+_reference_time = None
+
+
+def set_reference_time(value=None):
+    """
+    상대 날짜 규칙의 기준 시각을 고정합니다. 시드 지정 생성을 다른 시점/머신에서 재현할 때 사용합니다.
+
+    Args:
+        value (datetime | str | None): 기준 시각 (ISO 문자열 가능). None이면 현재 시각 사용
+    """
+    global _reference_time
+    _reference_time = pd.Timestamp(value).to_pydatetime() if value is not None else None
+
+def reference_now():
+    return _reference_time if _reference_time is not None else datetime.now()
+
+
+# --- 벡터 생성 헬퍼 ---
+def _random_choice(rng, values, num_rows):
+    """후보 리스트에서 num_rows개를 한 번에 뽑습니다."""
+    pool = np.empty(len(values), dtype=object)
+    pool[:] = list(values)
+    return pool[rng.integers(0, len(pool), size=num_rows)]
+
+def _random_datetimes(rng, start, end, num_rows):
+    """[start, end] 구간의 초 단위 datetime 배열을 한 번에 생성합니다."""
+    start_s = int(pd.Timestamp(start).timestamp())
+    end_s = max(int(pd.Timestamp(end).timestamp()), start_s)
+    seconds = rng.integers(start_s, end_s + 1, size=num_rows)
+    return pd.to_datetime(seconds, unit='s')
+
+def _per_cell(func, num_rows):
+    """벡터화 경로가 없는 Faker 프로바이더는 셀 단위로 호출합니다."""
+    return [func() for _ in range(num_rows)]
+
+def _categorical_choice(rng, values, num_rows):
+    """후보 리스트에서 num_rows개를 뽑아 범주형으로 반환합니다. (_random_choice와 같은 난수열 사용)"""
+    return pd.Categorical.from_codes(rng.integers(0, len(values), size=num_rows), categories=list(values))
+
+
+# --- 컬럼 dtype ---
+@lru_cache(maxsize=1)
+def string_dtype():
+    """
+    텍스트 컬럼에 사용할 Arrow 기반 문자열 dtype. 결측값은 NaN으로 표시합니다. (pandas 3의 기본 'str'과 같음)
+    pyarrow가 없으면 None을 반환하고, 이 경우 텍스트 컬럼은 변환하지 않습니다.
+    """
+    try:
+        return pd.StringDtype('pyarrow', na_value=np.nan)
+    except TypeError:
+        # na_value 인자가 없는 이전 pandas
+        try:
+            return pd.StringDtype('pyarrow')
+        except ImportError:
+            return None
+    except ImportError:
+        return None
+
+def resolve_dtype(col_type, detail=None):
+    """
+    컬럼의 data_type(소문자)으로 생성 시점에 적용할 dtype 이름을 결정합니다. 매핑이 없으면 None.
+    INT 계열은 크기별 정수, DECIMAL/FLOAT는 float64(정수 값은 고정 소수점 정수로 유지),
+    TIMESTAMP/DATE는 datetime64, 텍스트는 Arrow 문자열입니다.
+    범위(detail의 min/max)가 int32를 넘는 INT 컬럼은 int64로 올립니다.
+    """
+    match = _BASE_TYPE_PATTERN.match(col_type.strip())
+    base_type = match.group(0) if match else ''
+    if base_type in INTEGER_DTYPES:
+        dtype = INTEGER_DTYPES[base_type]
+        detail = detail or {}
+        if 'min' in detail and 'max' in detail:
+            info = np.iinfo(dtype)
+            if not info.min <= detail['min'] <= detail['max'] <= info.max:
+                dtype = 'int64'
+        return dtype
+    if base_type in DECIMAL_TYPES or base_type in FLOAT_TYPES:
+        return 'float64'
+    if base_type in DATETIME_TYPES:
+        return DATETIME_DTYPE
+    if base_type in BOOLEAN_TYPES:
+        return 'bool'
+    if base_type in STRING_TYPES:
+        return STRING_DTYPE
+    return None
+
+def cast_values(values, dtype):
+    """
+    생성된 값 배열을 컬럼 dtype으로 변환합니다. 값의 종류가 dtype과 맞지 않거나 범위를 넘으면
+    원래 값을 그대로 반환합니다. (예: INT 컬럼에 문자열 규칙이 매칭된 경우, int32 범위를 넘는 키)
+    날짜 배열은 dtype의 시간 단위로 맞추고, 실수/불리언 컬럼은 생성기가 이미 해당 dtype의 배열을 만들며,
+    범주형 값은 그대로 둡니다.
+    """
+    if dtype is None or isinstance(values, pd.Categorical):
+        return values
+    if dtype == STRING_DTYPE:
+        target = string_dtype()
+        if target is None or (isinstance(values, np.ndarray) and values.dtype.kind != 'O'):
+            return values
+        try:
+            return pd.array(values, dtype=target)
+        except (TypeError, ValueError):
+            return values
+    if dtype.startswith('int') and isinstance(values, np.ndarray) and values.dtype.kind in 'iu':
+        if values.dtype == dtype:
+            return values
+        info = np.iinfo(dtype)
+        if len(values) and (values.min() < info.min or values.max() > info.max):
+            return values
+        return values.astype(dtype)
+    if dtype.startswith('datetime64') and isinstance(values, (pd.DatetimeIndex, np.ndarray)) and values.dtype.kind == 'M':
+        return values.astype(dtype) if values.dtype != dtype else values
+    return values
+
+
+class ColumnGenerator:
+    """
+    컬럼 하나에 대해 규칙 매칭을 끝낸 생성기.
+    테이블마다 한 번 컴파일되어 모든 행/청크 생성에 재사용됩니다.
+    """
+
+    def __init__(self, column_name, rule, generate_fn, vectorized=True, detail=None, dtype=None):
+        self.column_name = column_name
+        self.rule = rule
+        self.vectorized = vectorized
+        self.detail = detail or {}
+        self.dtype = dtype
+        self._generate_fn = generate_fn
+
+    @property
+    def is_llm(self):
+        return self.rule == 'llm'
+
+    def generate(self, num_rows, related_data, rng, fake, start_index=1):
+        """
+        num_rows개의 값을 생성합니다. 컬럼 dtype(resolve_dtype)이 있으면 그 dtype의 배열로 반환합니다.
+
+        Args:
+            num_rows (int): 생성할 행 수
+            related_data (dict): 이미 생성된 부모 테이블 데이터
+            rng (np.random.Generator): 벡터 생성용 난수 생성기
+            fake (Faker): 셀 단위 생성용 Faker 인스턴스
+            start_index (int): 청크의 첫 행 번호 (기본 키 생성에 사용)
+        """
+        return cast_values(self._generate_fn(num_rows, related_data, rng, fake, start_index), self.dtype)
+
+    def describe(self):
+        """어떤 규칙이 매칭되었는지 JSON으로 직렬화 가능한 형태로 반환합니다."""
+        description = {
+            "column_name": self.column_name,
+            "rule": self.rule,
+            "vectorized": self.vectorized,
+            "dtype": 'category' if self.detail.get('categorical') else self.dtype,
+        }
+        if self.detail:
+            description["detail"] = self.detail
+        return description
+
+
+def _faker_generator(column_name, rule, provider):
+    """
+    Faker 프로바이더 컬럼 생성기. 값 풀(faker_pools)이 켜져 있으면 풀에서 인덱스 배열로 한 번에 뽑고,
+    꺼져 있으면 셀 단위로 Faker를 호출합니다.
+    """
+    if faker_pools.POOLS_ENABLED:
+        return ColumnGenerator(
+            column_name, rule,
+            lambda n, related, rng, fake, start: faker_pools.sample(provider, rng, n),
+            detail={"pool": provider, "combined": faker_pools.COMBINE_PARTS and provider in faker_pools.COMPOSITES}
+        )
+    provider_fn = faker_pools.PROVIDERS[provider]
+    return ColumnGenerator(
+        column_name, rule,
+        lambda n, related, rng, fake, start: _per_cell(lambda: provider_fn(fake), n),
+        vectorized=False
+    )
+
+def _choice_generator(column_name, rule, values):
+    """
+    후보 값 중 하나를 뽑는 생성기. 후보가 서로 다른 문자열이면 범주형(코드 배열 + 후보 목록)으로 생성해
+    행마다 문자열 객체를 두지 않습니다.
+    """
+    values = list(values)
+    if all(isinstance(value, str) for value in values) and len(set(values)) == len(values):
+        return ColumnGenerator(
+            column_name, rule,
+            lambda n, related, rng, fake, start: _categorical_choice(rng, values, n),
+            detail={"values": values, "categorical": True}
+        )
+    return ColumnGenerator(
+        column_name, rule,
+        lambda n, related, rng, fake, start: _random_choice(rng, values, n),
+        detail={"values": values}
+    )
+
+def _int_range_generator(column_name, rule, low, high, multiplier=1):
+    def generate(n, related, rng, fake, start):
+        values = rng.integers(low, high + 1, size=n)
+        return values * multiplier if multiplier != 1 else values
+    detail = {"min": low * multiplier, "max": high * multiplier}
+    if multiplier != 1:
+        detail["step"] = multiplier
+    return ColumnGenerator(column_name, rule, generate, detail=detail)
+
+# --- 고유 값 생성 ---
+def permute_rows(row_numbers, domain, salt=0, split=None):
+    """
+    0부터 시작하는 행 번호를 [0, domain) 안의 서로 다른 값으로 섞습니다.
+    (x * a + b) mod domain 에서 a가 domain과 서로소이면 전단사이므로, 행 번호만 다르면 값도 다릅니다.
+    청크/샤드가 자기 행 번호만 알면 되므로 서로 조율하지 않아도 전체에서 고유합니다.
+
+    split이 domain의 약수이면 값을 (몫, 나머지)로 나눠 서로 섞는 라운드를 한 번 더 거칩니다.
+    각 단계가 전단사라 고유성은 그대로이고, 일정 간격의 행이 같은 끝자리를 갖는 규칙성을 없앱니다.
+    """
+    if len(row_numbers) and row_numbers.max() >= domain:
+        raise ValueError(f"고유 값 범위({domain:,}개)보다 행이 많습니다 (행 번호 {int(row_numbers.max()) + 1:,})")
+    multiplier = next(p for p in _PERMUTATION_MULTIPLIERS if math.gcd(p, domain) == 1) % domain
+    values = (row_numbers.astype(np.int64) * multiplier + salt % domain) % domain
+    if split:
+        high, low = values // split, values % split
+        low = (low + (high * _PERMUTATION_MULTIPLIERS[1] + salt) // 7) % split
+        high = (high + (low * _PERMUTATION_MULTIPLIERS[2] + salt) // 7) % (domain // split)
+        values = high * split + low
+    return values
+
+def _code_chars(values, alphabet, width):
+    """정수 배열을 alphabet 진법의 고정 길이 문자 행렬((n, width) 배열, 한 칸에 한 글자)로 바꿉니다."""
+    base = len(alphabet)
+    digits = values[:, None] // base ** np.arange(width - 1, -1, -1, dtype=np.int64) % base
+    return np.array(list(alphabet))[digits]
+
+def _join_chars(chars):
+    """_code_chars 문자 행렬의 각 행을 문자열 하나로 합친 object 배열을 반환합니다."""
+    chars = np.ascontiguousarray(chars)
+    return chars.view(f'<U{chars.shape[1]}').ravel().astype(object)
+
+def unique_codes(row_numbers, salt=0):
+    """행 번호마다 서로 다른 고정 길이 36진수 코드(object 배열)를 만듭니다."""
+    half = len(UNIQUE_CODE_ALPHABET) ** (UNIQUE_CODE_WIDTH // 2)
+    values = permute_rows(row_numbers, half ** 2, salt, split=half)
+    return _join_chars(_code_chars(values, UNIQUE_CODE_ALPHABET, UNIQUE_CODE_WIDTH))
+
+def _is_unique_column(column_detail, options):
+    return (
+        bool((options or {}).get('unique'))
+        or UNIQUE_TAG in column_detail.get('description', '')
+        or 'unique' in column_detail.get('data_type', '').lower()
+    )
+
+def _unique_generator(table_name, generator):
+    """
+    생성기를 행 번호 기반 고유 값 생성기로 감쌉니다. 재시도 없이 청크당 O(N)입니다.
+    만들 수 있는 고유 값 개수는 detail의 capacity에 기록합니다. (check_unique_capacity로 확인)
+
+        정수 범위    최솟값 + 간격(step) × 범위 안에서 섞은 행 번호 (기본 int 규칙은 양의 int32 전체를 범위로 사용)
+        전화번호     '010-' + 섞은 8자리 번호
+        이메일       아이디 뒤에 '.코드'를 붙임 (user.k3x9a0@example.com)
+        그 밖의 Faker 문자열   값 뒤에 '-코드'를 붙임
+
+    지원하지 않는 규칙(LLM, 외래 키, 선택 목록, 날짜, 실수 등)은 원래 생성기를 그대로 반환합니다.
+    """
+    column_name, rule, detail = generator.column_name, generator.rule, generator.detail
+    salt = zlib.crc32(f"{table_name}.{column_name}".encode('utf-8'))
+
+    def row_numbers(start, n):
+        return np.arange(start - 1, start - 1 + n, dtype=np.int64)
+
+    if rule == 'primary_key':
+        return generator
+    if isinstance(detail.get('min'), int) and isinstance(detail.get('max'), int):
+        low, high = (1, _INT32_MAX) if rule == 'int' else (detail['min'], detail['max'])
+        step = detail.get('step', 1)
+        domain = min((high - low) // step + 1, _MAX_PERMUTATION_DOMAIN)
+        unique_detail = {"min": low, "max": low + step * (domain - 1), "unique": True, "capacity": domain}
+        if step != 1:
+            unique_detail["step"] = step
+        return ColumnGenerator(
+            column_name, rule,
+            lambda n, related, rng, fake, start: low + step * permute_rows(row_numbers(start, n), domain, salt),
+            detail=unique_detail
+        )
+    provider = rule.split(':', 1)[1] if rule.startswith('faker:') else FAKER_OPTION_TYPES.get(rule.split(':', 1)[-1])
+    if not rule.startswith(('faker:', 'options.type:')) or provider is None:
+        print(f"고유 값 생성을 지원하지 않는 규칙입니다 ({table_name}.{column_name}: {rule}). 일반 규칙으로 생성합니다.")
+        return generator
+
+    capacity = 10**8 if provider == 'phone' else len(UNIQUE_CODE_ALPHABET) ** UNIQUE_CODE_WIDTH
+    if provider == 'phone':
+        def generate(n, related, rng, fake, start):
+            digits = _code_chars(permute_rows(row_numbers(start, n), 10**8, salt, split=10**4), '0123456789', 8)
+            dashes = np.full((n, 1), '-')
+            return _join_chars(np.hstack([np.full((n, 3), list('010')), dashes, digits[:, :4], dashes, digits[:, 4:]]))
+    elif provider == 'email':
+        def generate(n, related, rng, fake, start):
+            values = np.asarray(generator._generate_fn(n, related, rng, fake, start), dtype=object)
+            parts = np.char.rpartition(values.astype(str), '@')
+            return parts[:, 0].astype(object) + '.' + unique_codes(row_numbers(start, n), salt) + '@' + parts[:, 2].astype(object)
+    else:
+        def generate(n, related, rng, fake, start):
+            values = np.asarray(generator._generate_fn(n, related, rng, fake, start), dtype=object)
+            return values + '-' + unique_codes(row_numbers(start, n), salt)
+    return ColumnGenerator(column_name, rule, generate, vectorized=generator.vectorized,
+                           detail={**detail, "unique": True, "capacity": capacity})
+
+def check_unique_capacity(table_name, plan, num_rows):
+    """
+    고유 값 컬럼의 값 범위(detail의 capacity)가 num_rows행을 모두 담을 수 있는지 확인합니다.
+    생성을 시작하기 전에 호출해, 범위가 부족하면 값을 만들기 전에 ValueError로 중단합니다.
+    """
+    for generator in plan:
+        capacity = generator.detail.get('capacity')
+        if capacity is not None and num_rows > capacity:
+            raise ValueError(
+                f"고유 값 컬럼 {table_name}.{generator.column_name}의 값 범위({capacity:,}개)가 "
+                f"생성할 행 수({num_rows:,})보다 작습니다. 범위를 넓히거나 고유 표시를 해제하세요."
+            )
+
+# options.type 값 -> faker_pools 프로바이더
+FAKER_OPTION_TYPES = {
+    'name': 'name',
+    'email': 'email',
+    'address': 'address',
+    'company': 'company',
+    'phone': 'phone',
+}
+
+def _compile_options(column_name, col_type, options):
+    """사용자 옵션(options)으로 결정되는 생성기를 반환합니다. 해당 없으면 None."""
+    if 'list' in options and options['list']:
+        return _choice_generator(column_name, 'options.list', options['list'])
+    if 'min' in options and 'max' in options:
+        if 'int' in col_type:
+            return _int_range_generator(column_name, 'options.range', int(options['min']), int(options['max']))
+        low, high = float(options['min']), float(options['max'])
+        return ColumnGenerator(
+            column_name, 'options.range',
+            lambda n, related, rng, fake, start: np.round(rng.uniform(low, high, size=n), 2),
+            detail={"min": low, "max": high}
+        )
+    if 'startDate' in options and 'endDate' in options:
+        try:
+            start_dt = datetime.strptime(options['startDate'], '%Y-%m-%d')
+            end_dt = datetime.strptime(options['endDate'], '%Y-%m-%d')
+            return ColumnGenerator(
+                column_name, 'options.date_range',
+                lambda n, related, rng, fake, start: _random_datetimes(rng, start_dt, end_dt, n),
+                detail={"startDate": options['startDate'], "endDate": options['endDate']}
+            )
+        except (ValueError, TypeError):
+            pass
+    if 'type' in options and options['type'] in FAKER_OPTION_TYPES:
+        faker_type = options['type']
+        return _faker_generator(column_name, f"options.type:{faker_type}", FAKER_OPTION_TYPES[faker_type])
+    return None
+
+def _compile_foreign_key(column_name, col_name, col_type, table_name, options):
+    """'xxx_id' 컬럼이 다른 테이블을 참조하면 외래 키 생성기를 반환합니다."""
+    pk_candidate1 = f"{table_name}_id"
+    pk_candidate2 = f"{table_name.rstrip('s')}_id"
+    if col_name == pk_candidate1 or col_name == pk_candidate2:
+        return None
+
+    parent_table_prefix = col_name.replace('_id', '')
+    parent_tables = (f"{parent_table_prefix}s", parent_table_prefix)
+    parent_pk_col = f"{parent_table_prefix}_id"
+    sample_params = fk.parse_distribution_options(options)
+
+    def generate(n, related, rng, fake, start):
+        parent_index = fk.get_foreign_key_index(related, parent_tables, parent_pk_col)
+        if parent_index is None:
+            # 부모 데이터가 없으면 이전과 동일하게 일반 규칙으로 생성
+            return fallback.generate(n, related, rng, fake, start)
+        return parent_index.sample(n, rng, start_index=start, **sample_params)
+
+    fallback = _compile_heuristics(column_name, col_name, col_type)
+    return ColumnGenerator(
+        column_name, 'foreign_key', generate,
+        detail={
+            "parent_tables": list(parent_tables), "parent_column": parent_pk_col,
+            "fallback": fallback.rule, **sample_params
+        }
+    )
+
+def _compile_heuristics(column_name, col_name, col_type):
+    """컬럼명/데이터 타입 휴리스틱으로 생성기를 결정합니다."""
+    if 'name' in col_name or '이름' in col_name: return _faker_generator(column_name, 'faker:name', 'name')
+    if 'email' in col_name: return _faker_generator(column_name, 'faker:email', 'email')
+    if 'address' in col_name or '주소' in col_name: return _faker_generator(column_name, 'faker:address', 'address')
+    if 'phone' in col_name or '전화' in col_name: return _faker_generator(column_name, 'faker:phone', 'phone')
+    if 'company' in col_name or '회사' in col_name: return _faker_generator(column_name, 'faker:company', 'company')
+    if 'title' in col_name or '제목' in col_name: return _faker_generator(column_name, 'faker:catch_phrase', 'catch_phrase')
+    if 'description' in col_name or 'comment' in col_name or '내용' in col_name:
+        return _faker_generator(column_name, 'faker:text', 'text')
+    if 'status' in col_name: return _choice_generator(column_name, 'status', STATUS_VALUES)
+    if 'category' in col_name: return _choice_generator(column_name, 'category', CATEGORY_VALUES)
+    if 'price' in col_name or 'amount' in col_name: return _int_range_generator(column_name, 'price', 100, 5000, multiplier=100)
+    if 'quantity' in col_name or '수량' in col_name: return _int_range_generator(column_name, 'quantity', 1, 10)
+    if 'rating' in col_name or '평점' in col_name: return _int_range_generator(column_name, 'rating', 1, 5)
+    if 'date' in col_name or 'timestamp' in col_type or '_at' in col_name:
+        def recent_datetimes(n, related, rng, fake, start):
+            now = reference_now()
+            return _random_datetimes(rng, now - timedelta(days=730), now, n)
+        return ColumnGenerator(column_name, 'datetime:last_2_years', recent_datetimes)
+
+    if 'int' in col_type: return _int_range_generator(column_name, 'int', 1, 1000)
+    if 'decimal' in col_type or 'float' in col_type:
+        return ColumnGenerator(
+            column_name, 'decimal',
+            lambda n, related, rng, fake, start: rng.integers(0, 10_000_000, size=n) / 100
+        )
+    if 'date' in col_type or 'timestamp' in col_type:
+        def decade_datetimes(n, related, rng, fake, start):
+            now = reference_now()
+            return _random_datetimes(rng, datetime(now.year - now.year % 10, 1, 1), now, n)
+        return ColumnGenerator(column_name, 'datetime:this_decade', decade_datetimes)
+    if 'boolean' in col_type:
+        return ColumnGenerator(column_name, 'boolean', lambda n, related, rng, fake, start: rng.random(n) < 0.5)
+
+    return _faker_generator(column_name, 'faker:word', 'word')
+
+def _compile_column(table_name, column_detail, options):
+    generator = _match_column_rule(table_name, column_detail, options)
+    if _is_unique_column(column_detail, options):
+        generator = _unique_generator(table_name, generator)
+    generator.dtype = resolve_dtype(column_detail.get('data_type', '').lower(), generator.detail)
+    return generator
+
+def _match_column_rule(table_name, column_detail, options):
+    column_name = column_detail.get('column_name')
+    col_name = (column_name or '').lower()
+    col_type = column_detail.get('data_type', '').lower()
+
+    if '[LLM]' in column_detail.get('description', ''):
+        def llm_not_vectorized(n, related, rng, fake, start):
+            raise ValueError(f"LLM 컬럼은 generate_llm_data_with_fallback으로 생성해야 합니다: {column_name}")
+        return ColumnGenerator(column_name, 'llm', llm_not_vectorized, vectorized=False)
+
+    # 기본 키 처리
+    if column_name == f"{table_name.rstrip('s')}_id":
+        return ColumnGenerator(
+            column_name, 'primary_key',
+            lambda n, related, rng, fake, start: np.arange(start, start + n)
+        )
+
+    if options:
+        generator = _compile_options(column_name, col_type, options)
+        if generator is not None:
+            return generator
+
+    if col_name.endswith('_id'):
+        generator = _compile_foreign_key(column_name, col_name, col_type, table_name, options)
+        if generator is not None:
+            return generator
+
+    return _compile_heuristics(column_name, col_name, col_type)
+
+@lru_cache(maxsize=PLAN_CACHE_SIZE)
+def _compile_column_cached(table_name, column_key, options_key):
+    return _compile_column(table_name, json.loads(column_key), json.loads(options_key))
+
+def compile_column_plan(table_name, column_detail, options=None):
+    """
+    컬럼 정의와 옵션을 컴파일된 ColumnGenerator로 변환합니다.
+    동일한 (테이블, 컬럼 정의, 옵션) 조합은 캐시된 생성기를 재사용합니다.
+    """
+    column_key = json.dumps(column_detail, sort_keys=True, ensure_ascii=False)
+    options_key = json.dumps(options or {}, sort_keys=True, ensure_ascii=False)
+    return _compile_column_cached(table_name, column_key, options_key)
+
+def build_table_plan(table_name, columns_details, options=None):
+    """
+    테이블의 모든 컬럼을 컴파일합니다. (컬럼명이 없는 정의는 제외)
+
+    Args:
+        table_name (str): 테이블 이름
+        columns_details (list): 컬럼 정의 리스트
+        options (dict): {테이블명: {컬럼명: 옵션}} 형식의 생성 옵션
+
+    Returns:
+        list: 모델에 정의된 순서대로 정렬된 ColumnGenerator 리스트
+    """
+    table_options = (options or {}).get(table_name, {})
+    return [
+        compile_column_plan(table_name, col_detail, table_options.get(col_detail['column_name'], {}))
+        for col_detail in columns_details if col_detail.get('column_name')
+    ]
+
+def describe_table_plan(plan):
+    """build_table_plan 결과를 JSON 응답용 리스트로 변환합니다."""
+    return [generator.describe() for generator in plan]
@@ -1,234 +1,542 @@
 # data_generator.py
-import pandas as pd
-from faker import Faker
-import random
-from datetime import datetime
 import gemini_service
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import column_plans as cp
+import llm_cache
+import metrics
+import sqlite3
 import json
 import re
 import time
+import zlib
+from lazy_imports import lazy_import
 
-# Faker 인스턴스 생성 (한국어)
-fake = Faker('ko_KR')
+# pandas/numpy/Faker는 처음 생성할 때 로드 (앱 시작 시간 단축)
+pd = lazy_import('pandas')
+np = lazy_import('numpy')
+faker = lazy_import('faker')
+
+# 기본 Faker 인스턴스(한국어)와 컬럼 단위 벡터 생성용 난수 생성기. 처음 사용할 때 만듭니다. (get_fake, get_rng)
+_default_fake = None
+_default_rng = None
+_defaults_lock = threading.Lock()
+
+# 시드 지정 생성에서 스레드별로 재사용하는 Faker (seed_instance로 컬럼마다 다시 시드)
+_seeded_fakers = threading.local()
+
+# 청크 단위 생성 시 기본 청크 크기 (행 수)
+DEFAULT_CHUNK_SIZE = 100_000
+
+# 동시에 진행할 수 있는 최대 LLM 요청 수 (프로세스 간 공유 세마포어로 교체 가능)
+LLM_MAX_IN_FLIGHT = int(os.getenv('LLM_MAX_IN_FLIGHT', 8))
+_llm_slots = threading.BoundedSemaphore(LLM_MAX_IN_FLIGHT)
+
+# LLM 배치 설정: 값당 예상 출력 토큰 수, 출력 토큰 한도 중 값에 쓸 비율, 부족분 재요청 최대 라운드
+LLM_TOKENS_PER_VALUE = int(os.getenv('LLM_TOKENS_PER_VALUE', 12))
+LLM_OUTPUT_BUDGET_RATIO = 0.8
+LLM_MAX_ROUNDS = 4
+
+# 프롬프트 형식이 바뀌면 올려서 기존 LLM 캐시를 무효화
+LLM_PROMPT_VERSION = 2
+
+_stats_lock = threading.Lock()
+
+def configure_llm_concurrency(max_in_flight=None, semaphore=None):
+    """
+    LLM 동시 요청 한도를 설정합니다.
+
+    Args:
+        max_in_flight (int): 이 프로세스의 최대 동시 요청 수
+        semaphore: 여러 워커 프로세스가 공유할 세마포어 (e.g., multiprocessing.Manager().BoundedSemaphore)
+    """
+    global _llm_slots
+    if semaphore is not None:
+        _llm_slots = semaphore
+    elif max_in_flight:
+        _llm_slots = threading.BoundedSemaphore(int(max_in_flight))
+
+def _generate_content_limited(prompt):
+    """동시 요청 한도 안에서 Gemini를 호출합니다. 한도 대기 시간과 요청 지연 시간을 따로 기록합니다."""
+    queued_at = time.perf_counter()
+    with _llm_slots:
+        started_at = time.perf_counter()
+        metrics.observe('datagen_llm_queue_seconds', started_at - queued_at)
+        status = 'exception'
+        try:
+            result = gemini_service.generate_content_with_usage(prompt)
+            status = result.get('status', 'unknown')
+            return result
+        finally:
+            metrics.observe('datagen_llm_request_seconds', time.perf_counter() - started_at, status=status)
+
+def get_rng():
+    """시드 미지정 생성에 쓰는 프로세스 전역 난수 생성기."""
+    global _default_rng
+    if _default_rng is None:
+        with _defaults_lock:
+            if _default_rng is None:
+                _default_rng = np.random.default_rng()
+    return _default_rng
+
+def get_fake():
+    """시드 미지정 생성에 쓰는 프로세스 전역 Faker('ko_KR'). get_rng()에서 뽑은 값으로 시드합니다."""
+    global _default_fake
+    if _default_fake is None:
+        rng = get_rng()
+        with _defaults_lock:
+            if _default_fake is None:
+                fake = faker.Faker('ko_KR')
+                fake.seed_instance(int(rng.integers(0, 2**63)))
+                _default_fake = fake
+    return _default_fake
+
+def reseed_defaults():
+    """
+    전역 난수 생성기를 새 엔트로피로 다시 만들고 Faker도 다시 시드합니다.
+    fork로 시작한 워커 프로세스가 부모(또는 다른 워커)와 같은 난수열을 쓰지 않도록 워커 초기화 때 호출합니다.
+    """
+    global _default_rng
+    with _defaults_lock:
+        _default_rng = np.random.default_rng()
+        if _default_fake is not None:
+            _default_fake.seed_instance(int(_default_rng.integers(0, 2**63)))
+
+def warm_up():
+    """
+    생성에 필요한 무거운 모듈(pandas, numpy, Faker)과 전역 Faker를 미리 로드합니다.
+    프로세스 풀을 만들기 전이나 pre-fork 서버의 마스터 프로세스에서 호출하면 자식 프로세스가 로드된 상태를 물려받습니다.
+    """
+    pd.DataFrame
+    get_fake()
 
 def generate_faker_value(column_detail, table_name, related_data, options=None):
     """
     Faker 또는 규칙 기반으로 단일 값을 생성합니다. (LLM 호출 로직 제외)
+    규칙 매칭은 캐시된 컬럼 생성기를 재사용합니다.
     """
-    if options is None: options = {}
-    col_name = column_detail.get('column_name', '').lower()
-    col_type = column_detail.get('data_type', '').lower()
-
-    if options:
-        if 'list' in options and options['list']:
-            return random.choice(options['list'])
-        if 'min' in options and 'max' in options:
-            if 'int' in col_type:
-                return random.randint(int(options['min']), int(options['max']))
-            else:
-                return round(random.uniform(float(options['min']), float(options['max'])), 2)
-        if 'startDate' in options and 'endDate' in options:
-            try:
-                start_dt = datetime.strptime(options['startDate'], '%Y-%m-%d')
-                end_dt = datetime.strptime(options['endDate'], '%Y-%m-%d')
-                return fake.date_time_between_dates(datetime_start=start_dt, datetime_end=end_dt)
-            except (ValueError, TypeError):
-                pass
-        if 'type' in options:
-            faker_type = options['type']
-            if faker_type == 'name': return fake.name()
-            if faker_type == 'email': return fake.email()
-            if faker_type == 'address': return fake.address()
-            if faker_type == 'company': return fake.company()
-            if faker_type == 'phone': return fake.phone_number()
-
-    if col_name.endswith('_id'):
-        pk_candidate1 = f"{table_name}_id"
-        pk_candidate2 = f"{table_name.rstrip('s')}_id"
-        if col_name != pk_candidate1 and col_name != pk_candidate2:
-            parent_table_prefix = col_name.replace('_id', '')
-            parent_df = related_data.get(f"{parent_table_prefix}s")
-            if parent_df is None: parent_df = related_data.get(parent_table_prefix)
-            if parent_df is not None and not parent_df.empty:
-                parent_pk_col = f"{parent_table_prefix}_id"
-                if parent_pk_col in parent_df.columns:
-                    return random.choice(parent_df[parent_pk_col].tolist())
-
-    if 'name' in col_name or '이름' in col_name: return fake.name()
-    if 'email' in col_name: return fake.email()
-    if 'address' in col_name or '주소' in col_name: return fake.address()
-    if 'phone' in col_name or '전화' in col_name: return fake.phone_number()
-    if 'company' in col_name or '회사' in col_name: return fake.company()
-    if 'title' in col_name or '제목' in col_name: return fake.catch_phrase()
-    if 'description' in col_name or 'comment' in col_name or '내용' in col_name: return fake.text(max_nb_chars=100)
-    if 'status' in col_name: return random.choice(['completed', 'shipped', 'pending', 'cancelled'])
-    if 'category' in col_name: return random.choice(['의류', '가전', '식품', '도서', '스포츠'])
-    if 'price' in col_name or 'amount' in col_name: return random.randint(100, 5000) * 100
-    if 'quantity' in col_name or '수량' in col_name: return random.randint(1, 10)
-    if 'rating' in col_name or '평점' in col_name: return random.randint(1, 5)
-    if 'date' in col_name or 'timestamp' in col_type or '_at' in col_name: return fake.date_time_between(start_date='-2y', end_date='now')
-
-    if 'int' in col_type: return fake.random_int(min=1, max=1000)
-    if 'decimal' in col_type or 'float' in col_type: return fake.pydecimal(left_digits=5, right_digits=2, positive=True)
-    if 'date' in col_type or 'timestamp' in col_type: return fake.date_time_this_decade()
-    if 'boolean' in col_type: return fake.boolean()
-    
-    return fake.word()
+    generator = cp.compile_column_plan(table_name, column_detail, options)
+    return generator.generate(1, related_data, get_rng(), get_fake())[0]
 
-def generate_llm_data_with_fallback(col_detail, num_rows, model_analysis="", max_retries=2):
+def generate_column_values(column_detail, table_name, related_data, num_rows, options=None, column_rng=None, column_fake=None):
     """
-    LLM을 사용하여 데이터를 생성하되, 실패시 Faker로 대체하는 함수
+    generate_faker_value와 같은 규칙으로 컬럼 하나를 통째로 생성합니다.
+    컴파일된 컬럼 생성기(column_plans)를 사용하며, 벡터화 경로가 없는 규칙만 셀 단위 Faker로 생성합니다.
+    column_rng/column_fake를 넘기지 않으면 모듈 전역 rng/fake를 사용합니다.
     """
-    col_name = col_detail.get('column_name')
-    col_desc = col_detail.get('description', '')
-    
-    # 간단한 프롬프트로 빠른 생성
-    context_prompt = ""
-    if model_analysis and len(model_analysis) < 1000:  # 컨텍스트가 너무 길지 않을 때만 사용
-        context_prompt = f"Context: {model_analysis[:500]}...\n\n"
-    
-    prompt = (
-        f"{context_prompt}"
-        f"Generate {num_rows} realistic examples for column '{col_name}': {col_desc}\n"
-        f"Return only a JSON array like: [\"value1\", \"value2\", ...]\n"
-        f"No explanations, just the array."
+    generator = cp.compile_column_plan(table_name, column_detail, options)
+    return generator.generate(num_rows, related_data, column_rng if column_rng is not None else get_rng(),
+                              column_fake if column_fake is not None else get_fake())
+
+def _seed_sequence(seed, table_name, start_index, column_name):
+    """(시드, 테이블, 청크 시작 행, 컬럼)에서 파생한 SeedSequence. 컬럼마다 독립된 난수열을 씁니다."""
+    return np.random.SeedSequence(
+        seed, spawn_key=(zlib.crc32(table_name.encode('utf-8')), start_index, zlib.crc32(column_name.encode('utf-8')))
     )
-    
+
+def _seeded_random_state(seed, table_name, start_index, column_name):
+    """
+    시드 지정 생성용 (rng, fake) 쌍을 만듭니다.
+    같은 시드/테이블/청크/컬럼이면 어느 프로세스나 머신에서 생성해도 같은 값이 나옵니다.
+    """
+    seed_seq = _seed_sequence(seed, table_name, start_index, column_name)
+    seeded_fake = getattr(_seeded_fakers, 'fake', None)
+    if seeded_fake is None:
+        seeded_fake = _seeded_fakers.fake = faker.Faker('ko_KR')
+    seeded_fake.seed_instance(int(seed_seq.generate_state(1)[0]))
+    return np.random.default_rng(seed_seq), seeded_fake
+
+def _parse_llm_values(text):
+    """LLM 응답 텍스트에서 JSON 배열을 추출합니다. 실패하면 None."""
+    text = text.strip()
+
+    # 여러 패턴으로 JSON 추출 시도
+    json_patterns = [
+        r'\[.*?\]',  # 기본 배열 패턴
+        r'```json\s*(\[.*?\])\s*```',  # 코드 블록 내 배열
+        r'```\s*(\[.*?\])\s*```',  # 코드 블록 (json 태그 없음)
+    ]
+
+    for pattern in json_patterns:
+        match = re.search(pattern, text, re.DOTALL)
+        if match:
+            json_str = match.group(1) if match.groups() else match.group(0)
+            try:
+                parsed_values = json.loads(json_str)
+                if isinstance(parsed_values, list) and len(parsed_values) > 0:
+                    return parsed_values
+            except json.JSONDecodeError:
+                continue
+    return None
+
+def _request_llm_batch(prompt, max_retries):
+    """
+    LLM 요청 하나를 재시도와 함께 수행합니다.
+
+    Returns:
+        tuple: (파싱된 값 리스트 또는 None, prompt_tokens, candidates_tokens)
+    """
     for attempt in range(max_retries):
         try:
-            result = gemini_service.generate_content_with_usage(prompt)
-            
+            result = _generate_content_limited(prompt)
+
             if result.get('status') == 'ok' and result.get('text'):
-                # JSON 추출 시도
-                text = result['text'].strip()
-                
-                # 여러 패턴으로 JSON 추출 시도
-                json_patterns = [
-                    r'\[.*?\]',  # 기본 배열 패턴
-                    r'```json\s*(\[.*?\])\s*```',  # 코드 블록 내 배열
-                    r'```\s*(\[.*?\])\s*```',  # 코드 블록 (json 태그 없음)
-                ]
-                
-                parsed_values = None
-                for pattern in json_patterns:
-                    match = re.search(pattern, text, re.DOTALL)
-                    if match:
-                        json_str = match.group(1) if match.groups() else match.group(0)
-                        try:
-                            parsed_values = json.loads(json_str)
-                            if isinstance(parsed_values, list) and len(parsed_values) > 0:
-                                break
-                        except json.JSONDecodeError:
-                            continue
-                
-                if parsed_values and len(parsed_values) >= num_rows:
-                    return (
-                        parsed_values[:num_rows], 
-                        result.get('prompt_tokens', 0), 
-                        result.get('candidates_tokens', 0)
-                    )
-                elif parsed_values and len(parsed_values) > 0:
-                    # 부족한 개수는 반복으로 채우기
-                    while len(parsed_values) < num_rows:
-                        parsed_values.extend(parsed_values[:min(len(parsed_values), num_rows - len(parsed_values))])
-                    return (
-                        parsed_values[:num_rows], 
-                        result.get('prompt_tokens', 0), 
-                        result.get('candidates_tokens', 0)
-                    )
-                    
+                parsed_values = _parse_llm_values(result['text'])
+                if parsed_values:
+                    metrics.inc('datagen_llm_tokens_total', result.get('prompt_tokens', 0), kind='prompt')
+                    metrics.inc('datagen_llm_tokens_total', result.get('candidates_tokens', 0), kind='candidates')
+                    return parsed_values, result.get('prompt_tokens', 0), result.get('candidates_tokens', 0)
+
             # LLM 응답이 없거나 파싱 실패시 재시도
             if attempt < max_retries - 1:
+                metrics.inc('datagen_llm_retries_total', reason='invalid_response')
                 time.sleep(1)  # 1초 대기 후 재시도
                 continue
-                
+
         except Exception as e:
             print(f"LLM 생성 시도 {attempt + 1} 실패: {str(e)}")
             if attempt < max_retries - 1:
+                metrics.inc('datagen_llm_retries_total', reason='exception')
                 time.sleep(2)  # 2초 대기 후 재시도
                 continue
-    
+
+    return None, 0, 0
+
+def llm_batch_size(tokens_per_value=LLM_TOKENS_PER_VALUE):
+    """출력 토큰 한도(max_output_tokens) 안에 들어가는 요청당 값 개수를 계산합니다."""
+    budget = gemini_service.MAX_OUTPUT_TOKENS * LLM_OUTPUT_BUDGET_RATIO
+    return max(int(budget / max(tokens_per_value, 1)), 1)
+
+def _generate_distinct_llm_values(col_detail, needed, model_analysis, max_retries, seen, known=None):
+    """
+    needed개의 새 값을 LLM으로 생성합니다. 출력 토큰 한도에 맞춰 배치로 나누어 동시에 요청하고,
+    seen(이미 가진 값)과 배치 간 중복을 제거하며 부족분을 최대 LLM_MAX_ROUNDS 라운드까지 재요청합니다.
+    known을 넘기면 배치마다 known(dedup 키 목록)으로 캐시된 풀에 이미 있는 값을 찾아 함께 제외합니다.
+
+    Returns:
+        tuple: (새 값 리스트, prompt_tokens, candidates_tokens)
+    """
+    col_name = col_detail.get('column_name')
+    col_desc = col_detail.get('description', '')
+
+    # 간단한 프롬프트로 빠른 생성
+    context_prompt = ""
+    if model_analysis and len(model_analysis) < 1000:  # 컨텍스트가 너무 길지 않을 때만 사용
+        context_prompt = f"Context: {model_analysis[:500]}...\n\n"
+
+    def build_prompt(batch_rows, batch_index, batch_count):
+        variety_hint = ""
+        if batch_count > 1:
+            variety_hint = f"This is batch {batch_index + 1} of {batch_count}; make every value distinct and avoid generic examples.\n"
+        return (
+            f"{context_prompt}"
+            f"Generate {batch_rows} realistic examples for column '{col_name}': {col_desc}\n"
+            f"{variety_hint}"
+            f"Return only a JSON array like: [\"value1\", \"value2\", ...]\n"
+            f"No explanations, just the array."
+        )
+
+    values = []
+    total_prompt_tokens, total_candidates_tokens = 0, 0
+    tokens_per_value = LLM_TOKENS_PER_VALUE
+
+    for _ in range(LLM_MAX_ROUNDS):
+        shortfall = needed - len(values)
+        if shortfall <= 0:
+            break
+
+        batch_size = llm_batch_size(tokens_per_value)
+        batch_rows = [min(batch_size, shortfall - start) for start in range(0, shortfall, batch_size)]
+        prompts = [build_prompt(rows, i, len(batch_rows)) for i, rows in enumerate(batch_rows)]
+
+        with ThreadPoolExecutor(max_workers=min(len(prompts), LLM_MAX_IN_FLIGHT)) as executor:
+            results = list(executor.map(lambda prompt: _request_llm_batch(prompt, max_retries), prompts))
+
+        round_values, round_candidates_tokens = 0, 0
+        for parsed_values, prompt_tokens, candidates_tokens in results:
+            if not parsed_values:
+                continue
+            total_prompt_tokens += prompt_tokens
+            total_candidates_tokens += candidates_tokens
+            round_values += len(parsed_values)
+            round_candidates_tokens += candidates_tokens
+            # 배치 간 중복 제거 (순서 유지)
+            keys = [llm_cache.dedup_key(value) for value in parsed_values]
+            stored = known(keys) if known is not None else ()
+            for value, key in zip(parsed_values, keys):
+                if key not in seen and key not in stored:
+                    seen.add(key)
+                    values.append(value)
+
+        if not round_values:
+            # 이번 라운드의 모든 배치가 실패하면 더 요청하지 않음
+            break
+        if round_candidates_tokens:
+            # 실제 응답의 값당 토큰 수로 다음 라운드 배치 크기 보정
+            tokens_per_value = max(round_candidates_tokens / round_values, 1)
+
+    return values[:needed], total_prompt_tokens, total_candidates_tokens
+
+def _record_llm_stats(stats, **counts):
+    """여러 LLM 컬럼 스레드가 함께 갱신하는 통계 dict에 값을 더합니다."""
+    if stats is None:
+        return
+    with _stats_lock:
+        for name, count in counts.items():
+            stats[name] = stats.get(name, 0) + count
+
+def _read_llm_rows(cache, cache_key, start, count, col_name):
+    """캐시된 값 풀의 [start, start + count) 위치를 읽습니다. 조회에 실패하면 None."""
+    try:
+        return cache.read_rows(cache_key, start, count)
+    except sqlite3.Error as e:
+        print(f"LLM 캐시 조회 실패 ({col_name}): {str(e)}")
+        return None
+
+def _fill_llm_slots(col_detail, slots, seen, model_analysis, max_retries, known=None):
+    """slots의 빈 자리(None)를 seen, known과 겹치지 않는 새 LLM 값으로 앞에서부터 채웁니다."""
+    missing = [i for i, value in enumerate(slots) if value is None]
+    new_values, prompt_tokens, candidates_tokens = _generate_distinct_llm_values(
+        col_detail, len(missing), model_analysis, max_retries, seen, known
+    )
+    for i, value in zip(missing, new_values):
+        slots[i] = value
+    return new_values, prompt_tokens, candidates_tokens
+
+def generate_llm_data_with_fallback(col_detail, num_rows, model_analysis="", max_retries=2, pool_offset=0, stats=None, seed=None, seen=None):
+    """
+    LLM을 사용하여 데이터를 생성하되, 실패시 Faker로 대체하는 함수.
+    디스크 캐시(llm_cache)에 저장된 값 풀을 먼저 사용하고, 부족한 만큼만 LLM에 요청합니다.
+    모든 요청 라운드 후에도 부족할 때만 반복으로 채웁니다.
+
+    값 풀의 위치는 행 번호와 같습니다. 청크는 자기 행 범위 [pool_offset, pool_offset + num_rows)만 읽고
+    그 범위의 조각으로 저장하며, 빈 자리를 채우는 단계는 범위마다 잠금(cache.fill_lock) 안에서 실행됩니다.
+    다른 범위의 값과의 중복은 풀의 값 해시로 검사하므로 샤드/프로세스가 서로 겹치는 값을 받지 않습니다.
+
+    Args:
+        pool_offset (int): 캐시된 값 풀에서 읽기 시작할 위치 (청크의 첫 행 번호 - 1)
+        stats (dict): 'llm_cached_values'(캐시에서 사용한 값 수), 'llm_generated_values'(새로 생성한 값 수)를 누적
+        seed (int): Faker 대체 값의 시드 (pool_offset, 컬럼명에서 파생)
+        seen (set): 캐시를 쓸 수 없을 때 앞선 청크들이 이미 사용한 값의 dedup 키 (새 값을 추가함).
+                    캐시가 없으면 청크 간 중복은 이 집합으로만 막으므로, 다른 프로세스의 샤드와는 겹칠 수 있음
+    """
+    col_name = col_detail.get('column_name')
+    if num_rows <= 0:
+        return [], 0, 0
+
+    cache = llm_cache.get_default_cache()
+    cache_key, slots = None, None
+    if cache is not None:
+        cache_key = llm_cache.make_cache_key(col_detail, model_analysis, LLM_PROMPT_VERSION)
+        slots = _read_llm_rows(cache, cache_key, pool_offset, num_rows, col_name)
+        if slots is None:
+            cache = None
+    if slots is None:
+        slots = [None] * num_rows
+
+    new_values, total_prompt_tokens, total_candidates_tokens = [], 0, 0
+    if None in slots:
+        if cache is None:
+            new_values, total_prompt_tokens, total_candidates_tokens = _fill_llm_slots(
+                col_detail, slots, set() if seen is None else seen, model_analysis, max_retries
+            )
+        else:
+            with cache.fill_lock(cache_key, pool_offset):
+                # 잠금을 기다리는 동안 같은 범위를 맡은 다른 프로세스가 채웠을 수 있으므로 다시 읽음
+                slots = _read_llm_rows(cache, cache_key, pool_offset, num_rows, col_name) or slots
+                known = lambda keys: cache.known_values(cache_key, keys)
+                seen = {llm_cache.dedup_key(value) for value in slots if value is not None}
+                for _ in range(LLM_MAX_ROUNDS):
+                    if None not in slots:
+                        break
+                    filled, prompt_tokens, candidates_tokens = _fill_llm_slots(
+                        col_detail, slots, seen, model_analysis, max_retries, known
+                    )
+                    total_prompt_tokens += prompt_tokens
+                    total_candidates_tokens += candidates_tokens
+                    if not filled:
+                        break
+                    try:
+                        duplicates = cache.put_segment(cache_key, pool_offset, slots, column_name=col_name)
+                    except sqlite3.Error as e:
+                        print(f"LLM 캐시 저장 실패 ({col_name}): {str(e)}")
+                        duplicates = []
+                    # 동시에 다른 범위를 채운 샤드가 먼저 저장한 값은 비우고 다시 요청
+                    duplicate_values = {llm_cache.dedup_key(slots[i]) for i in duplicates}
+                    for i in duplicates:
+                        slots[i] = None
+                    new_values += [value for value in filled if llm_cache.dedup_key(value) not in duplicate_values]
+                    if not duplicates:
+                        break
+
+    values = [value for value in slots if value is not None]
+    cached_count = len(values) - len(new_values)
+    _record_llm_stats(stats, llm_cached_values=cached_count, llm_generated_values=len(new_values))
+    metrics.inc('datagen_llm_values_total', cached_count, source='cache')
+    metrics.inc('datagen_llm_values_total', len(new_values), source='generated')
+
+    if values:
+        if len(values) < num_rows:
+            print(f"LLM 고유 값 부족 ({col_name}): {len(values)}/{num_rows}, 반복으로 채움")
+            # 부족한 개수는 반복으로 채우기
+            while len(values) < num_rows:
+                values.extend(values[:min(len(values), num_rows - len(values))])
+        return values[:num_rows], total_prompt_tokens, total_candidates_tokens
+
     # 모든 시도 실패시 Faker로 대체
     print(f"LLM 생성 실패, Faker로 대체: {col_name}")
-    fallback_values = []
-    for _ in range(num_rows):
-        fallback_value = generate_faker_value(col_detail, "fallback_table", {}, {})
-        fallback_values.append(str(fallback_value))
+    metrics.inc('datagen_llm_fallbacks_total', column=col_name)
+    # [LLM] 표시를 제외한 컬럼 정의로 규칙 기반 생성기를 컴파일
+    fallback_detail = {k: v for k, v in col_detail.items() if k != 'description'}
+    fallback_rng, fallback_fake = None, None
+    if seed is not None:
+        fallback_rng, fallback_fake = _seeded_random_state(seed, "fallback_table", pool_offset + 1, col_name or "")
+    fallback_values = [str(v) for v in generate_column_values(fallback_detail, "fallback_table", {}, num_rows,
+                                                               column_rng=fallback_rng, column_fake=fallback_fake)]
     
     return fallback_values, 0, 0  # 토큰 사용량 0
 
-def generate_table_data(table_name, columns_details, num_rows, related_data=None, options=None, model_analysis=""):
+def generate_table_data(table_name, columns_details, num_rows, related_data=None, options=None, model_analysis="", stats=None, seed=None):
     """
     개선된 테이블 데이터 생성 - LLM 실패시 안정적 대체
+    stats dict를 넘기면 LLM 캐시 사용량('llm_cached_values', 'llm_generated_values')이 누적됩니다.
+    seed를 지정하면 같은 입력에 대해 항상 같은 결과를 생성합니다. (LLM 컬럼 제외)
+    """
+    if related_data is None: related_data = {}
+    if options is None: options = {}
+
+    # 테이블당 한 번 컬럼 생성기를 컴파일 (캐시 재사용)
+    plan = cp.build_table_plan(table_name, columns_details, options)
+    cp.check_unique_capacity(table_name, plan, num_rows)
+    return _generate_rows(table_name, columns_details, plan, num_rows, 1, related_data, model_analysis, stats, seed)
+
+def shard_row_ranges(num_rows, chunk_size=DEFAULT_CHUNK_SIZE, shard_index=0, shard_count=1):
+    """
+    테이블을 chunk_size 단위 청크로 나누고, shard_count개 샤드 중 shard_index번째 샤드가 맡을
+    연속된 청크의 (시작 행 번호(1부터), 행 수) 목록을 반환합니다.
+    샤드 0..K-1의 결과를 순서대로 이어 붙이면 단일 프로세스 실행과 같은 청크 순서가 됩니다.
+    """
+    chunk_size = max(int(chunk_size), 1)
+    if shard_count < 1 or not 0 <= shard_index < shard_count:
+        raise ValueError(f"잘못된 샤드 지정입니다: {shard_index}/{shard_count}")
+    chunk_count = -(-num_rows // chunk_size)
+    # 나머지 청크는 앞쪽 샤드가 맡음 (첫 청크(헤더 포함)는 항상 샤드 0)
+    first = -(-chunk_count * shard_index // shard_count)
+    last = -(-chunk_count * (shard_index + 1) // shard_count)
+    return [
+        (chunk * chunk_size + 1, min(chunk_size, num_rows - chunk * chunk_size))
+        for chunk in range(first, last)
+    ]
+
+def iter_table_chunks(table_name, columns_details, num_rows, related_data=None, options=None, model_analysis="", chunk_size=DEFAULT_CHUNK_SIZE,
+                      stats=None, seed=None, shard_index=0, shard_count=1, skip_chunks=0):
+    """
+    테이블 데이터를 chunk_size 행 단위로 나누어 생성합니다.
+    메모리 사용량은 전체 행 수가 아니라 청크 크기에 비례합니다.
+
+    seed를 지정하면 청크/컬럼마다 시드를 파생하므로, 같은 seed와 chunk_size로 shard_count개 샤드를
+    따로(다른 프로세스나 머신에서) 생성해 이어 붙여도 단일 실행과 같은 데이터가 나옵니다.
+    skip_chunks는 샤드의 앞쪽 청크를 건너뜁니다. (체크포인트에서 재개할 때 이미 기록한 청크)
+
+    Yields:
+        tuple: (청크 DataFrame, prompt_tokens, candidates_tokens)
     """
     if related_data is None: related_data = {}
     if options is None: options = {}
-        
+
+    plan = cp.build_table_plan(table_name, columns_details, options)
+    cp.check_unique_capacity(table_name, plan, num_rows)
+    # 캐시 없이 생성하는 LLM 컬럼이 청크마다 같은 값을 받지 않도록 컬럼별로 사용한 값을 유지
+    llm_seen = {}
+    for start_index, chunk_rows in shard_row_ranges(num_rows, chunk_size, shard_index, shard_count)[skip_chunks:]:
+        yield _generate_rows(table_name, columns_details, plan, chunk_rows, start_index, related_data, model_analysis, stats, seed,
+                             llm_seen)
+
+def _generate_rows(table_name, columns_details, plan, num_rows, start_index, related_data, model_analysis, stats=None, seed=None,
+                   llm_seen=None):
+    """
+    컴파일된 plan으로 start_index번 행부터 num_rows개 행을 생성합니다.
+    seed가 있으면 컬럼마다 (seed, 테이블, start_index, 컬럼)에서 파생한 난수열을 사용합니다.
+    llm_seen은 {LLM 컬럼명: 사용한 값의 dedup 키 집합}으로, 같은 테이블의 청크 사이에서 공유합니다.
+
+    Returns:
+        tuple: (DataFrame, prompt_tokens, candidates_tokens)
+    """
     total_prompt_tokens = 0
     total_candidates_tokens = 0
-    
-    # 컬럼을 LLM/Faker로 분류
+    row_numbers = range(start_index, start_index + num_rows)
+    table_started_at = time.perf_counter()
+
     llm_columns = [c for c in columns_details if '[LLM]' in c.get('description', '')]
-    faker_columns = [c for c in columns_details if '[LLM]' not in c.get('description', '')]
-
-    # 1. Faker 기반 컬럼 먼저 생성 (빠른 처리)
-    data = []
-    for i in range(1, num_rows + 1):
-        row = {}
-        for col_detail in faker_columns:
-            col_name = col_detail.get('column_name')
-            if not col_name: continue
-            
-            # 기본 키 처리
-            pk_col = f"{table_name.rstrip('s')}_id"
-            if col_name == pk_col:
-                row[col_name] = i
-            else:
-                col_options = options.get(table_name, {}).get(col_name, {})
-                try:
-                    row[col_name] = generate_faker_value(col_detail, table_name, related_data, col_options)
-                except Exception as e:
-                    print(f"Faker 생성 실패 ({col_name}): {str(e)}")
-                    row[col_name] = f"ERROR_{i}"
-        data.append(row)
-
-    df = pd.DataFrame(data) if data else pd.DataFrame(columns=[c['column_name'] for c in faker_columns])
-
-    # 2. LLM 기반 컬럼 생성 (안정적 처리)
-    for col_detail in llm_columns:
-        col_name = col_detail.get('column_name')
-        if not col_name: continue
-        
-        print(f"LLM 컬럼 생성 중: {col_name}")
-        
+
+    # 1. Faker 기반 컬럼 먼저 생성 (컬럼 단위 벡터 처리)
+    columns_data = {}
+    for generator in plan:
+        if generator.is_llm: continue
+        column_started_at = time.perf_counter()
         try:
-            generated_values, prompt_tokens, candidates_tokens = generate_llm_data_with_fallback(
-                col_detail, num_rows, model_analysis
-            )
-            
-            total_prompt_tokens += prompt_tokens
-            total_candidates_tokens += candidates_tokens
-            
-            # 생성된 값들을 DataFrame에 추가
-            if len(generated_values) == num_rows:
-                df[col_name] = generated_values
+            if seed is None:
+                column_rng, column_fake = get_rng(), get_fake()
             else:
-                # 길이가 맞지 않을 때 조정
-                if len(generated_values) > num_rows:
-                    df[col_name] = generated_values[:num_rows]
-                else:
-                    # 부족한 경우 반복으로 채우기
-                    extended_values = generated_values[:]
-                    while len(extended_values) < num_rows:
-                        extended_values.extend(generated_values[:min(len(generated_values), num_rows - len(extended_values))])
-                    df[col_name] = extended_values[:num_rows]
-            
+                column_rng, column_fake = _seeded_random_state(seed, table_name, start_index, generator.column_name)
+            columns_data[generator.column_name] = generator.generate(num_rows, related_data, column_rng, column_fake, start_index)
         except Exception as e:
-            print(f"LLM 컬럼 생성 완전 실패 ({col_name}): {str(e)}")
-            # 최후의 수단: 간단한 더미 값
-            df[col_name] = [f"LLM_FALLBACK_{i+1}" for i in range(num_rows)]
+            if generator.detail.get('unique'):
+                # 고유 값 컬럼을 ERROR_ 값으로 채우면 고유 제약이 깨지므로 생성을 중단
+                raise
+            print(f"Faker 생성 실패 ({generator.column_name}): {str(e)}")
+            columns_data[generator.column_name] = [f"ERROR_{i}" for i in row_numbers]
+        _record_column_time(table_name, generator.column_name, generator.rule, column_started_at, num_rows)
+
+    df = pd.DataFrame(columns_data, index=pd.RangeIndex(num_rows))
+
+    # 2. LLM 기반 컬럼 생성 (컬럼별 요청을 동시에 보내고, 실제 호출 수는 세마포어로 제한)
+    llm_columns = [c for c in llm_columns if c.get('column_name')]
+    if llm_columns:
+        with ThreadPoolExecutor(max_workers=len(llm_columns)) as executor:
+            futures = []
+            for col_detail in llm_columns:
+                print(f"LLM 컬럼 생성 중: {col_detail['column_name']}")
+                futures.append(executor.submit(
+                    _timed_llm_column, table_name, col_detail, num_rows, model_analysis,
+                    pool_offset=start_index - 1, stats=stats, seed=seed,
+                    seen=llm_seen.setdefault(col_detail['column_name'], set()) if llm_seen is not None else None
+                ))
+
+            for col_detail, future in zip(llm_columns, futures):
+                col_name = col_detail['column_name']
+                try:
+                    generated_values, prompt_tokens, candidates_tokens = future.result()
 
-    # 3. 최종 컬럼 순서 정리
+                    total_prompt_tokens += prompt_tokens
+                    total_candidates_tokens += candidates_tokens
+
+                    # 생성된 값들을 DataFrame에 추가
+                    if len(generated_values) == num_rows:
+                        df[col_name] = generated_values
+                    else:
+                        # 길이가 맞지 않을 때 조정
+                        if len(generated_values) > num_rows:
+                            df[col_name] = generated_values[:num_rows]
+                        else:
+                            # 부족한 경우 반복으로 채우기
+                            extended_values = generated_values[:]
+                            while len(extended_values) < num_rows:
+                                extended_values.extend(generated_values[:min(len(generated_values), num_rows - len(extended_values))])
+                            df[col_name] = extended_values[:num_rows]
+
+                except Exception as e:
+                    print(f"LLM 컬럼 생성 완전 실패 ({col_name}): {str(e)}")
+                    # 최후의 수단: 간단한 더미 값
+                    df[col_name] = [f"LLM_FALLBACK_{i}" for i in row_numbers]
+
+        # 3. LLM 컬럼도 선언된 dtype으로 변환 (object 텍스트 -> Arrow 문자열)
+        for generator in plan:
+            if generator.is_llm and generator.column_name in df.columns and df[generator.column_name].dtype == object:
+                df[generator.column_name] = cp.cast_values(df[generator.column_name].to_numpy(), generator.dtype)
+
+    # 4. 최종 컬럼 순서 정리
     final_columns_order = [c.get('column_name') for c in columns_details if c.get('column_name')]
     existing_columns = [col for col in final_columns_order if col in df.columns]
     
@@ -237,5 +545,20 @@ def generate_table_data(table_name, columns_details, num_rows, related_data=None
     else:
         # 컬럼이 하나도 없는 경우 빈 DataFrame 반환
         df = pd.DataFrame()
-            
-    return df, total_prompt_tokens, total_candidates_tokens
\ No newline at end of file
+
+    metrics.inc('datagen_table_seconds_total', time.perf_counter() - table_started_at, table=table_name)
+    metrics.inc('datagen_table_rows_total', num_rows, table=table_name)
+    return df, total_prompt_tokens, total_candidates_tokens
+
+def _record_column_time(table_name, column_name, rule, started_at, num_rows):
+    labels = {'table': table_name, 'column': column_name, 'rule': rule}
+    metrics.inc('datagen_column_seconds_total', time.perf_counter() - started_at, **labels)
+    metrics.inc('datagen_column_rows_total', num_rows, **labels)
+
+def _timed_llm_column(table_name, col_detail, num_rows, model_analysis, **kwargs):
+    """LLM 컬럼 하나를 생성하며 컬럼 생성 시간을 기록합니다. (캐시 조회, 요청, 대체 생성 포함)"""
+    started_at = time.perf_counter()
+    try:
+        return generate_llm_data_with_fallback(col_detail, num_rows, model_analysis, **kwargs)
+    finally:
+        _record_column_time(table_name, col_detail['column_name'], 'llm', started_at, num_rows)
\ No newline at end of file
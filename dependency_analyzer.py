@@ -1,5 +1,13 @@
 # dependency_analyzer.py
-from collections import defaultdict
+import hashlib
+import threading
+from collections import OrderedDict, defaultdict, deque
+
+# 모델 내용 해시별 분석 결과 캐시 크기
+ANALYSIS_CACHE_SIZE = 32
+
+_analysis_cache = OrderedDict()
+_analysis_cache_lock = threading.Lock()
 
 def analyze_dependencies(model):
     """
@@ -15,24 +23,27 @@ def analyze_dependencies(model):
     """
     dependencies = defaultdict(list)
     reverse_dependencies = defaultdict(list)
+    # 중복 관계 확인용 (리스트 멤버십 검사 대신 집합 사용)
+    seen_edges = set()
     
     tables = model.get('tables', [])
-    table_names = [table.get('table_name') for table in tables if table.get('table_name')]
+    table_names = {table.get('table_name') for table in tables if table.get('table_name')}
 
     for table_details in tables:
         source_table = table_details.get('table_name')
         if not source_table:
             continue
 
+        # 자기 자신을 참조하는 기본 키(PK)는 제외 (e.g., users.user_id)
+        pk_candidate1 = f"{source_table}_id"
+        pk_candidate2 = f"{source_table.rstrip('s')}_id" # 단수형 테이블 이름도 고려 (e.g., user_id for users table)
+
         columns = table_details.get('columns', [])
         for column in columns:
             col_name = column.get('column_name', '')
             
             # 외래 키 명명 규칙 (xxx_id) 확인
             if col_name.endswith('_id'):
-                # 자기 자신을 참조하는 기본 키(PK)는 제외 (e.g., users.user_id)
-                pk_candidate1 = f"{source_table}_id"
-                pk_candidate2 = f"{source_table.rstrip('s')}_id" # 단수형 테이블 이름도 고려 (e.g., user_id for users table)
                 if col_name == pk_candidate1 or col_name == pk_candidate2:
                     continue
 
@@ -46,16 +57,166 @@ def analyze_dependencies(model):
                 elif target_table_prefix in table_names:
                     target_table = target_table_prefix
                 
-                if target_table and source_table != target_table:
+                if target_table and source_table != target_table and (source_table, target_table) not in seen_edges:
                     # 의존성 관계 기록 (source_table이 target_table에 의존)
-                    if target_table not in dependencies[source_table]:
-                        dependencies[source_table].append(target_table)
-                    if source_table not in reverse_dependencies[target_table]:
-                        reverse_dependencies[target_table].append(source_table)
+                    seen_edges.add((source_table, target_table))
+                    dependencies[source_table].append(target_table)
+                    reverse_dependencies[target_table].append(source_table)
 
     return dict(dependencies), dict(reverse_dependencies)
 
 
+def _table_names(model):
+    return [table.get('table_name') for table in model.get('tables', []) if table.get('table_name')]
+
+def _topological_order(all_tables, dependencies, reverse_dependencies):
+    """Kahn 알고리즘 (deque + 역방향 인접 리스트, O(V+E)). 순환 참조에 걸린 테이블은 결과에서 빠집니다."""
+    in_degree = {table: len(dependencies.get(table, [])) for table in all_tables}
+    queue = deque(table for table in all_tables if in_degree[table] == 0)
+
+    sorted_order = []
+    while queue:
+        current_table = queue.popleft()
+        sorted_order.append(current_table)
+
+        # 현재 테이블을 참조하는 테이블들의 진입 차수 감소
+        for table in reverse_dependencies.get(current_table, []):
+            in_degree[table] -= 1
+            if in_degree[table] == 0:
+                queue.append(table)
+    return sorted_order
+
+def _group_levels(sorted_order, dependencies):
+    # 각 테이블의 level = 의존하는 테이블들의 최대 level + 1
+    level_of = {}
+    levels = defaultdict(list)
+    for table in sorted_order:
+        level_of[table] = max((level_of[dep] + 1 for dep in dependencies.get(table, [])), default=0)
+        levels[level_of[table]].append(table)
+    return [levels[level] for level in sorted(levels)]
+
+def _strongly_connected_components(tables, dependencies):
+    """Tarjan 알고리즘 (재귀 없이 구현, 큰 스키마에서도 스택 한도 문제 없음)."""
+    index_of, lowlink = {}, {}
+    stack, on_stack = [], set()
+    components = []
+    next_index = 0
+
+    for root in tables:
+        if root in index_of:
+            continue
+        index_of[root] = lowlink[root] = next_index
+        next_index += 1
+        stack.append(root)
+        on_stack.add(root)
+        work = [(root, iter(dependencies.get(root, [])))]
+        while work:
+            node, neighbors = work[-1]
+            advanced = False
+            for neighbor in neighbors:
+                if neighbor not in index_of:
+                    index_of[neighbor] = lowlink[neighbor] = next_index
+                    next_index += 1
+                    stack.append(neighbor)
+                    on_stack.add(neighbor)
+                    work.append((neighbor, iter(dependencies.get(neighbor, []))))
+                    advanced = True
+                    break
+                if neighbor in on_stack:
+                    lowlink[node] = min(lowlink[node], index_of[neighbor])
+            if advanced:
+                continue
+            work.pop()
+            if work:
+                parent = work[-1][0]
+                lowlink[parent] = min(lowlink[parent], lowlink[node])
+            if lowlink[node] == index_of[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack.discard(member)
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+def _cycle_path(members, dependencies):
+    """순환 참조 그룹(SCC) 안에서 실제 순환 경로 하나를 찾습니다. (e.g., ['orders', 'payments', 'orders'])"""
+    member_set = set(members)
+    path, position = [], {}
+    node = members[0]
+    while node not in position:
+        position[node] = len(path)
+        path.append(node)
+        node = next(dep for dep in dependencies.get(node, []) if dep in member_set)
+    return path[position[node]:] + [node]
+
+def _model_key(model):
+    """의존성 분석에 쓰이는 부분(테이블명, 컬럼명)만으로 만든 모델 내용 해시."""
+    digest = hashlib.sha256()
+    for table in model.get('tables', []):
+        names = [str(table.get('table_name'))]
+        names.extend(str(column.get('column_name', '')) for column in table.get('columns', []))
+        # 테이블 구분 \x1e, 컬럼 구분 \x1f
+        digest.update(('\x1f'.join(names) + '\x1e').encode('utf-8'))
+    return digest.hexdigest()
+
+def analyze_model(model):
+    """
+    의존성 맵, 생성 순서, level 묶음, 순환 참조 진단을 한 번에 계산합니다.
+    결과는 모델 내용 해시로 캐시되므로, 여러 라우트에서 같은 모델을 반복 분석해도 한 번만 계산합니다.
+    (반환값은 캐시와 공유되므로 수정하지 마세요.)
+
+    Returns:
+        dict: {
+            'dependencies', 'reverse_dependencies': analyze_dependencies 결과,
+            'order': 위상 정렬 순서 (순환 참조가 있으면 None),
+            'levels': level별 테이블 리스트 (순환 참조가 있으면 None),
+            'cycles': 순환 참조 그룹 리스트 [{'tables': [...], 'path': [...]}]
+        }
+    """
+    key = _model_key(model)
+    with _analysis_cache_lock:
+        result = _analysis_cache.get(key)
+        if result is not None:
+            _analysis_cache.move_to_end(key)
+            return result
+
+    dependencies, reverse_dependencies = analyze_dependencies(model)
+    all_tables = list(dict.fromkeys(_table_names(model)))
+    sorted_order = _topological_order(all_tables, dependencies, reverse_dependencies)
+
+    cycles = []
+    if len(sorted_order) != len(all_tables):
+        # 정렬되지 못한 테이블 중 순환 참조 그룹(크기 2 이상 SCC)만 보고
+        sorted_set = set(sorted_order)
+        remaining = [table for table in all_tables if table not in sorted_set]
+        position = {table: i for i, table in enumerate(all_tables)}
+        for component in _strongly_connected_components(remaining, dependencies):
+            if len(component) > 1:
+                component.sort(key=position.get)
+                cycles.append({'tables': component, 'path': _cycle_path(component, dependencies)})
+        cycles.sort(key=lambda cycle: position[cycle['tables'][0]])
+
+    result = {
+        'dependencies': dependencies,
+        'reverse_dependencies': reverse_dependencies,
+        'order': None if cycles else sorted_order,
+        'levels': None if cycles else _group_levels(sorted_order, dependencies),
+        'cycles': cycles,
+    }
+    with _analysis_cache_lock:
+        _analysis_cache[key] = result
+        while len(_analysis_cache) > ANALYSIS_CACHE_SIZE:
+            _analysis_cache.popitem(last=False)
+    return result
+
+def describe_cycles(cycles):
+    """순환 참조 진단을 사용자에게 보여줄 문장으로 만듭니다."""
+    return "; ".join(" -> ".join(cycle['path']) for cycle in cycles)
+
+
 def get_generation_order(model):
     """
     의존성 분석 결과를 바탕으로 위상 정렬(Topological Sort)을 수행하여,
@@ -66,38 +227,21 @@ def get_generation_order(model):
 
     Returns:
         list: 데이터 생성 순서에 맞게 정렬된 테이블 이름 리스트
+        None: 순환 참조가 발견되어 정렬이 불가능한 경우 (원인은 analyze_model(model)['cycles'])
+    """
+    return analyze_model(model)['order']
+
+
+def get_generation_levels(model):
+    """
+    위상 정렬 결과를 의존성 깊이(level)별로 묶어 반환합니다.
+    같은 level의 테이블끼리는 서로 의존하지 않으므로 동시에 생성할 수 있습니다.
+
+    Args:
+        model (dict): 데이터 모델 JSON 객체
+
+    Returns:
+        list: level 순서대로 정렬된 테이블 이름 리스트의 리스트 (e.g., [['users', 'products'], ['orders'], ...])
         None: 순환 참조가 발견되어 정렬이 불가능한 경우
     """
-    dependencies, _ = analyze_dependencies(model)
-    
-    # 모든 테이블 목록
-    all_tables = [table.get('table_name') for table in model.get('tables', []) if table.get('table_name')]
-    
-    # 각 테이블의 진입 차수(in-degree) 계산
-    in_degree = {table: 0 for table in all_tables}
-    for table in dependencies:
-        for dep_table in dependencies[table]:
-            in_degree[table] += 1
-
-    # 진입 차수가 0인 테이블을 큐에 추가
-    queue = [table for table in all_tables if in_degree[table] == 0]
-    
-    sorted_order = []
-    
-    while queue:
-        current_table = queue.pop(0)
-        sorted_order.append(current_table)
-        
-        # 현재 테이블을 참조하는 다른 테이블들의 진입 차수 감소
-        for table in all_tables:
-            if current_table in dependencies.get(table, []):
-                in_degree[table] -= 1
-                if in_degree[table] == 0:
-                    queue.append(table)
-
-    # 모든 테이블이 정렬되었는지 확인 (순환 참조 감지)
-    if len(sorted_order) == len(all_tables):
-        return sorted_order
-    else:
-        # 순환 참조가 있어 정렬이 불가능한 경우
-        return None
+    return analyze_model(model)['levels']
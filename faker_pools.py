@@ -0,0 +1,132 @@
+# faker_pools.py
+import json
+import os
+import threading
+import zlib
+
+from lazy_imports import lazy_import
+
+faker = lazy_import('faker')
+np = lazy_import('numpy')
+
+# 값 풀 설정 (환경 변수로 조정 가능)
+POOLS_ENABLED = os.getenv('FAKER_POOLS_ENABLED', '1') not in ('0', 'false', 'False')
+POOL_SIZE = int(os.getenv('FAKER_POOL_SIZE', 10_000))
+POOL_DIR = os.getenv('FAKER_POOL_DIR', os.path.join('.cache', 'faker_pools'))
+# 이름/이메일/주소/전화번호를 부분 풀(성+이름, 도로명 주소+상세 주소 등)의 조합으로 만들어 고유 값 수를 늘림
+COMBINE_PARTS = os.getenv('FAKER_POOL_COMBINE', '1') not in ('0', 'false', 'False')
+DEFAULT_LOCALE = 'ko_KR'
+
+# 풀을 채울 Faker 프로바이더 (값 하나를 생성하는 함수)
+PROVIDERS = {
+    'name': lambda fake: fake.name(),
+    'email': lambda fake: fake.email(),
+    'address': lambda fake: fake.address(),
+    'phone': lambda fake: fake.phone_number(),
+    'company': lambda fake: fake.company(),
+    'catch_phrase': lambda fake: fake.catch_phrase(),
+    'text': lambda fake: fake.text(max_nb_chars=100),
+    'word': lambda fake: fake.word(),
+    # 조합용 부분 풀
+    'last_name': lambda fake: fake.last_name(),
+    'first_name': lambda fake: fake.first_name(),
+    'user_name': lambda fake: fake.user_name(),
+    'safe_domain_name': lambda fake: fake.safe_domain_name(),
+    'road_address': lambda fake: fake.road_address(),
+    'address_detail': lambda fake: fake.address_detail(),
+    'phone_prefix': lambda fake: fake.phone_number().rsplit('-', 1)[0],
+}
+
+# 난수 대신 모든 값을 나열하는 풀
+FIXED_POOLS = {
+    'digits4': lambda: [f"{i:04d}" for i in range(10_000)],
+}
+
+# 조합 규칙: 풀 이름은 해당 풀에서 뽑고, 그 외 문자열은 그대로 이어 붙임
+COMPOSITES = {
+    'name': ('last_name', 'first_name'),
+    'email': ('user_name', '@', 'safe_domain_name'),
+    'address': ('road_address', ' ', 'address_detail'),
+    'phone': ('phone_prefix', '-', 'digits4'),
+}
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_path(provider, locale, size):
+    return os.path.join(POOL_DIR, f"{locale}-{provider}-{size}-faker{faker.VERSION}.json")
+
+def _build_pool(provider, locale, size):
+    if provider in FIXED_POOLS:
+        return FIXED_POOLS[provider]()
+    # 프로바이더별 고정 시드: 어느 프로세스/머신에서 만들어도 같은 풀 (시드 지정 생성 재현성 유지)
+    fake = faker.Faker(locale)
+    fake.seed_instance(zlib.crc32(f"{locale}:{provider}".encode('utf-8')))
+    generate = PROVIDERS[provider]
+    return [generate(fake) for _ in range(size)]
+
+def _load_pool(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            values = json.load(f)
+        return values if isinstance(values, list) and values else None
+    except (OSError, ValueError):
+        return None
+
+def _save_pool(path, values):
+    try:
+        os.makedirs(POOL_DIR, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(values, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        print(f"Faker 값 풀 저장 실패 ({os.path.basename(path)}): {e}")
+
+def get_pool(provider, locale=DEFAULT_LOCALE, size=None):
+    """
+    프로바이더의 값 풀(object 배열)을 반환합니다.
+    프로세스 메모리 -> 디스크(POOL_DIR) 순으로 찾고, 없으면 생성해 디스크에 저장합니다.
+    """
+    size = size or POOL_SIZE
+    key = (provider, locale, size)
+    pool = _pools.get(key)
+    if pool is not None:
+        return pool
+
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            path = _pool_path(provider, locale, size)
+            values = _load_pool(path)
+            if values is None:
+                values = _build_pool(provider, locale, size)
+                _save_pool(path, values)
+            pool = np.empty(len(values), dtype=object)
+            pool[:] = values
+            _pools[key] = pool
+    return pool
+
+def sample(provider, rng, num_rows, locale=DEFAULT_LOCALE, combine=None):
+    """
+    값 풀에서 num_rows개를 인덱스 배열로 한 번에 뽑습니다.
+    combine이 참이고 조합 규칙이 있으면 부분 풀에서 각각 뽑아 이어 붙입니다.
+
+    Returns:
+        np.ndarray: object 배열 (문자열)
+    """
+    if combine is None:
+        combine = COMBINE_PARTS
+    if combine and provider in COMPOSITES:
+        values = None
+        for part in COMPOSITES[provider]:
+            if part in PROVIDERS or part in FIXED_POOLS:
+                pool = get_pool(part, locale)
+                part_values = pool[rng.integers(0, len(pool), size=num_rows)]
+            else:
+                part_values = part
+            values = part_values if values is None else values + part_values
+        return values
+    pool = get_pool(provider, locale)
+    return pool[rng.integers(0, len(pool), size=num_rows)]
@@ -0,0 +1,162 @@
+# foreign_keys.py
+import weakref
+
+from lazy_imports import lazy_import
+
+np = lazy_import('numpy')
+pd = lazy_import('pandas')
+
+# 외래 키 분포 옵션 (options[테이블][컬럼]['distribution'])
+DISTRIBUTIONS = ('uniform', 'zipf', 'fixed')
+
+DEFAULT_ZIPF_SKEW = 1.0
+
+# DataFrame id -> {컬럼명: ForeignKeyIndex}; DataFrame이 해제되면 함께 제거됩니다.
+_frame_index_cache = {}
+
+
+class ForeignKeyIndex:
+    """
+    부모 테이블의 키 컬럼을 연속된 배열로 보관하고,
+    자식 테이블의 외래 키를 한 번의 벡터 연산으로 샘플링합니다.
+    from_file로 만든 인덱스는 .npy 파일 경로만 pickle되고, 워커 프로세스에서 처음 샘플링할 때
+    파일을 메모리 맵으로 엽니다. (여러 워커가 복사 없이 같은 물리 페이지를 읽음)
+    """
+
+    def __init__(self, keys=None, path=None):
+        if keys is not None:
+            keys = np.asarray(keys)
+            if keys.dtype == object:
+                # 정수로만 이루어진 object 배열은 int64로 변환
+                try:
+                    keys = keys.astype(np.int64)
+                except (TypeError, ValueError):
+                    pass
+            keys = np.ascontiguousarray(keys)
+        self.path = path
+        self._keys = keys
+        self._zipf_cache = {}
+
+    @classmethod
+    def from_frame(cls, df, column):
+        return cls(df[column].to_numpy())
+
+    @classmethod
+    def from_file(cls, path):
+        """save_keys로 기록한 .npy 파일을 가리키는 인덱스. 파일은 처음 샘플링할 때 엽니다."""
+        return cls(path=path)
+
+    @property
+    def keys(self):
+        if self._keys is None:
+            # 읽기 전용 메모리 맵 (ndarray로 보아 인덱싱 결과가 memmap 하위 클래스가 되지 않게 함)
+            self._keys = np.load(self.path, mmap_mode='r').view(np.ndarray)
+        return self._keys
+
+    def __getstate__(self):
+        if self.path is None:
+            return self.__dict__
+        # 파일 기반 인덱스는 경로만 전달 (키 배열과 zipf 테이블은 받는 쪽에서 다시 만듦)
+        return {'path': self.path, '_keys': None, '_zipf_cache': {}}
+
+    def __len__(self):
+        return len(self.keys)
+
+    def sample(self, num_rows, rng, distribution='uniform', skew=DEFAULT_ZIPF_SKEW,
+               children_per_parent=1, start_index=1):
+        """
+        num_rows개의 외래 키를 한 번에 샘플링합니다.
+
+        Args:
+            num_rows (int): 샘플링할 자식 행 수
+            rng (np.random.Generator): 난수 생성기
+            distribution (str): 'uniform' | 'zipf' (소수 부모에 편중) | 'fixed' (부모당 고정 자식 수)
+            skew (float): zipf 분포의 지수 (클수록 상위 부모에 집중)
+            children_per_parent (int): fixed 분포에서 부모 하나에 배정할 자식 수
+            start_index (int): 청크의 첫 행 번호 (fixed 분포에서 청크 간 연속성 유지)
+
+        Returns:
+            np.ndarray: 부모 키 배열
+        """
+        size = len(self.keys)
+        if distribution == 'zipf':
+            cdf, ranked_positions = self._zipf_table(skew)
+            ranks = np.searchsorted(cdf, rng.random(num_rows) * cdf[-1], side='right')
+            return self.keys[ranked_positions[np.minimum(ranks, size - 1)]]
+        if distribution == 'fixed':
+            per_parent = max(int(children_per_parent), 1)
+            row_numbers = np.arange(start_index - 1, start_index - 1 + num_rows)
+            return self.keys[(row_numbers // per_parent) % size]
+        return self.keys[rng.integers(0, size, size=num_rows)]
+
+    def _zipf_table(self, skew):
+        """순위별 누적 가중치와 순위 -> 키 위치 매핑을 skew별로 한 번만 계산합니다."""
+        if skew not in self._zipf_cache:
+            size = len(self.keys)
+            weights = np.arange(1, size + 1, dtype=np.float64) ** -float(skew)
+            # 어떤 부모가 "인기" 부모가 될지는 키 개수로 고정된 순열로 결정 (실행마다 동일)
+            ranked_positions = np.random.default_rng(size).permutation(size)
+            self._zipf_cache[skew] = (np.cumsum(weights), ranked_positions)
+        return self._zipf_cache[skew]
+
+
+def save_keys(path, keys):
+    """
+    키 배열을 .npy 파일로 기록하고 그 파일을 가리키는 ForeignKeyIndex를 반환합니다.
+    숫자/날짜가 아닌 키(문자열 등)는 메모리 맵으로 공유할 수 없으므로 None을 반환합니다.
+    """
+    keys = np.ascontiguousarray(keys)
+    if keys.dtype.kind not in 'iufbM':
+        return None
+    np.save(path, keys, allow_pickle=False)
+    return ForeignKeyIndex.from_file(path)
+
+def _cached_frame_index(df, column):
+    frame_id = id(df)
+    indexes = _frame_index_cache.get(frame_id)
+    if indexes is None:
+        indexes = {}
+        _frame_index_cache[frame_id] = indexes
+        weakref.finalize(df, _frame_index_cache.pop, frame_id, None)
+    if column not in indexes:
+        indexes[column] = ForeignKeyIndex.from_frame(df, column)
+    return indexes[column]
+
+def get_foreign_key_index(related_data, parent_tables, parent_column):
+    """
+    related_data에서 부모 테이블의 키 인덱스를 찾습니다.
+    부모 데이터는 DataFrame 또는 {컬럼명: ForeignKeyIndex} 형태일 수 있으며,
+    DataFrame은 부모 테이블/컬럼당 한 번만 인덱싱됩니다.
+
+    Returns:
+        ForeignKeyIndex: 부모 키 인덱스
+        None: 부모 데이터가 없거나 비어있는 경우
+    """
+    for parent_table in parent_tables:
+        parent = related_data.get(parent_table)
+        if parent is None:
+            continue
+        if isinstance(parent, pd.DataFrame):
+            if parent.empty or parent_column not in parent.columns:
+                return None
+            return _cached_frame_index(parent, parent_column)
+        index = parent.get(parent_column)
+        return index if index is not None and len(index) > 0 else None
+    return None
+
+def parse_distribution_options(options):
+    """
+    외래 키 컬럼 옵션에서 분포 설정을 추출합니다.
+
+    Returns:
+        dict: ForeignKeyIndex.sample에 전달할 키워드 인자
+    """
+    distribution = (options or {}).get('distribution', 'uniform')
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"지원하지 않는 외래 키 분포입니다: {distribution} (가능: {', '.join(DISTRIBUTIONS)})")
+    params = {"distribution": distribution}
+    if distribution == 'zipf':
+        params["skew"] = float(options.get('skew', DEFAULT_ZIPF_SKEW))
+    elif distribution == 'fixed':
+        params["children_per_parent"] = int(options.get('children_per_parent', 1))
+    return params
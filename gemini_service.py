@@ -1,6 +1,5 @@
 # gemini_service.py
 import os
-import google.generativeai as genai
 import re
 import json
 import asyncio
@@ -9,6 +8,12 @@ import threading
 from concurrent.futures import ThreadPoolExecutor, TimeoutError
 from dotenv import load_dotenv
 
+import metrics
+from lazy_imports import lazy_import
+
+# google.generativeai는 import만으로 1초 가까이 걸리므로 Gemini 백엔드를 처음 만들 때 로드
+genai = lazy_import('google.generativeai')
+
 load_dotenv('.env.local')
 
 # --- [개선] 더 간결하고 효율적인 시스템 프롬프트 ---
@@ -51,45 +56,159 @@ ANALYSIS_SYSTEM_PROMPT = """
 """
 
 # --- API Configuration ---
-api_key = os.getenv("GEMINI_API_KEY")
-modeler_model = None
-analysis_model = None
-
-if not api_key:
-    print("Warning: GEMINI_API_KEY not found in .env file.")
-else:
-    genai.configure(api_key=api_key)
-    
-    # 더 가벼운 모델 사용 및 설정 최적화
-    generation_config = {
-        'temperature': 0.7,
-        'top_p': 0.8,
-        'top_k': 40,
-        'max_output_tokens': 2048,
-    }
-    
-    modeler_model = genai.GenerativeModel(
-        'gemini-1.5-flash',
-        system_instruction=MODELER_SYSTEM_PROMPT,
-        generation_config=generation_config
-    )
-    
-    analysis_model = genai.GenerativeModel(
-        'gemini-1.5-flash',
-        system_instruction=ANALYSIS_SYSTEM_PROMPT,
-        generation_config=generation_config
-    )
+# 요청당 최대 출력 토큰 수 (LLM 값 생성 배치 크기 계산에도 사용)
+MAX_OUTPUT_TOKENS = 2048
+
+# 사용할 LLM 백엔드: gemini (기본) 또는 local (네트워크 없이 응답하는 부하 테스트용 백엔드, local_llm.py)
+LLM_BACKEND = os.getenv('LLM_BACKEND', 'gemini')
+
+
+class GeminiBackend:
+    """
+    google.generativeai 백엔드. GEMINI_API_KEY가 없으면 available이 False입니다.
+
+    백엔드 인터페이스 (LocalBackend도 같은 메서드를 가짐):
+        available / unavailable_message: 사용 가능 여부와 불가 시 안내 메시지
+        check_connection(): 연결 확인 결과 dict
+        generate_content(prompt, timeout): status/text/토큰 수 dict (blocked 포함). 오류는 예외로 전달
+        analyze(prompt, timeout): 분석 텍스트
+        stream_chat(messages, timeout): 응답 텍스트 조각 iterator ({"role", "parts"} 메시지 목록)
+        count_tokens(contents): 토큰 수
+    재시도, 오류 메시지 변환, 입력 길이 제한은 이 모듈의 공개 함수에서 공통으로 처리합니다.
+    """
+
+    name = 'gemini'
+    unavailable_message = ".env 파일에 GEMINI_API_KEY가 없습니다."
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+        self.modeler_model = None
+        self.analysis_model = None
+
+        if not api_key:
+            print("Warning: GEMINI_API_KEY not found in .env file.")
+            return
+        genai.configure(api_key=api_key)
+
+        # 더 가벼운 모델 사용 및 설정 최적화
+        generation_config = {
+            'temperature': 0.7,
+            'top_p': 0.8,
+            'top_k': 40,
+            'max_output_tokens': MAX_OUTPUT_TOKENS,
+        }
+
+        self.modeler_model = genai.GenerativeModel(
+            'gemini-1.5-flash',
+            system_instruction=MODELER_SYSTEM_PROMPT,
+            generation_config=generation_config
+        )
+
+        self.analysis_model = genai.GenerativeModel(
+            'gemini-1.5-flash',
+            system_instruction=ANALYSIS_SYSTEM_PROMPT,
+            generation_config=generation_config
+        )
+
+    @property
+    def available(self):
+        return self.modeler_model is not None
+
+    def check_connection(self):
+        # 간단한 테스트 요청으로 API 상태 확인
+        test_model = genai.GenerativeModel('gemini-1.5-flash')
+        test_model.generate_content("test", request_options={'timeout': 5})
+        return {"status": "ok", "message": "Gemini API 연결됨"}
+
+    def generate_content(self, prompt, timeout):
+        response = self.modeler_model.generate_content(
+            prompt,
+            request_options={'timeout': timeout}
+        )
+
+        usage = response.usage_metadata
+
+        if not response.candidates:
+            return {
+                "status": "blocked",
+                "text": "Safety settings blocked the response.",
+                "prompt_tokens": usage.prompt_token_count if usage else 0,
+                "candidates_tokens": 0,
+                "total_tokens": usage.prompt_token_count if usage else 0
+            }
+
+        return {
+            "status": "ok",
+            "text": response.text,
+            "prompt_tokens": usage.prompt_token_count if usage else 0,
+            "candidates_tokens": usage.candidates_token_count if usage else 0,
+            "total_tokens": usage.total_token_count if usage else 0
+        }
+
+    def analyze(self, prompt, timeout):
+        response = self.analysis_model.generate_content(
+            prompt,
+            request_options={'timeout': timeout}
+        )
+        return response.text
+
+    def stream_chat(self, messages, timeout):
+        response_stream = self.modeler_model.generate_content(
+            messages,
+            stream=True,
+            request_options={'timeout': timeout}
+        )
+        for chunk in response_stream:
+            if chunk.text:
+                yield chunk.text
+
+    def count_tokens(self, contents):
+        return self.modeler_model.count_tokens(contents).total_tokens
+
+
+def create_backend(name=None):
+    """
+    이름으로 LLM 백엔드를 만듭니다. (gemini 또는 local)
+
+    Raises:
+        ValueError: 알 수 없는 백엔드 이름
+    """
+    name = (name or LLM_BACKEND).lower()
+    if name == 'gemini':
+        return GeminiBackend(os.getenv("GEMINI_API_KEY"))
+    if name == 'local':
+        import local_llm
+        return local_llm.LocalBackend.from_env(max_output_tokens=MAX_OUTPUT_TOKENS)
+    raise ValueError(f"알 수 없는 LLM 백엔드입니다: {name} (gemini, local 중 선택)")
+
+def get_backend():
+    """현재 백엔드. 처음 LLM을 호출할 때 만듭니다. (워커 프로세스는 fork로 만들어진 백엔드를 물려받음)"""
+    global backend
+    if backend is None:
+        with _backend_lock:
+            if backend is None:
+                backend = create_backend()
+    return backend
+
+def set_backend(new_backend):
+    """사용할 백엔드를 바꾸고 이전 백엔드를 반환합니다. (테스트/벤치마크용)"""
+    global backend
+    with _backend_lock:
+        previous, backend = backend, new_backend
+    return previous
+
+# 현재 백엔드 (get_backend로 접근)
+backend = None
+_backend_lock = threading.Lock()
 
 def check_api_connection():
     """API 연결 상태를 빠르게 확인"""
-    if not api_key:
-        return {"status": "error", "message": ".env 파일에 GEMINI_API_KEY가 없습니다."}
+    llm = get_backend()
+    if not llm.available:
+        return {"status": "error", "message": llm.unavailable_message}
     
     try:
-        # 간단한 테스트 요청으로 API 상태 확인
-        test_model = genai.GenerativeModel('gemini-1.5-flash')
-        response = test_model.generate_content("test", request_options={'timeout': 5})
-        return {"status": "ok", "message": "Gemini API 연결됨"}
+        return llm.check_connection()
     except Exception as e:
         error_message = str(e)
         if "API_KEY_INVALID" in error_message or "invalid" in error_message.lower():
@@ -104,15 +223,12 @@ def _analyze_model_with_timeout(model_json_str, timeout=30):
         # 더 간결한 프롬프트로 빠른 분석
         prompt = f"다음 데이터 모델을 간단히 분석해주세요:\n\n```json\n{model_json_str}\n```"
         
-        response = analysis_model.generate_content(
-            prompt,
-            request_options={'timeout': timeout}
-        )
+        analysis = get_backend().analyze(prompt, timeout)
         
-        if not response.text:
+        if not analysis:
             return {"status": "error", "message": "AI 분석 응답이 비어있습니다."}
             
-        return {"status": "ok", "analysis": response.text}
+        return {"status": "ok", "analysis": analysis}
         
     except Exception as e:
         error_msg = str(e)
@@ -125,11 +241,9 @@ def _analyze_model_with_timeout(model_json_str, timeout=30):
 
 def get_model_analysis_and_strategy(model_json_str):
     """개선된 모델 분석 - 타임아웃과 캐싱 적용"""
-    if not api_key:
-        return {"status": "error", "message": ".env 파일에 GEMINI_API_KEY가 없습니다."}
-
-    if not analysis_model:
-        return {"status": "error", "message": "분석 모델이 초기화되지 않았습니다."}
+    llm = get_backend()
+    if not llm.available:
+        return {"status": "error", "message": llm.unavailable_message}
 
     # 입력 크기 제한 (너무 큰 모델은 간소화)
     try:
@@ -159,7 +273,7 @@ def get_model_analysis_and_strategy(model_json_str):
 
 def count_tokens(contents):
     """토큰 수 계산 - 타임아웃 적용"""
-    if not modeler_model:
+    if not get_backend().available:
         return {"status": "error", "message": "API model not initialized."}
     
     try:
@@ -167,8 +281,7 @@ def count_tokens(contents):
             contents = [contents]
         
         # 타임아웃 적용
-        response = modeler_model.count_tokens(contents)
-        return {"status": "ok", "total_tokens": response.total_tokens}
+        return {"status": "ok", "total_tokens": get_backend().count_tokens(contents)}
     except Exception as e:
         print(f"Error counting tokens: {e}")
         # 토큰 수 계산 실패시 추정값 반환
@@ -177,7 +290,8 @@ def count_tokens(contents):
 
 def generate_content_with_usage(prompt):
     """개선된 콘텐츠 생성 - 타임아웃과 재시도 로직"""
-    if not modeler_model:
+    llm = get_backend()
+    if not llm.available:
         return {"status": "error", "message": "API model not initialized."}
     
     # 프롬프트 길이 제한
@@ -187,41 +301,21 @@ def generate_content_with_usage(prompt):
     max_retries = 2
     for attempt in range(max_retries):
         try:
-            response = modeler_model.generate_content(
-                prompt,
-                request_options={'timeout': 30}
-            )
-            
-            usage = response.usage_metadata
-            
-            if not response.candidates:
-                return {
-                    "status": "blocked", 
-                    "text": "Safety settings blocked the response.",
-                    "prompt_tokens": usage.prompt_token_count if usage else 0,
-                    "candidates_tokens": 0,
-                    "total_tokens": usage.prompt_token_count if usage else 0
-                }
-            
-            return {
-                "status": "ok", 
-                "text": response.text,
-                "prompt_tokens": usage.prompt_token_count if usage else 0,
-                "candidates_tokens": usage.candidates_token_count if usage else 0,
-                "total_tokens": usage.total_token_count if usage else 0
-            }
+            return llm.generate_content(prompt, timeout=30)
             
         except Exception as e:
             error_msg = str(e)
             if attempt < max_retries - 1:
                 if "timeout" in error_msg.lower():
+                    metrics.inc('datagen_llm_retries_total', reason='timeout')
                     time.sleep(1)  # 1초 대기 후 재시도
                     continue
                 elif "quota" in error_msg.lower() or "limit" in error_msg.lower():
+                    metrics.inc('datagen_llm_retries_total', reason='quota')
                     time.sleep(2)  # 2초 대기 후 재시도
                     continue
             
-            print(f"Error calling Gemini API (attempt {attempt + 1}): {e}")
+            print(f"Error calling {llm.name} LLM backend (attempt {attempt + 1}): {e}")
             
             # 최종 실패시 에러 타입별 메시지
             if "timeout" in error_msg.lower():
@@ -237,7 +331,8 @@ def generate_content_with_usage(prompt):
 
 def get_gemini_response_stream(chat_history):
     """개선된 스트림 응답 - 타임아웃과 에러 처리"""
-    if not modeler_model:
+    llm = get_backend()
+    if not llm.available:
         yield "API 키가 설정되지 않아 응답을 생성할 수 없습니다."
         return
 
@@ -255,15 +350,8 @@ def get_gemini_response_stream(chat_history):
         messages_for_api.append({"role": role, "parts": [text]})
 
     try:
-        response_stream = modeler_model.generate_content(
-            messages_for_api, 
-            stream=True,
-            request_options={'timeout': 45}  # 스트림은 좀 더 긴 타임아웃
-        )
-        
-        for chunk in response_stream:
-            if chunk.text:
-                yield chunk.text
+        # 스트림은 좀 더 긴 타임아웃
+        yield from llm.stream_chat(messages_for_api, timeout=45)
             
     except Exception as e:
         error_msg = str(e)
@@ -0,0 +1,105 @@
+# generate_shard.py
+"""
+시드 지정 생성으로 테이블 하나의 샤드 하나를 생성합니다. 큰 테이블을 여러 머신에 나누어 생성할 때 사용합니다.
+부모 테이블의 키 컬럼은 같은 시드로 다시 생성하므로 부모 출력 파일이 필요 없습니다.
+
+모든 샤드에 같은 --seed, --chunk-size, --reference-time, --rows, --options를 지정해야 하며,
+CSV 샤드 파일을 번호 순서대로 이어 붙이면 단일 실행(같은 시드)의 결과와 바이트 단위로 같습니다.
+
+사용법:
+    python generate_shard.py models/model_1.json --table orders --seed 42 \
+        --shard-index 0 --shard-count 4 --reference-time 2026-01-01 \
+        --rows users=1000000 --rows orders=50000000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+import analysis_cache
+import column_plans as cp
+import data_generator as dg
+import dependency_analyzer as da
+import generation_runner as runner
+import output_writers as ow
+
+
+def _parse_rows(pairs):
+    quantities = {}
+    for pair in pairs:
+        table_name, _, rows = pair.partition('=')
+        if not rows:
+            raise ValueError(f"--rows는 'table=행수' 형식이어야 합니다: {pair}")
+        quantities[table_name] = int(rows)
+    return quantities
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('model', help='모델 JSON 파일 경로')
+    parser.add_argument('--table', required=True, help='생성할 테이블')
+    parser.add_argument('--rows', action='append', default=[], help="테이블별 행 수 'table=N' (대상 테이블과 모든 상위 테이블)")
+    parser.add_argument('--seed', type=int, required=True)
+    parser.add_argument('--reference-time', required=True, help="상대 날짜 규칙의 기준 시각 (e.g., 2026-01-01)")
+    parser.add_argument('--shard-index', type=int, default=0)
+    parser.add_argument('--shard-count', type=int, default=1)
+    parser.add_argument('--chunk-size', type=int, default=dg.DEFAULT_CHUNK_SIZE)
+    parser.add_argument('--options', default='{}', help='컬럼별 생성 옵션 JSON 문자열 또는 파일 경로')
+    parser.add_argument('--format', default='csv', choices=list(ow.OUTPUT_FORMATS))
+    parser.add_argument('--compression', default=None)
+    parser.add_argument('--output-dir', default='output_data')
+    args = parser.parse_args()
+
+    try:
+        with open(args.model, 'r', encoding='utf-8') as f:
+            model_str = f.read()
+        model = json.loads(model_str)
+        if os.path.exists(args.options):
+            with open(args.options, 'r', encoding='utf-8') as f:
+                options = json.load(f)
+        else:
+            options = json.loads(args.options)
+        quantities = _parse_rows(args.rows)
+        ow.resolve_compression(args.format, args.compression)
+        dg.shard_row_ranges(0, args.chunk_size, args.shard_index, args.shard_count)
+    except (OSError, ValueError) as e:
+        print(f"입력 오류: {e}", file=sys.stderr)
+        return 2
+
+    table_details = next((t for t in model.get('tables', []) if t.get('table_name') == args.table), None)
+    if table_details is None:
+        print(f"모델에 '{args.table}' 테이블이 없습니다.", file=sys.stderr)
+        return 2
+    cycles = da.analyze_model(model)['cycles']
+    if cycles:
+        print(f"모델에 순환 참조가 발견되었습니다: {da.describe_cycles(cycles)}", file=sys.stderr)
+        return 2
+    if args.table not in quantities:
+        print(f"--rows {args.table}=N 으로 대상 테이블의 행 수를 지정해야 합니다.", file=sys.stderr)
+        return 2
+
+    cp.set_reference_time(args.reference_time)
+    started_at = time.perf_counter()
+    related_data = runner.rebuild_related_data(model, args.table, quantities, options, args.seed, args.chunk_size)
+    print(f"부모 키 재생성 완료: {', '.join(related_data) or '없음'} ({time.perf_counter() - started_at:.1f}초)")
+
+    columns_list = table_details.get('columns', [])
+    model_analysis = ""
+    if any('[LLM]' in c.get('description', '') for c in columns_list):
+        model_analysis = analysis_cache.get_model_analysis_text(model_str)
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    _, prompt_tokens, candidates_tokens, _ = runner.generate_table_task(
+        args.table, columns_list, quantities[args.table], related_data, options,
+        model_analysis, args.output_dir, False,
+        chunk_size=args.chunk_size, output_format=args.format, compression=args.compression,
+        seed=args.seed, reference_time=args.reference_time,
+        shard_index=args.shard_index, shard_count=args.shard_count
+    )
+    file_name = ow.output_file_name(args.table, args.format, args.shard_index, args.shard_count)
+    print(f"'{file_name}' 저장 완료. ({time.perf_counter() - started_at:.1f}초, 입력 토큰: {prompt_tokens}, 출력 토큰: {candidates_tokens})")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
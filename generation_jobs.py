@@ -0,0 +1,352 @@
+# generation_jobs.py
+import os
+import secrets
+import shutil
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import checkpoints
+import generation_runner as runner
+
+# 동시에 실행할 수 있는 생성 작업 수 (작업마다 테이블 단위 프로세스 풀을 따로 사용)
+MAX_CONCURRENT_JOBS = int(os.getenv('GENERATION_MAX_JOBS', 2))
+# 메모리에 보관할 종료된 작업 수
+FINISHED_JOB_HISTORY = 100
+
+# interrupted: 서버가 재시작되어 중단된 작업 (디스크의 체크포인트에서 발견)
+FINISHED_STATUSES = ('completed', 'failed', 'cancelled', 'interrupted')
+# 작업 부분 결과 디렉터리 안의 체크포인트 디렉터리 이름 (완료 시 삭제)
+CHECKPOINT_DIR_NAME = '_checkpoint'
+# 테이블/샤드별 최신 값만 보관하는 이벤트 유형 (청크마다 발생)
+LATEST_ONLY_EVENTS = ('progress', 'metrics')
+
+
+class GenerationJob:
+    """
+    백그라운드 생성 작업 하나의 상태와 이벤트 기록.
+    여러 클라이언트가 iter_events로 같은 작업의 진행 이벤트를 구독할 수 있습니다.
+    """
+
+    def __init__(self, job_id, model_name, quantities, output_dir):
+        self.job_id = job_id
+        self.model_name = model_name
+        self.quantities = quantities
+        self.output_dir = output_dir
+        self.partial_dir = f"{output_dir}.partial"
+        self.checkpoint_dir = os.path.join(self.partial_dir, CHECKPOINT_DIR_NAME)
+        self.status = 'queued'
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_event = threading.Event()
+        self.future = None
+        # 실행하는 동안 잡고 있는 체크포인트 소유권 (checkpoints.acquire_job_owner)
+        self.owner = None
+        self.totals = {'prompt_tokens': 0, 'candidates_tokens': 0, 'cached_values': 0}
+
+        # 이벤트마다 seq를 붙여 보관. progress/metrics 이벤트는 (유형, 테이블, 샤드)별 최신 값만 유지
+        self._seq = 0
+        self._events = []
+        self._latest = {}
+        self._condition = threading.Condition()
+
+    def publish(self, event):
+        with self._condition:
+            self._seq += 1
+            event = {**event, 'seq': self._seq, 'job_id': self.job_id}
+            if event.get('type') in LATEST_ONLY_EVENTS:
+                self._latest[(event['type'], event.get('table'), event.get('shard', 0))] = event
+            else:
+                self._events.append(event)
+                if event.get('type') == 'token_update':
+                    self.totals = {key: event.get(key, 0) for key in self.totals}
+            self._condition.notify_all()
+
+    def set_status(self, status, error=None):
+        with self._condition:
+            self.status = status
+            self.error = error
+            if status == 'running':
+                self.started_at = time.time()
+            elif status in FINISHED_STATUSES:
+                self.finished_at = time.time()
+            self._condition.notify_all()
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATUSES
+
+    @property
+    def resumable(self):
+        return self.finished and self.status != 'completed' and os.path.exists(self.checkpoint_dir)
+
+    def reset_for_resume(self):
+        """중단된 작업을 다시 대기 상태로 돌립니다. 이벤트 기록(seq)은 이어서 사용합니다."""
+        with self._condition:
+            self.status = 'queued'
+            self.error = None
+            self.finished_at = None
+            self.cancel_event = threading.Event()
+            self._condition.notify_all()
+
+    def _events_after(self, after_seq):
+        events = [event for event in self._events if event['seq'] > after_seq]
+        events.extend(event for event in self._latest.values() if event['seq'] > after_seq)
+        events.sort(key=lambda event: event['seq'])
+        return events
+
+    def iter_events(self, after_seq=0, heartbeat=15.0):
+        """
+        after_seq 이후의 이벤트를 순서대로 내보내고, 작업이 끝날 때까지 새 이벤트를 기다립니다.
+        이벤트가 heartbeat초 동안 없으면 None을 내보냅니다. (SSE 연결 유지용)
+        """
+        while True:
+            with self._condition:
+                events = self._events_after(after_seq)
+                if not events and not self.finished:
+                    self._condition.wait(timeout=heartbeat)
+                    events = self._events_after(after_seq)
+                finished = self.finished
+            for event in events:
+                after_seq = event['seq']
+                yield event
+            if finished and not events:
+                return
+            if not events:
+                yield None
+
+    def to_dict(self):
+        with self._condition:
+            progress = sorted(
+                (event for event in self._latest.values() if event['type'] == 'progress'),
+                key=lambda event: (event.get('table'), event.get('shard', 0))
+            )
+            return {
+                'job_id': self.job_id,
+                'model': self.model_name,
+                'status': self.status,
+                'error': self.error,
+                'quantities': self.quantities,
+                'output_dir': self.output_dir if self.status == 'completed' else None,
+                'resumable': self.resumable,
+                'created_at': self.created_at,
+                'started_at': self.started_at,
+                'finished_at': self.finished_at,
+                'last_seq': self._seq,
+                'progress': progress,
+                **self.totals,
+            }
+
+
+class JobManager:
+    """
+    생성 작업을 스레드 풀에서 실행합니다.
+    작업은 '<output_root>/jobs/<job_id>.partial'에 기록한 뒤, 성공하면 '<job_id>'로 이름을 바꿔 완료합니다.
+    브라우저 연결이 끊겨도 작업은 계속 진행됩니다.
+
+    작업마다 부분 결과 디렉터리에 체크포인트(작업 파라미터, 테이블/청크별 진행 상태)를 기록하므로,
+    실패/취소되었거나 서버 재시작으로 중단된 작업은 resume으로 마지막 체크포인트부터 이어서 생성할 수 있습니다.
+    시드를 지정하지 않은 작업도 임의 시드를 정해 기록하므로, 재개한 결과는 중단 없이 생성한 결과와 같습니다.
+    """
+
+    def __init__(self, output_root, max_concurrent_jobs=MAX_CONCURRENT_JOBS):
+        self.jobs_dir = os.path.join(output_root, 'jobs')
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent_jobs, thread_name_prefix='generation-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_interrupted_jobs()
+
+    def _load_interrupted_jobs(self):
+        """
+        이전 서버 프로세스에서 끝나지 못한 작업을 체크포인트에서 찾아 재개 가능한 작업으로 등록합니다.
+        같은 출력 디렉터리를 쓰는 다른 서버 프로세스가 아직 실행 중인 작업(소유권 잠금이 잡혀 있음)은 건너뜁니다.
+        """
+        if not os.path.isdir(self.jobs_dir):
+            return
+        for entry in sorted(os.listdir(self.jobs_dir)):
+            if not entry.endswith('.partial'):
+                continue
+            checkpoint_dir = os.path.join(self.jobs_dir, entry, CHECKPOINT_DIR_NAME)
+            manifest = checkpoints.load_job_manifest(checkpoint_dir)
+            if manifest is None or checkpoints.job_owner_alive(checkpoint_dir):
+                continue
+            job = self._job_from_manifest(manifest)
+            job.set_status('interrupted', "서버 재시작으로 중단되었습니다.")
+            self._jobs[job.job_id] = job
+
+    def _job_from_manifest(self, manifest):
+        job = GenerationJob(
+            manifest['job_id'], manifest['model_name'], manifest['job_quantities'],
+            os.path.join(self.jobs_dir, manifest['job_id'])
+        )
+        job.created_at = manifest.get('created_at', job.created_at)
+        return job
+
+    def submit(self, model_name, model, generation_levels, quantities, options, model_str=None, content_hash=None, **run_kwargs):
+        """
+        생성 작업을 등록합니다. run_kwargs는 runner.run_generation에 그대로 전달됩니다. (output_dir 제외)
+        model_str/content_hash는 모델 분석에 쓴 원본 모델 JSON 문자열과 내용 해시로, 재개할 때 같은 분석을
+        다시 요청할 수 있도록 매니페스트에 저장합니다.
+
+        Returns:
+            GenerationJob
+        """
+        job_id = uuid.uuid4().hex[:12]
+        table_names = {table.get('table_name') for table in model.get('tables', [])}
+        model_analysis = run_kwargs.pop('model_analysis', "")
+        # 재개한 결과가 중단 없이 생성한 결과와 같도록 시드와 기준 시각을 작업 등록 시점에 고정
+        # (기준 시각을 오늘 0시로 내리는 것은 시드를 지정한 생성뿐, 그 외에는 등록 시각 그대로 사용)
+        if run_kwargs.get('reference_time') is None:
+            seeded = run_kwargs.get('seed') is not None
+            run_kwargs['reference_time'] = runner.default_reference_time() if seeded else datetime.now().isoformat()
+        if run_kwargs.get('seed') is None:
+            run_kwargs['seed'] = secrets.randbelow(2 ** 63)
+        manifest = {
+            'job_id': job_id,
+            'model_name': model_name,
+            'model': model,
+            'model_str': model_str,
+            'content_hash': content_hash,
+            'generation_levels': generation_levels,
+            'quantities': quantities,
+            'job_quantities': {name: rows for name, rows in quantities.items() if name in table_names},
+            'options': options,
+            'run_kwargs': run_kwargs,
+            'created_at': time.time(),
+        }
+        job = self._job_from_manifest(manifest)
+        checkpoints.save_job_manifest(job.checkpoint_dir, manifest)
+        job.owner = checkpoints.acquire_job_owner(job.checkpoint_dir)
+        with self._lock:
+            self._jobs[job_id] = job
+            self._evict_finished()
+        job.publish({'type': 'log', 'message': f"작업 {job_id} 등록됨 (대기 중)"})
+        self._start(job, manifest, model_analysis)
+        return job
+
+    def resume(self, job_id, model_analysis=""):
+        """
+        실패/취소/중단된 작업을 마지막 체크포인트부터 다시 실행합니다.
+        완료된 테이블은 건너뛰고, 생성 중이던 테이블은 마지막으로 기록한 청크 다음부터 이어 씁니다.
+        model_analysis는 체크포인트에 모델 분석 텍스트가 저장되지 않은 경우(분석 완료 전 중단)에만 사용됩니다.
+
+        Returns:
+            GenerationJob
+
+        Raises:
+            LookupError: 작업이 없는 경우
+            ValueError: 재개할 수 없는 상태인 경우 (실행 중, 완료, 다른 서버 프로세스에서 실행 중 등)
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                # 기록 보관 개수를 넘어 메모리에서 지워진 작업도 체크포인트가 남아 있으면 재개
+                manifest = checkpoints.load_job_manifest(os.path.join(self.jobs_dir, f"{job_id}.partial", CHECKPOINT_DIR_NAME))
+                if manifest is None or manifest.get('job_id') != job_id:
+                    raise LookupError("작업을 찾을 수 없습니다.")
+                job = self._job_from_manifest(manifest)
+                job.set_status('interrupted')
+                self._jobs[job_id] = job
+            if not job.resumable:
+                raise ValueError(f"재개할 수 없는 작업입니다. ({job.status})")
+            manifest = checkpoints.load_job_manifest(job.checkpoint_dir)
+            if manifest is None:
+                raise ValueError("작업 체크포인트를 읽을 수 없습니다.")
+            owner = checkpoints.acquire_job_owner(job.checkpoint_dir)
+            if owner is None:
+                raise ValueError("다른 서버 프로세스에서 실행 중인 작업입니다.")
+            job.owner = owner
+            job.reset_for_resume()
+        job.publish({'type': 'log', 'message': f"작업 {job_id} 재개 요청됨 (대기 중)"})
+        self._start(job, manifest, model_analysis)
+        return job
+
+    def _start(self, job, manifest, model_analysis):
+        job.future = self._executor.submit(
+            self._run, job, manifest['model'], manifest['generation_levels'], manifest['quantities'],
+            manifest['options'], {**manifest['run_kwargs'], 'model_analysis': model_analysis}
+        )
+
+    def _run(self, job, model, generation_levels, quantities, options, run_kwargs):
+        try:
+            self._run_generation(job, model, generation_levels, quantities, options, run_kwargs)
+        finally:
+            checkpoints.release_job_owner(job.owner)
+            job.owner = None
+
+    def _run_generation(self, job, model, generation_levels, quantities, options, run_kwargs):
+        if job.cancel_event.is_set():
+            job.publish({'type': 'cancelled', 'message': "생성이 취소되었습니다."})
+            job.set_status('cancelled')
+            return
+
+        job.set_status('running')
+        final_event = None
+        try:
+            for event in runner.run_generation(
+                model, generation_levels, quantities, options,
+                output_dir=job.partial_dir, cancel_event=job.cancel_event,
+                checkpoint_dir=job.checkpoint_dir, **run_kwargs
+            ):
+                if event['type'] in ('complete', 'cancelled'):
+                    final_event = event
+                    break
+                job.publish(event)
+        except Exception as e:
+            # 부분 결과와 체크포인트는 남겨 두어 resume으로 이어서 생성할 수 있음
+            job.publish({'type': 'error', 'message': f"생성 작업 실패: {str(e)}"})
+            job.set_status('failed', str(e))
+            return
+
+        if final_event is None or final_event['type'] == 'cancelled':
+            job.publish(final_event or {'type': 'cancelled', 'message': "생성이 취소되었습니다."})
+            job.set_status('cancelled')
+            return
+
+        # 모든 파일을 쓴 뒤에만 최종 디렉터리로 이름 변경 (부분 결과가 완료된 것처럼 보이지 않도록)
+        shutil.rmtree(job.checkpoint_dir, ignore_errors=True)
+        os.replace(job.partial_dir, job.output_dir)
+        job.publish({**final_event, 'output_dir': job.output_dir})
+        job.set_status('completed')
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def list(self):
+        with self._lock:
+            return list(self._jobs.values())
+
+    def cancel(self, job_id):
+        """작업 취소를 요청합니다. 이미 끝난 작업이면 False."""
+        job = self.get(job_id)
+        if job is None or job.finished:
+            return False
+        job.cancel_event.set()
+        if job.future is not None and job.future.cancel():
+            # 아직 시작 전이던 작업
+            checkpoints.release_job_owner(job.owner)
+            job.owner = None
+            job.publish({'type': 'cancelled', 'message': "생성이 취소되었습니다."})
+            job.set_status('cancelled')
+        return True
+
+    def discard(self, job_id):
+        """재개하지 않을 작업의 부분 결과와 체크포인트를 삭제합니다. 실행 중이거나 완료된 작업이면 False."""
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or not job.resumable or checkpoints.job_owner_alive(job.checkpoint_dir):
+                return False
+            del self._jobs[job_id]
+        shutil.rmtree(job.partial_dir, ignore_errors=True)
+        return True
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - FINISHED_JOB_HISTORY, 0)]:
+            del self._jobs[job_id]
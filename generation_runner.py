@@ -0,0 +1,668 @@
+# generation_runner.py
+import functools
+import multiprocessing
+import os
+import queue
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+
+import checkpoints
+import column_plans as cp
+import data_generator as dg
+import dependency_analyzer as da
+import foreign_keys as fk
+import metrics
+import output_writers as ow
+from lazy_imports import lazy_import
+
+pd = lazy_import('pandas')
+
+# 같은 level의 테이블을 동시에 생성할 워커 프로세스 수
+MAX_WORKERS = int(os.getenv('GENERATION_WORKERS', os.cpu_count() or 1))
+
+# 진행 이벤트 확인 주기 (초)
+PROGRESS_POLL_INTERVAL = 0.2
+
+# 생성된 청크를 기록 스레드에 넘기는 큐 크기 (가득 차면 생성이 기다림, 0이면 생성 스레드에서 바로 기록)
+WRITER_QUEUE_SIZE = int(os.getenv('GENERATION_WRITER_QUEUE', 2))
+
+# 청크 기록 방식: 'thread' | 'process' | 'sync' | 'auto'
+# auto는 pandas CSV 인코딩이 GIL을 잡고 있으므로 CSV는 기록 프로세스, pyarrow가 GIL을 놓는 Parquet/Arrow는 기록 스레드를 쓰고,
+# CPU가 하나뿐이면 겹쳐 실행할 수 없으므로 생성 스레드에서 바로 기록합니다.
+WRITER_MODE = os.getenv('GENERATION_WRITER_MODE', 'auto')
+
+# 자식 테이블용 부모 키 파일(.npy)을 둘 디렉터리 (None이면 시스템 임시 디렉터리, 메모리에 두려면 /dev/shm)
+SPILL_DIR = os.getenv('GENERATION_SPILL_DIR') or None
+
+
+class GenerationCancelled(Exception):
+    """취소 요청으로 테이블 생성을 중단했을 때 워커에서 발생합니다."""
+
+
+def _key_columns(df, retain=True):
+    """
+    자식 테이블이 외래 키로 참조할 수 있는 'xxx_id' 컬럼만 골라냅니다.
+    retain에 컬럼 이름 목록을 넘기면 그중 df에 있는 컬럼만 고릅니다.
+    """
+    if retain is True:
+        return [col for col in df.columns if str(col).lower().endswith('_id')]
+    return [col for col in df.columns if col in retain]
+
+def referenced_key_columns(model, reverse_dependencies):
+    """
+    부모 테이블마다 자식 테이블이 외래 키로 참조하는 컬럼 이름 목록을 구합니다.
+    자식의 'xxx_id' 컬럼은 부모의 같은 이름 컬럼에서 값을 뽑으므로 (dependency_analyzer와 같은 이름 규칙),
+    부모는 모든 'xxx_id' 컬럼이 아니라 이 컬럼들만 보관하면 됩니다.
+
+    Returns:
+        dict: {부모 테이블 이름: [컬럼 이름, ...]}
+    """
+    table_names = {table.get('table_name') for table in model.get('tables', []) if table.get('table_name')}
+    tables_map = {table.get('table_name'): table for table in model.get('tables', [])}
+    referenced = {}
+    for parent, children in reverse_dependencies.items():
+        columns = []
+        for child in children:
+            for column in tables_map.get(child, {}).get('columns', []):
+                col_name = column.get('column_name', '')
+                if not col_name.endswith('_id') or col_name in columns:
+                    continue
+                prefix = col_name.replace('_id', '')
+                target = f"{prefix}s" if f"{prefix}s" in table_names else prefix
+                if target == parent:
+                    columns.append(col_name)
+        referenced[parent] = columns
+    return referenced
+
+
+class RetainedKeys:
+    """
+    생성 중 자식 테이블이 참조할 부모 키 컬럼 보관소.
+    부모마다 아직 끝나지 않은 자식 테이블 수를 세다가 마지막 자식이 끝나면 바로 해제하므로,
+    보관 메모리는 전체 테이블 합이 아니라 동시에 참조 중인 부모들의 크기에 비례합니다.
+
+    키 컬럼은 부모 테이블이 끝날 때 한 번 .npy 파일로 기록하고, 워커에는 파일 경로만 담긴
+    ForeignKeyIndex를 넘깁니다. 워커는 파일을 메모리 맵으로 열어 같은 물리 페이지를 공유하므로
+    작업마다 키를 pickle/복사하지 않고, 작업당 전달 비용이 부모 크기와 무관합니다.
+    (숫자가 아닌 키만 메모리에 두고 작업마다 전달)
+    """
+
+    def __init__(self, pending_children, spill_dir=None):
+        self.pending_children = dict(pending_children)
+        self.spill_dir = tempfile.mkdtemp(prefix='datagen_keys_', dir=spill_dir)
+        self._indexes = {}
+        self._sizes = {}
+        self.peak_bytes = 0
+        self.total_bytes = 0
+
+    @property
+    def live_bytes(self):
+        return sum(self._sizes.values())
+
+    def needs(self, table_name):
+        """아직 생성할 자식 테이블이 남아 있어 키를 보관해야 하는지."""
+        return self.pending_children.get(table_name, 0) > 0
+
+    def put(self, table_name, df):
+        table_dir = os.path.join(self.spill_dir, table_name)
+        os.makedirs(table_dir, exist_ok=True)
+        indexes, size = {}, 0
+        for i, column in enumerate(df.columns):
+            keys = df[column].to_numpy()
+            index = fk.save_keys(os.path.join(table_dir, f"{i}.npy"), keys)
+            indexes[column] = index if index is not None else fk.ForeignKeyIndex(keys)
+            size += keys.nbytes if keys.dtype != object else int(df[column].memory_usage(deep=True, index=False))
+        self._indexes[table_name] = indexes
+        self._sizes[table_name] = size
+        self.total_bytes += size
+        self.peak_bytes = max(self.peak_bytes, self.live_bytes)
+        metrics.registry.set('datagen_retained_key_bytes', self.live_bytes)
+
+    def get(self, table_name):
+        """{컬럼명: ForeignKeyIndex} (get_foreign_key_index가 받는 related_data 형식)"""
+        return self._indexes.get(table_name)
+
+    def __contains__(self, table_name):
+        return table_name in self._indexes
+
+    def child_finished(self, parents):
+        """
+        자식 테이블 하나가 끝났을 때(성공/실패) 호출합니다.
+
+        Returns:
+            list: 이번에 해제된 부모 테이블 이름
+        """
+        released = []
+        for parent in parents:
+            if parent not in self.pending_children:
+                continue
+            self.pending_children[parent] -= 1
+            if self.pending_children[parent] <= 0:
+                self.pending_children.pop(parent)
+                if self._release(parent):
+                    released.append(parent)
+        return released
+
+    def _release(self, table_name):
+        if self._indexes.pop(table_name, None) is None:
+            return False
+        self._sizes.pop(table_name, None)
+        # 워커가 아직 열어 둔 메모리 맵은 파일을 지워도 닫을 때까지 유효
+        shutil.rmtree(os.path.join(self.spill_dir, table_name), ignore_errors=True)
+        metrics.registry.set('datagen_retained_key_bytes', self.live_bytes)
+        return True
+
+    def close(self):
+        self._indexes.clear()
+        self._sizes.clear()
+        metrics.registry.set('datagen_retained_key_bytes', 0)
+        shutil.rmtree(self.spill_dir, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def generate_table_task(table_name, columns_list, num_rows, related_data, options, model_analysis, output_dir, retain,
+                        chunk_size=dg.DEFAULT_CHUNK_SIZE, progress_queue=None, output_format='csv', compression=None,
+                        seed=None, reference_time=None, shard_index=0, shard_count=1, cancel_event=None,
+                        checkpoint_dir=None, writer_queue_size=None):
+    """
+    워커 프로세스에서 테이블 하나(또는 그 샤드 하나)를 청크 단위로 생성하며 출력 파일(CSV/Parquet/Arrow)에 이어 씁니다.
+    청크마다 progress_queue로 진행 상황(progress 이벤트)을 보내고, cancel_event가 설정되면 다음 청크 전에 중단합니다.
+    파일 기록은 기록 스레드/프로세스(ow.BackgroundWriter, WRITER_MODE)가 맡아 다음 청크 생성과 겹쳐 실행됩니다.
+    (큐 크기 writer_queue_size, 기본값 WRITER_QUEUE_SIZE. 진행 이벤트에 큐 깊이와 생성 대기 시간 포함)
+
+    checkpoint_dir를 지정하면 청크를 기록할 때마다 완료 청크 수, 파일 크기, 토큰 수, 키 컬럼을 저장하고,
+    다시 실행할 때 마지막 체크포인트부터 이어서 생성합니다. (seed 지정 시 중단 없이 생성한 결과와 동일)
+    완료된 테이블은 저장된 결과를 바로 돌려주며, Parquet/Arrow는 파일 중간부터 이어 쓸 수 없으므로
+    완료되지 않은 샤드를 처음부터 다시 생성합니다.
+
+    retain은 자식 테이블에 넘길 키 컬럼입니다. 컬럼 이름 목록이면 그 컬럼만, True면 모든 'xxx_id' 컬럼을 보관합니다.
+
+    Returns:
+        tuple: (키 컬럼 DataFrame 또는 None, prompt_tokens, candidates_tokens, LLM 통계 dict)
+               자식 테이블이 없으면(retain=False) 데이터를 돌려보내지 않고,
+               있으면 자식이 참조할 키 컬럼만 모아 돌려보냅니다.
+    """
+    cp.set_reference_time(reference_time)
+    prompt_tokens, candidates_tokens = 0, 0
+    llm_stats = {'llm_cached_values': 0, 'llm_generated_values': 0}
+    retained_chunks = []
+    rows_done = 0
+    skip_chunks = 0
+    shard_rows = sum(rows for _, rows in dg.shard_row_ranges(num_rows, chunk_size, shard_index, shard_count))
+    started_at = time.perf_counter()
+
+    state = checkpoints.load_table_state(checkpoint_dir, table_name, shard_index) if checkpoint_dir else None
+    if state and state.get('complete'):
+        retained = None
+        if retain and state['chunks_done']:
+            retained = pd.concat(checkpoints.load_chunk_keys(checkpoint_dir, table_name, shard_index, state['chunks_done']),
+                                 ignore_index=True)
+            retained = retained[_key_columns(retained, retain)]
+        return retained, state['prompt_tokens'], state['candidates_tokens'], state['llm_stats']
+    if state and state.get('chunks_done') and output_format in ow.APPENDABLE_FORMATS:
+        file_path = os.path.join(output_dir, ow.output_file_name(table_name, output_format, shard_index, shard_count))
+        if os.path.exists(file_path) and os.path.getsize(file_path) >= state['bytes']:
+            # 체크포인트 이후에 일부만 기록된 청크를 잘라내고 이어 씀
+            os.truncate(file_path, state['bytes'])
+            skip_chunks = state['chunks_done']
+            rows_done = state['rows_done']
+            prompt_tokens, candidates_tokens = state['prompt_tokens'], state['candidates_tokens']
+            llm_stats.update(state['llm_stats'])
+            if retain:
+                retained_chunks = [
+                    keys[_key_columns(keys, retain)]
+                    for keys in checkpoints.load_chunk_keys(checkpoint_dir, table_name, shard_index, skip_chunks)
+                ]
+
+    chunks = dg.iter_table_chunks(
+        table_name, columns_list, num_rows,
+        related_data=related_data,
+        options=options,
+        model_analysis=model_analysis,
+        chunk_size=chunk_size,
+        stats=llm_stats,
+        seed=seed,
+        shard_index=shard_index,
+        shard_count=shard_count,
+        skip_chunks=skip_chunks
+    )
+
+    def save_state(chunks_done, byte_count, stats, complete=False):
+        checkpoints.save_table_state(checkpoint_dir, table_name, shard_index, {
+            'chunks_done': chunks_done,
+            'rows_done': rows_done,
+            'bytes': byte_count,
+            'prompt_tokens': prompt_tokens,
+            'candidates_tokens': candidates_tokens,
+            'llm_stats': stats,
+            'complete': complete,
+        })
+
+    # 이 샤드의 누적 지표 (워커 프로세스 기본 레지스트리는 청크마다 비워서 부모로 보냄)
+    task_metrics = metrics.MetricsRegistry()
+    bytes_seen = 0
+    stall_reported = 0.0
+
+    def count_bytes(byte_count):
+        # 이어 쓰는 경우 기존 파일 크기는 제외하고, 이번 실행에서 늘어난 바이트만 더함
+        nonlocal bytes_seen
+        metrics.inc('datagen_bytes_written_total', max(byte_count - bytes_seen, 0), table=table_name, format=output_format)
+        bytes_seen = byte_count
+
+    def send_metrics():
+        delta = metrics.registry.drain()
+        task_metrics.merge(delta)
+        progress_queue.put({
+            'type': 'metrics',
+            'table': table_name,
+            'shard': shard_index,
+            'shard_count': shard_count,
+            'delta': delta,
+            **task_metrics.table_summary(table_name)
+        })
+
+    chunks_written = skip_chunks
+    if skip_chunks:
+        bytes_seen = state['bytes']  # 체크포인트 위치로 잘라낸 기존 파일 크기
+    open_writer = functools.partial(ow.open_table_writer, output_dir, table_name, output_format, compression, columns_list,
+                                    shard_index, shard_count, append=skip_chunks > 0)
+
+    def chunk_written(write_seconds, byte_count, num_rows, keys_df, chunk_prompt_tokens, chunk_candidates_tokens, written_llm_stats):
+        # 청크 기록이 끝날 때마다 생성 순서대로 호출됨 (기록 스레드 또는 기록 프로세스의 결과를 받는 스레드)
+        # written_llm_stats는 이 청크까지의 LLM 통계 (생성 쪽은 이미 다음 청크를 세고 있을 수 있음)
+        nonlocal prompt_tokens, candidates_tokens, rows_done, chunks_written, stall_reported
+        metrics.inc('datagen_write_seconds_total', write_seconds, table=table_name, format=output_format)
+        count_bytes(byte_count)
+        chunks_written += 1
+        prompt_tokens += chunk_prompt_tokens
+        candidates_tokens += chunk_candidates_tokens
+        rows_done += num_rows
+        if keys_df is not None:
+            retained_chunks.append(keys_df)
+        if checkpoint_dir:
+            # 키 컬럼을 먼저 저장한 뒤 상태를 갱신 (상태 파일이 가리키는 청크는 항상 키가 있음)
+            if keys_df is not None:
+                checkpoints.save_chunk_keys(checkpoint_dir, table_name, shard_index, chunks_written - 1, keys_df)
+            save_state(chunks_written, byte_count, written_llm_stats)
+
+        stall_seconds = background.stall_seconds
+        metrics.inc('datagen_writer_stall_seconds_total', stall_seconds - stall_reported, table=table_name)
+        stall_reported = stall_seconds
+        if progress_queue is not None:
+            elapsed = time.perf_counter() - started_at
+            progress_queue.put({
+                'type': 'progress',
+                'table': table_name,
+                'shard': shard_index,
+                'shard_count': shard_count,
+                'chunk': chunks_written,
+                'resumed_chunks': skip_chunks,
+                'rows_done': rows_done,
+                'rows_total': shard_rows,
+                'rows_per_sec': int(rows_done / elapsed) if elapsed > 0 else rows_done,
+                'writer_queue': background.queue_depth,
+                'writer_stall_seconds': round(stall_seconds, 3),
+                'prompt_tokens': prompt_tokens,
+                'candidates_tokens': candidates_tokens,
+                **written_llm_stats
+            })
+            send_metrics()
+
+    with ow.BackgroundWriter(open_writer, chunk_written,
+                             WRITER_QUEUE_SIZE if writer_queue_size is None else writer_queue_size,
+                             _writer_mode(output_format)) as background:
+        for chunk_df, chunk_prompt_tokens, chunk_candidates_tokens in chunks:
+            if cancel_event is not None and cancel_event.is_set():
+                raise GenerationCancelled(f"{table_name}: {chunks_written}개 청크 기록 후 취소됨")
+            keys_df = chunk_df[_key_columns(chunk_df, retain)] if retain else None
+            background.write(chunk_df, len(chunk_df), keys_df, chunk_prompt_tokens, chunk_candidates_tokens, dict(llm_stats))
+
+    if checkpoint_dir:
+        save_state(chunks_written, background.bytes_written, llm_stats, complete=True)
+    count_bytes(background.bytes_written)  # 파일을 닫을 때 기록된 바이트 (Parquet 푸터 등)
+    if progress_queue is not None:
+        send_metrics()
+    retained = pd.concat(retained_chunks, ignore_index=True) if retain and retained_chunks else None
+    return retained, prompt_tokens, candidates_tokens, llm_stats
+
+
+def _writer_mode(output_format):
+    if WRITER_MODE != 'auto':
+        return WRITER_MODE
+    if (os.cpu_count() or 1) < 2:
+        return 'sync'
+    return 'process' if output_format == 'csv' else 'thread'
+
+def _release_parents(retained_keys, dependencies, table_name):
+    """table_name 생성이 끝났을 때, 더 이상 참조할 자식 테이블이 없는 부모의 키 컬럼을 해제합니다."""
+    released = retained_keys.child_finished(dependencies.get(table_name, []))
+    if released:
+        live_mb = retained_keys.live_bytes / 1024 / 1024
+        yield {'type': 'log', 'message': f"   부모 키 해제: {', '.join(released)} (보관 중 {live_mb:.1f}MB)"}
+
+def _init_worker(llm_slots):
+    """
+    워커 프로세스 초기화: 프로세스 간 공유 LLM 세마포어를 설정하고,
+    fork로 복사된 전역 난수 상태를 다시 시드합니다. (시드 미지정 시 샤드끼리 같은 값이 나오지 않도록)
+    """
+    dg.configure_llm_concurrency(semaphore=llm_slots)
+    dg.reseed_defaults()
+    metrics.registry.reset()
+
+def _drain_queue(progress_queue):
+    """워커 이벤트를 꺼냅니다. metrics 이벤트의 증분(delta)은 이 프로세스의 지표 레지스트리에 합칩니다."""
+    events = []
+    while True:
+        try:
+            event = progress_queue.get_nowait()
+        except queue.Empty:
+            return events
+        if event.get('type') == 'metrics':
+            metrics.registry.merge(event.pop('delta'))
+        events.append(event)
+
+
+def _needs_model_analysis(columns_list):
+    """LLM 컬럼이 있는 테이블만 모델 분석 결과가 필요합니다."""
+    return any('[LLM]' in c.get('description', '') for c in columns_list)
+
+def _analysis_text(analysis_future):
+    try:
+        return analysis_future.result() or ""
+    except Exception:
+        return ""  # AI 분석 실패해도 무시
+
+
+def default_reference_time():
+    """시드 지정 생성의 기본 기준 시각: 오늘 0시 (같은 날 재실행하면 같은 결과)."""
+    return datetime.now().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
+
+def run_generation(model, generation_levels, quantities, options, model_analysis="", output_dir="output_data", max_workers=None,
+                   chunk_size=dg.DEFAULT_CHUNK_SIZE, output_format='csv', compression=None, llm_max_in_flight=None,
+                   seed=None, reference_time=None, shard_count=1, cancel_event=None, checkpoint_dir=None, spill_dir=None):
+    """
+    의존성 level 단위로 테이블을 생성합니다. 같은 level의 테이블은 프로세스 풀에서 동시에 생성됩니다.
+    자식 테이블이 참조하는 부모 키 컬럼만 보관하고, 부모를 참조하는 마지막 자식 테이블이 끝나면 해제합니다.
+
+    Args:
+        model (dict): 데이터 모델 JSON 객체
+        generation_levels (list): da.get_generation_levels 결과
+        quantities (dict): 테이블별 생성 행 수
+        options (dict): 컬럼별 생성 옵션
+        model_analysis (str | Future): LLM 컬럼 생성에 사용할 모델 분석 텍스트.
+            Future를 넘기면 분석이 끝나기 전에도 LLM 컬럼이 없는 테이블부터 생성을 시작하고,
+            LLM 컬럼이 있는 테이블만 분석 완료를 기다립니다.
+        output_dir (str): 출력 파일 저장 디렉터리
+        max_workers (int): 최대 워커 프로세스 수 (기본값 MAX_WORKERS)
+        chunk_size (int): 청크당 행 수 (메모리 사용량 상한)
+        output_format (str): 'csv' | 'parquet' | 'feather'
+        compression (str): 출력 압축 방식 (None이면 형식별 기본값)
+        llm_max_in_flight (int): 같은 level의 모든 테이블이 공유하는 최대 동시 LLM 요청 수
+                                 (기본값 dg.LLM_MAX_IN_FLIGHT)
+        seed (int): 지정하면 같은 seed/chunk_size/reference_time으로 항상 같은 데이터를 생성 (LLM 컬럼 제외)
+        reference_time (str): '최근 2년' 등 상대 날짜 규칙의 기준 시각 (seed 지정 시 기본값: 오늘 0시)
+        shard_count (int): 테이블마다 나눌 샤드 수. 샤드는 별도 워커에서 동시에 생성되어
+                           'table.part-xxxxx-of-xxxxx' 파일로 저장됩니다.
+        cancel_event (threading.Event): 설정되면 시작 전인 테이블은 취소하고, 생성 중인 테이블은
+                                        현재 청크까지만 기록한 뒤 'cancelled' 이벤트로 끝냅니다.
+        checkpoint_dir (str): 지정하면 청크/테이블마다 진행 상태를 저장하고, 같은 디렉터리로 다시 실행하면
+                              완료된 테이블은 건너뛰고 중단된 테이블은 마지막 청크부터 이어서 생성합니다.
+                              모델 분석 텍스트도 저장해 재개 시 다시 분석하지 않습니다.
+                              (중단 없이 생성한 결과와 같으려면 seed와 reference_time이 같아야 함)
+        spill_dir (str): 부모 키 파일(.npy)을 둘 디렉터리. 워커는 이 파일을 메모리 맵으로 공유합니다.
+                         (기본값 SPILL_DIR, 없으면 시스템 임시 디렉터리. 실행이 끝나면 삭제)
+
+    Yields:
+        dict: 'type' 키를 포함한 진행 이벤트 (log, progress, token_update, complete 또는 cancelled)
+    """
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    model_tables_map = {t['table_name']: t for t in model.get('tables', [])}
+    dependency_info = da.analyze_model(model)
+    dependencies, reverse_dependencies = dependency_info['dependencies'], dependency_info['reverse_dependencies']
+    max_workers = max_workers or MAX_WORKERS
+    shard_count = max(int(shard_count), 1)
+    if seed is not None and reference_time is None:
+        reference_time = default_reference_time()
+
+    analysis_future = model_analysis if isinstance(model_analysis, Future) else None
+    model_analysis_text = "" if analysis_future is not None else model_analysis
+    if checkpoint_dir:
+        saved_analysis = checkpoints.load_model_analysis(checkpoint_dir)
+        if saved_analysis is not None:
+            # 이전 실행과 같은 분석 텍스트를 써야 LLM 캐시를 그대로 재사용
+            analysis_future, model_analysis_text = None, saved_analysis
+        elif analysis_future is None:
+            checkpoints.save_model_analysis(checkpoint_dir, model_analysis_text)
+
+    # 고유 값 컬럼의 범위가 행 수보다 작으면 어떤 테이블도 쓰기 전에 중단
+    for table_name, table_details in model_tables_map.items():
+        num_rows = int(quantities.get(table_name, 0))
+        if num_rows > 0:
+            plan = cp.build_table_plan(table_name, table_details.get('columns', []), options)
+            cp.check_unique_capacity(table_name, plan, num_rows)
+
+    # 부모 테이블별로 아직 생성하지 않은 자식 테이블 수 (행 수가 0인 자식은 생성하지 않으므로 제외)
+    pending_children = {
+        parent: sum(1 for child in children if child in model_tables_map and int(quantities.get(child, 0)) > 0)
+        for parent, children in reverse_dependencies.items()
+    }
+    retained_columns = referenced_key_columns(model, reverse_dependencies)
+    total_prompt_tokens, total_candidates_tokens = 0, 0
+    total_cached_values = 0
+
+    yield {'type': 'token_update', 'prompt_tokens': 0, 'candidates_tokens': 0, 'cached_values': 0}
+    if seed is not None:
+        yield {'type': 'log', 'message': f"시드 {seed}, 기준 시각 {reference_time}, 청크 {chunk_size}행으로 재현 가능한 생성을 진행합니다."}
+    if checkpoint_dir:
+        resumed_tables = [
+            table_name for table_name in model_tables_map
+            if any(checkpoints.load_table_state(checkpoint_dir, table_name, shard_index) for shard_index in range(shard_count))
+        ]
+        if resumed_tables:
+            yield {'type': 'log', 'message': f"체크포인트에서 재개합니다. (진행 기록이 있는 테이블 {len(resumed_tables)}개)"}
+
+    # 워커 프로세스가 청크별 진행 상황을 보내는 큐
+    # 프로세스 풀 워커가 pandas/Faker를 각자 다시 로드하지 않도록 부모에서 먼저 로드 (fork로 물려받음)
+    dg.warm_up()
+
+    with multiprocessing.Manager() as manager, RetainedKeys(pending_children, spill_dir or SPILL_DIR) as retained_keys:
+        progress_queue = manager.Queue()
+        # 같은 level의 워커 프로세스들이 함께 쓰는 LLM 동시 요청 한도
+        llm_slots = manager.BoundedSemaphore(llm_max_in_flight or dg.LLM_MAX_IN_FLIGHT)
+        # 워커 프로세스가 청크마다 확인하는 취소 플래그
+        worker_cancel = manager.Event()
+        cancelling = False
+
+        for level in generation_levels:
+            if cancel_event is not None and cancel_event.is_set():
+                cancelling = True
+                break
+            tasks = []
+            for table_name in level:
+                table_details = model_tables_map.get(table_name)
+                if not table_details: continue
+
+                num_rows = int(quantities.get(table_name, 0))
+                if num_rows == 0:
+                    yield {'type': 'log', 'message': f"-> **{table_name}** (0개) 건너뜁니다."}
+                    continue
+                tasks.append((table_name, table_details.get("columns", []), num_rows))
+
+            if not tasks:
+                continue
+
+            with ProcessPoolExecutor(
+                max_workers=min(max_workers, len(tasks) * shard_count),
+                initializer=_init_worker, initargs=(llm_slots,)
+            ) as executor:
+                futures = {}
+                # 테이블별 샤드 결과 (키 컬럼 DataFrame, 샤드 순서대로 이어 붙임)와 남은 샤드 수
+                shard_results, shards_left = {}, {}
+
+                def submit(table_name, columns_list, num_rows):
+                    # 워커에는 이 테이블이 참조하는 부모 테이블만 전달
+                    related_data = {
+                        parent: retained_keys.get(parent)
+                        for parent in dependencies.get(table_name, []) if parent in retained_keys
+                    }
+                    retain = retained_columns.get(table_name) if retained_keys.needs(table_name) else False
+                    shard_results[table_name] = [None] * shard_count
+                    shards_left[table_name] = shard_count
+                    for shard_index in range(shard_count):
+                        future = executor.submit(
+                            generate_table_task, table_name, columns_list, num_rows, related_data,
+                            options, model_analysis_text, output_dir, retain,
+                            chunk_size, progress_queue, output_format, compression,
+                            seed, reference_time, shard_index, shard_count, worker_cancel, checkpoint_dir
+                        )
+                        futures[future] = (table_name, shard_index)
+                    shard_note = f", {shard_count}개 샤드" if shard_count > 1 else ""
+                    return {'type': 'log', 'message': f"-> **{table_name}** ({num_rows}개{shard_note}) 생성 시작..."}
+
+                # 모델 분석이 아직 진행 중이면 LLM 컬럼이 있는 테이블만 분석 완료 후 시작
+                deferred = []
+                for task in tasks:
+                    if analysis_future is not None and _needs_model_analysis(task[1]):
+                        deferred.append(task)
+                    else:
+                        yield submit(*task)
+
+                pending = set(futures)
+                if deferred:
+                    pending.add(analysis_future)
+                while pending:
+                    done, pending = wait(pending, timeout=PROGRESS_POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                    yield from _drain_queue(progress_queue)
+
+                    if cancel_event is not None and cancel_event.is_set() and not cancelling:
+                        cancelling = True
+                        worker_cancel.set()
+                        for future in pending:
+                            if future is not analysis_future:
+                                future.cancel()
+                        pending.discard(analysis_future)
+                        deferred = []
+                        yield {'type': 'log', 'message': "취소 요청을 받았습니다. 진행 중인 청크까지만 기록하고 중단합니다..."}
+
+                    for future in done:
+                        if future is analysis_future:
+                            if cancelling:
+                                continue
+                            model_analysis_text = _analysis_text(analysis_future)
+                            analysis_future = None
+                            if checkpoint_dir:
+                                checkpoints.save_model_analysis(checkpoint_dir, model_analysis_text)
+                            for task in deferred:
+                                yield submit(*task)
+                            pending.update(f for f in futures if not f.done())
+                            continue
+
+                        table_name, shard_index = futures[future]
+                        try:
+                            df, prompt_tokens, candidates_tokens, llm_stats = future.result()
+                        except Exception as e:
+                            # 실패해도 다음 테이블 계속 처리
+                            if shard_results.pop(table_name, None) is not None:
+                                yield from _release_parents(retained_keys, dependencies, table_name)
+                            if not cancelling:
+                                yield {'type': 'log', 'message': f"   **{table_name}** 생성 실패: {str(e)}"}
+                            continue
+
+                        if table_name in shard_results:
+                            shard_results[table_name][shard_index] = df
+                            shards_left[table_name] -= 1
+                            if shards_left[table_name] == 0:
+                                retained = [part for part in shard_results.pop(table_name) if part is not None]
+                                if retained:
+                                    retained_keys.put(table_name, pd.concat(retained, ignore_index=True))
+                                yield from _release_parents(retained_keys, dependencies, table_name)
+                        total_prompt_tokens += prompt_tokens
+                        total_candidates_tokens += candidates_tokens
+                        total_cached_values += llm_stats['llm_cached_values']
+
+                        log_message = f"   '{ow.output_file_name(table_name, output_format, shard_index, shard_count)}' 저장 완료."
+                        if (prompt_tokens + candidates_tokens) > 0:
+                            log_message += f" (입력: {prompt_tokens}, 출력: {candidates_tokens})"
+                        if llm_stats['llm_cached_values'] > 0:
+                            log_message += f" (LLM 캐시 재사용: {llm_stats['llm_cached_values']}개 값)"
+
+                        yield {'type': 'log', 'message': log_message}
+                        yield {
+                            'type': 'token_update',
+                            'prompt_tokens': total_prompt_tokens,
+                            'candidates_tokens': total_candidates_tokens,
+                            'cached_values': total_cached_values
+                        }
+
+            if cancelling:
+                break
+
+    if cancelling:
+        yield {
+            'type': 'cancelled',
+            'message': "생성이 취소되었습니다.",
+            'prompt_tokens': total_prompt_tokens,
+            'candidates_tokens': total_candidates_tokens,
+            'cached_values': total_cached_values
+        }
+        return
+
+    if retained_keys.total_bytes:
+        yield {'type': 'log', 'message': f"부모 키 보관 메모리: 최대 {retained_keys.peak_bytes / 1024 / 1024:.1f}MB "
+                                         f"(보관한 키 전체 {retained_keys.total_bytes / 1024 / 1024:.1f}MB)"}
+    yield {
+        'type': 'complete',
+        'message': "✅ 모든 데이터 생성이 완료되었습니다!",
+        'prompt_tokens': total_prompt_tokens,
+        'candidates_tokens': total_candidates_tokens,
+        'cached_values': total_cached_values,
+        'retained_key_bytes': {'peak': retained_keys.peak_bytes, 'total': retained_keys.total_bytes},
+    }
+
+
+def rebuild_related_data(model, table_name, quantities, options=None, seed=None, chunk_size=dg.DEFAULT_CHUNK_SIZE):
+    """
+    시드 지정 생성에서 table_name이 참조하는 부모 테이블들의 키 컬럼('xxx_id')을 다시 생성합니다.
+    컬럼마다 독립된 시드를 쓰므로 키 컬럼만 생성해도 전체 실행 때와 같은 값이 나옵니다.
+    다른 머신에서 큰 테이블의 샤드 하나만 생성할 때 부모 CSV 없이 related_data를 만드는 데 사용합니다.
+    reference_time은 호출 전에 cp.set_reference_time으로 맞춰 두어야 합니다.
+
+    Returns:
+        dict: {부모 테이블 이름: 키 컬럼 DataFrame}
+    """
+    if seed is None:
+        raise ValueError("부모 키 재생성은 seed를 지정한 생성에서만 가능합니다.")
+    model_tables_map = {t['table_name']: t for t in model.get('tables', [])}
+    dependencies = da.analyze_model(model)['dependencies']
+    rebuilt = {}
+
+    def key_frame(name):
+        if name not in rebuilt:
+            key_columns = [
+                c for c in model_tables_map[name].get('columns', [])
+                if c.get('column_name', '').lower().endswith('_id') and '[LLM]' not in c.get('description', '')
+            ]
+            chunks = [chunk[_key_columns(chunk)] for chunk, _, _ in dg.iter_table_chunks(
+                name, key_columns, int(quantities.get(name, 0)),
+                related_data=parents_of(name), options=options, chunk_size=chunk_size, seed=seed
+            )]
+            rebuilt[name] = pd.concat(chunks, ignore_index=True)
+        return rebuilt[name]
+
+    def parents_of(name):
+        # 전체 실행과 같게 행 수가 0인 부모는 related_data에서 제외
+        return {
+            parent: key_frame(parent) for parent in dependencies.get(name, [])
+            if parent in model_tables_map and int(quantities.get(parent, 0)) > 0
+        }
+
+    return parents_of(table_name)
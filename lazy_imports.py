@@ -0,0 +1,49 @@
+# lazy_imports.py
+import importlib
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """
+    처음 속성에 접근할 때 실제 모듈을 import하는 대리 모듈.
+    로드 후에는 실제 모듈의 속성을 자신의 __dict__에 복사해 두므로 이후 접근은 일반 모듈과 같은 속도입니다.
+    """
+
+    def __init__(self, name):
+        super().__init__(name)
+        self.__dict__['_lazy_lock'] = threading.Lock()
+        self.__dict__['_lazy_module'] = None
+
+    def _load(self):
+        module = self.__dict__['_lazy_module']
+        if module is None:
+            # 여러 요청 스레드가 동시에 처음 접근해도 한 번만 import
+            with self.__dict__['_lazy_lock']:
+                module = self.__dict__['_lazy_module']
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__.update(module.__dict__)
+                    self.__dict__['_lazy_module'] = module
+        return module
+
+    def __getattr__(self, attr):
+        # __dict__에 없는 속성만 여기로 옴 (로드 전 접근, 또는 로드 후 추가된 하위 모듈)
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_import(name):
+    """
+    import 시점에 로드하지 않고 처음 사용할 때 로드하는 모듈 객체를 반환합니다.
+    pandas, Faker, google.generativeai처럼 import만으로 수백 ms가 걸리는 모듈을 앱/CLI 시작 경로에서 빼기 위해 사용합니다.
+
+    e.g., pd = lazy_import('pandas')  # pd.DataFrame에 처음 접근할 때 pandas를 import
+    """
+    return _LazyModule(name)
+
+def is_loaded(module):
+    """lazy_import로 만든 모듈이 실제로 로드되었는지 확인합니다. (일반 모듈은 항상 True)"""
+    return not isinstance(module, _LazyModule) or module.__dict__['_lazy_module'] is not None
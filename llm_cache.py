@@ -0,0 +1,290 @@
+# llm_cache.py
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import metrics
+
+try:
+    import fcntl
+except ImportError:  # Windows: 프로세스 간 잠금 없이 스레드 잠금만 사용
+    fcntl = None
+
+# 캐시 설정 (환경 변수로 조정 가능)
+CACHE_ENABLED = os.getenv('LLM_CACHE_ENABLED', '1') not in ('0', 'false', 'False')
+CACHE_PATH = os.getenv('LLM_CACHE_PATH', os.path.join('.cache', 'llm_values.sqlite3'))
+CACHE_MAX_BYTES = int(os.getenv('LLM_CACHE_MAX_BYTES', 256 * 1024 * 1024))
+CACHE_TTL_SECONDS = int(os.getenv('LLM_CACHE_TTL_SECONDS', 7 * 24 * 3600))
+
+# 값 풀은 행 범위 조각(청크의 시작 행 위치 chunk_start부터 value_count개)으로 나누어 저장하므로
+# 청크는 자기 범위만 읽고 씁니다. 중복 검사는 값 전체 대신 키별 값 해시 테이블로 합니다.
+_SCHEMA = """
+DROP TABLE IF EXISTS value_pools;
+CREATE TABLE IF NOT EXISTS pool_segments (
+    cache_key TEXT NOT NULL,
+    chunk_start INTEGER NOT NULL,
+    column_name TEXT,
+    values_json TEXT NOT NULL,
+    value_count INTEGER NOT NULL,
+    size_bytes INTEGER NOT NULL,
+    filled_at REAL NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (cache_key, chunk_start)
+);
+CREATE TABLE IF NOT EXISTS pool_hashes (
+    cache_key TEXT NOT NULL,
+    value_hash TEXT NOT NULL,
+    row_number INTEGER NOT NULL,
+    PRIMARY KEY (cache_key, value_hash)
+);
+"""
+# IN (...) 조회 한 번에 넣을 해시 수 (SQLite 변수 개수 제한 이하)
+_HASH_QUERY_BATCH = 500
+
+
+def make_cache_key(col_detail, model_analysis, prompt_version):
+    """컬럼명, 설명, 데이터 타입, 모델 분석 컨텍스트, 프롬프트 버전으로 캐시 키를 만듭니다."""
+    payload = json.dumps({
+        "column_name": col_detail.get('column_name'),
+        "description": col_detail.get('description', ''),
+        "data_type": col_detail.get('data_type', ''),
+        "model_analysis": model_analysis or "",
+        "prompt_version": prompt_version,
+    }, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def dedup_key(value):
+    """중복 검사에 쓰는 값의 문자열 표현 (문자열이 아니면 JSON)."""
+    return value if isinstance(value, str) else json.dumps(value, sort_keys=True, ensure_ascii=False)
+
+def value_hash(key):
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
+
+class LLMValueCache:
+    """
+    LLM이 생성한 컬럼 값 풀을 SQLite에 보관하는 디스크 캐시.
+    풀의 위치는 행 번호와 같고, 청크가 채운 행 범위별 조각으로 저장됩니다.
+    TTL은 풀을 마지막으로 채운 시각부터 계산하며(채울 때마다 풀 전체를 갱신), 지난 풀은 조회 시 삭제합니다.
+    전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 조각부터 제거합니다.
+    """
+
+    def __init__(self, path=CACHE_PATH, max_bytes=CACHE_MAX_BYTES, ttl_seconds=CACHE_TTL_SECONDS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._init_lock = threading.Lock()
+        self._initialized = False
+        self._fill_locks = {}
+
+    def _connect(self):
+        # 여러 스레드/프로세스에서 접근하므로 호출마다 연결을 엽니다.
+        conn = sqlite3.connect(self.path, timeout=30)
+        if not self._initialized:
+            with self._init_lock:
+                if not self._initialized:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                    self._initialized = True
+        return conn
+
+    def _delete_pool(self, conn, cache_key):
+        conn.execute("DELETE FROM pool_segments WHERE cache_key = ?", (cache_key,))
+        conn.execute("DELETE FROM pool_hashes WHERE cache_key = ?", (cache_key,))
+
+    def read_rows(self, cache_key, start, count):
+        """
+        풀의 [start, start + count) 위치 값을 반환합니다. 채워지지 않은 위치는 None.
+        풀이 만료되었으면 삭제하고 모두 None을 반환합니다.
+        """
+        conn = self._connect()
+        try:
+            rows = conn.execute(
+                "SELECT chunk_start, values_json, filled_at FROM pool_segments "
+                "WHERE cache_key = ? AND chunk_start < ? AND chunk_start + value_count > ?",
+                (cache_key, start + count, start)
+            ).fetchall()
+            values = [None] * count
+            if not rows:
+                return values
+            now = time.time()
+            if self.ttl_seconds and now - max(row[2] for row in rows) > self.ttl_seconds:
+                self._delete_pool(conn, cache_key)
+                conn.commit()
+                return values
+            for chunk_start, values_json, _ in rows:
+                for position, value in enumerate(json.loads(values_json), chunk_start):
+                    if value is not None and start <= position < start + count:
+                        values[position - start] = value
+            conn.execute(
+                "UPDATE pool_segments SET last_access = ? "
+                "WHERE cache_key = ? AND chunk_start < ? AND chunk_start + value_count > ?",
+                (now, cache_key, start + count, start)
+            )
+            conn.commit()
+            return values
+        finally:
+            conn.close()
+
+    def known_values(self, cache_key, keys):
+        """dedup_key 목록 중 풀의 다른 위치에 이미 저장된 키의 집합을 반환합니다."""
+        hashes = {value_hash(key): key for key in keys}
+        known = set()
+        conn = self._connect()
+        try:
+            hash_list = list(hashes)
+            for i in range(0, len(hash_list), _HASH_QUERY_BATCH):
+                batch = hash_list[i:i + _HASH_QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                for (found,) in conn.execute(
+                    f"SELECT value_hash FROM pool_hashes WHERE cache_key = ? AND value_hash IN ({placeholders})",
+                    (cache_key, *batch)
+                ):
+                    known.add(hashes[found])
+        finally:
+            conn.close()
+        return known
+
+    @contextlib.contextmanager
+    def fill_lock(self, cache_key, chunk_start):
+        """
+        풀의 같은 행 범위를 채우는 스레드/프로세스를 한 번에 하나로 제한합니다.
+        다른 범위를 맡은 샤드는 기다리지 않고, 범위 간 중복은 put_segment가 해시로 검사합니다.
+        잠금 파일은 해제할 때 삭제합니다.
+        """
+        lock_name = f"{cache_key}-{chunk_start}"
+        with self._init_lock:
+            entry = self._fill_locks.setdefault(lock_name, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                if fcntl is None:
+                    yield
+                    return
+                lock_dir = os.path.join(os.path.dirname(self.path) or '.', 'locks')
+                os.makedirs(lock_dir, exist_ok=True)
+                lock_path = os.path.join(lock_dir, f"{lock_name}.lock")
+                while True:
+                    lock_file = open(lock_path, 'a')
+                    fcntl.flock(lock_file, fcntl.LOCK_EX)
+                    try:
+                        # 기다리는 동안 앞선 프로세스가 파일을 지웠으면 새 파일로 다시 잠금
+                        if os.stat(lock_path).st_ino == os.fstat(lock_file.fileno()).st_ino:
+                            break
+                    except FileNotFoundError:
+                        pass
+                    lock_file.close()
+                try:
+                    yield
+                finally:
+                    try:
+                        os.unlink(lock_path)
+                    except FileNotFoundError:
+                        pass
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+                    lock_file.close()
+        finally:
+            with self._init_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    del self._fill_locks[lock_name]
+
+    def put_segment(self, cache_key, chunk_start, values, column_name=None):
+        """
+        chunk_start 위치부터의 값 조각을 저장(덮어쓰기)하고 값 해시를 등록합니다.
+        풀의 다른 위치에 같은 값이 이미 있으면 그 위치를 None으로 저장하고 조각 안의 인덱스로 반환합니다.
+        조각 하나가 max_bytes보다 크면 저장하지 않고 경고를 출력합니다.
+
+        Returns:
+            list: 다른 위치와 중복되어 저장하지 않은 값의 인덱스
+        """
+        values = list(values)
+        hashes = [None if value is None else value_hash(dedup_key(value)) for value in values]
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            duplicates = []
+            for i, hashed in enumerate(hashes):
+                if hashed is None:
+                    continue
+                existing = conn.execute(
+                    "SELECT row_number FROM pool_hashes WHERE cache_key = ? AND value_hash = ?", (cache_key, hashed)
+                ).fetchone()
+                if existing is None:
+                    conn.execute("INSERT INTO pool_hashes VALUES (?, ?, ?)", (cache_key, hashed, chunk_start + i))
+                elif existing[0] != chunk_start + i:
+                    duplicates.append(i)
+                    values[i] = None
+
+            values_json = json.dumps(values, ensure_ascii=False)
+            size_bytes = len(values_json.encode('utf-8'))
+            if self.max_bytes and size_bytes > self.max_bytes:
+                conn.rollback()
+                print(f"LLM 캐시 경고 ({column_name}): 값 풀 조각 {size_bytes:,}바이트가 캐시 한도 "
+                      f"{self.max_bytes:,}바이트보다 커서 저장하지 않습니다. (LLM_CACHE_MAX_BYTES 또는 청크 크기 조정)")
+                metrics.inc('datagen_llm_cache_skipped_total')
+                return []
+
+            conn.execute(
+                "INSERT OR REPLACE INTO pool_segments VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (cache_key, chunk_start, column_name, values_json, len(values), size_bytes, now, now)
+            )
+            # 채우는 중인 풀은 만료되지 않도록 풀 전체의 TTL 기준 시각을 갱신
+            conn.execute("UPDATE pool_segments SET filled_at = ? WHERE cache_key = ?", (now, cache_key))
+            self._evict(conn)
+            conn.commit()
+            return duplicates
+        except BaseException:
+            conn.rollback()
+            raise
+        finally:
+            conn.close()
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size_bytes), 0) FROM pool_segments").fetchone()[0]
+        if not self.max_bytes or total <= self.max_bytes:
+            return
+        for cache_key, chunk_start, value_count, size_bytes in conn.execute(
+            "SELECT cache_key, chunk_start, value_count, size_bytes FROM pool_segments ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM pool_segments WHERE cache_key = ? AND chunk_start = ?", (cache_key, chunk_start))
+            conn.execute(
+                "DELETE FROM pool_hashes WHERE cache_key = ? AND row_number >= ? AND row_number < ?",
+                (cache_key, chunk_start, chunk_start + value_count)
+            )
+            total -= size_bytes
+
+    def clear(self):
+        conn = self._connect()
+        try:
+            conn.execute("DELETE FROM pool_segments")
+            conn.execute("DELETE FROM pool_hashes")
+            conn.commit()
+        finally:
+            conn.close()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+def get_default_cache():
+    """설정에 따른 프로세스 기본 캐시를 반환합니다. 비활성화되어 있으면 None."""
+    global _default_cache
+    if not CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _default_cache_lock:
+            if _default_cache is None:
+                cache_dir = os.path.dirname(CACHE_PATH)
+                if cache_dir and not os.path.exists(cache_dir):
+                    os.makedirs(cache_dir, exist_ok=True)
+                _default_cache = LLMValueCache()
+    return _default_cache
@@ -0,0 +1,291 @@
+# local_llm.py
+import json
+import os
+import random
+import re
+import threading
+import time
+import zlib
+from collections import defaultdict
+
+import dependency_analyzer as da
+
+# 값 생성 프롬프트 형식 (data_generator._generate_distinct_llm_values의 build_prompt)
+VALUES_PROMPT_PATTERN = re.compile(r"Generate (\d+) realistic examples for column '([^']*)': ?(.*)")
+MODEL_JSON_PATTERN = re.compile(r"```json\s*([\s\S]+?)\s*```")
+
+# 마르코프 체인 학습용 문장 (컬럼 설명/이름의 키워드로 말뭉치 선택)
+CORPORA = {
+    'review': [
+        "배송이 생각보다 빨라서 정말 만족스러워요",
+        "가격 대비 품질이 좋아서 재구매 의사 있어요",
+        "포장이 꼼꼼해서 선물용으로도 좋을 것 같아요",
+        "사진보다 색감이 조금 어둡지만 전체적으로 만족해요",
+        "사이즈가 딱 맞고 착용감이 편해서 좋아요",
+        "처음에는 냄새가 조금 났지만 금방 빠졌어요",
+        "배송은 느렸지만 제품 품질은 정말 좋아요",
+        "생각보다 크기가 작아서 조금 아쉬워요",
+        "디자인이 예쁘고 마감이 깔끔해서 마음에 들어요",
+        "가족 모두 만족해서 하나 더 주문했어요",
+        "품질이 기대 이하라서 조금 실망했어요",
+        "설명서가 자세해서 조립이 어렵지 않았어요",
+    ],
+    'product': [
+        "프리미엄 무선 블루투스 이어폰",
+        "초경량 접이식 캠핑 의자",
+        "유기농 무농약 제주 감귤",
+        "스테인리스 진공 보온 텀블러",
+        "저소음 무선 기계식 키보드",
+        "천연 가죽 슬림 카드 지갑",
+        "대용량 스마트 공기청정기",
+        "프리미엄 유기농 그래놀라 세트",
+        "초경량 방수 등산 재킷",
+        "무선 고속 충전 거치대",
+    ],
+    'generic': [
+        "고객 만족을 위해 서비스 품질을 꾸준히 개선하고 있습니다",
+        "이번 분기 신규 회원 수가 크게 증가했습니다",
+        "담당자가 확인 후 빠르게 처리할 예정입니다",
+        "요청하신 내용은 다음 주까지 반영될 예정입니다",
+        "재고가 부족하여 일부 주문이 지연되고 있습니다",
+        "신규 기능 출시 이후 사용량이 꾸준히 늘고 있습니다",
+        "정기 점검으로 인해 일부 서비스 이용이 제한됩니다",
+        "문의하신 상품은 현재 정상적으로 판매 중입니다",
+    ],
+}
+CORPUS_KEYWORDS = (
+    ('review', ('review', 'comment', '리뷰', '후기', '댓글', '의견', 'feedback')),
+    ('product', ('product', 'item', 'title', '상품', '제품', '이름', 'name')),
+)
+
+
+def _build_chain(sentences):
+    chain = defaultdict(list)
+    starts = []
+    for sentence in sentences:
+        words = sentence.split()
+        starts.append(words[0])
+        for current, following in zip(words, words[1:] + [None]):
+            chain[current].append(following)
+    return starts, dict(chain)
+
+CHAINS = {name: _build_chain(sentences) for name, sentences in CORPORA.items()}
+
+
+def estimate_tokens(text):
+    """토큰 수 추정 (문자 4개당 1토큰, 최소 1)."""
+    return max(1, (len(text) + 3) // 4)
+
+def _corpus_for(column_text):
+    lowered = column_text.lower()
+    for name, keywords in CORPUS_KEYWORDS:
+        if any(keyword in lowered for keyword in keywords):
+            return name
+    return 'generic'
+
+def markov_text(rng, corpus='generic', max_words=12):
+    """마르코프 체인으로 문장 하나를 만듭니다. (문장 끝에 도달하거나 max_words 단어까지)"""
+    starts, chain = CHAINS[corpus]
+    word = rng.choice(starts)
+    words = [word]
+    while len(words) < max_words:
+        word = rng.choice(chain[word])
+        if word is None:
+            break
+        words.append(word)
+    return " ".join(words)
+
+
+class LocalBackend:
+    """
+    네트워크 없이 응답하는 결정적 LLM 백엔드 (gemini_service 백엔드 인터페이스 구현).
+    API 할당량 없이 전체 앱의 LLM 경로를 고동시성으로 부하 테스트하기 위한 용도입니다.
+
+    - 값 생성 프롬프트에는 요청한 개수만큼 마르코프 체인 문장을 JSON 배열로 응답
+    - 모델 분석에는 dependency_analyzer 결과로 만든 마크다운 요약, 대화에는 템플릿 응답과 예시 모델을 스트리밍
+    - 같은 seed와 같은 요청 순서면 같은 응답/같은 오류가 나옴 (프롬프트별 호출 횟수를 난수 시드에 포함)
+    - 토큰 수는 estimate_tokens로 계산하고, 출력이 max_output_tokens를 넘으면 실제 모델처럼 잘림
+
+    Args:
+        latency (float): 요청당 고정 지연 시간 (초)
+        latency_per_token (float): 출력 토큰당 추가 지연 시간 (초)
+        failure_rate (float): 요청이 실패할 확률 (0~1)
+        failure_kinds (tuple): 실패 유형. timeout, quota, error(예외) 또는 blocked(안전 필터 응답) 중에서 고름
+        seed (int): 응답/실패 주입 난수 시드
+        max_output_tokens (int): 요청당 최대 출력 토큰 수
+    """
+
+    name = 'local'
+    available = True
+    unavailable_message = ""
+
+    FAILURE_MESSAGES = {
+        'timeout': "504 Deadline Exceeded: request timeout (local backend)",
+        'quota': "429 Resource has been exhausted: quota exceeded (local backend)",
+        'error': "500 Internal error (local backend)",
+    }
+
+    def __init__(self, latency=0.05, latency_per_token=0.0, failure_rate=0.0,
+                 failure_kinds=('timeout', 'quota', 'error'), seed=0, max_output_tokens=2048):
+        unknown = set(failure_kinds) - set(self.FAILURE_MESSAGES) - {'blocked'}
+        if unknown:
+            raise ValueError(f"알 수 없는 실패 유형입니다: {', '.join(sorted(unknown))}")
+        self.latency = latency
+        self.latency_per_token = latency_per_token
+        self.failure_rate = failure_rate
+        self.failure_kinds = tuple(failure_kinds)
+        self.seed = seed
+        self.max_output_tokens = max_output_tokens
+        self.calls = 0
+        self.failures = 0
+        self._prompt_calls = {}
+        self._failure_rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, max_output_tokens=2048):
+        """LOCAL_LLM_* 환경 변수로 설정합니다."""
+        failure_kinds = os.getenv('LOCAL_LLM_FAILURE_KINDS', 'timeout,quota,error')
+        return cls(
+            latency=float(os.getenv('LOCAL_LLM_LATENCY', 0.05)),
+            latency_per_token=float(os.getenv('LOCAL_LLM_LATENCY_PER_TOKEN', 0.0)),
+            failure_rate=float(os.getenv('LOCAL_LLM_FAILURE_RATE', 0.0)),
+            failure_kinds=tuple(kind.strip() for kind in failure_kinds.split(',') if kind.strip()),
+            seed=int(os.getenv('LOCAL_LLM_SEED', 0)),
+            max_output_tokens=max_output_tokens,
+        )
+
+    def _begin(self, prompt):
+        """호출 횟수를 세고, 실패 유형(없으면 None)과 응답 생성용 난수 생성기를 반환합니다."""
+        with self._lock:
+            self.calls += 1
+            call_index = self._prompt_calls.get(prompt, 0)
+            self._prompt_calls[prompt] = call_index + 1
+            failure = None
+            if self.failure_rate and self._failure_rng.random() < self.failure_rate:
+                failure = self._failure_rng.choice(self.failure_kinds)
+                self.failures += 1
+        rng = random.Random(f"{self.seed}:{zlib.crc32(prompt.encode('utf-8')):08x}:{call_index}")
+        return failure, rng
+
+    def _wait(self, output_tokens, timeout):
+        delay = self.latency + self.latency_per_token * output_tokens
+        if timeout is not None and delay > timeout:
+            time.sleep(timeout)
+            raise TimeoutError(self.FAILURE_MESSAGES['timeout'])
+        time.sleep(delay)
+
+    def _fail(self, failure, timeout):
+        if failure == 'timeout':
+            self._wait(0, None)
+            raise TimeoutError(self.FAILURE_MESSAGES['timeout'])
+        self._wait(0, timeout)
+        raise RuntimeError(self.FAILURE_MESSAGES[failure])
+
+    def _truncate(self, text):
+        return text[:self.max_output_tokens * 4]
+
+    def check_connection(self):
+        return {"status": "ok", "message": "로컬 LLM 백엔드 사용 중 (오프라인)"}
+
+    def generate_content(self, prompt, timeout):
+        failure, rng = self._begin(prompt)
+        prompt_tokens = estimate_tokens(prompt)
+        if failure == 'blocked':
+            self._wait(0, timeout)
+            return {
+                "status": "blocked",
+                "text": "Safety settings blocked the response.",
+                "prompt_tokens": prompt_tokens,
+                "candidates_tokens": 0,
+                "total_tokens": prompt_tokens
+            }
+        if failure:
+            self._fail(failure, timeout)
+
+        match = VALUES_PROMPT_PATTERN.search(prompt)
+        if match:
+            num_values, column_text = int(match.group(1)), f"{match.group(2)} {match.group(3)}"
+            corpus = _corpus_for(column_text)
+            max_words = 4 if corpus == 'product' else 10
+            values, seen = [], set()
+            while len(values) < num_values:
+                value = markov_text(rng, corpus, max_words)
+                if value in seen:
+                    value = f"{value} {len(values) + 1}"
+                seen.add(value)
+                values.append(value)
+            text = json.dumps(values, ensure_ascii=False)
+        else:
+            text = " ".join(markov_text(rng) for _ in range(3))
+
+        text = self._truncate(text)
+        candidates_tokens = estimate_tokens(text)
+        self._wait(candidates_tokens, timeout)
+        return {
+            "status": "ok",
+            "text": text,
+            "prompt_tokens": prompt_tokens,
+            "candidates_tokens": candidates_tokens,
+            "total_tokens": prompt_tokens + candidates_tokens
+        }
+
+    def analyze(self, prompt, timeout):
+        failure, _ = self._begin(prompt)
+        if failure == 'blocked':
+            raise RuntimeError("Response blocked by safety filter (local backend)")
+        if failure:
+            self._fail(failure, timeout)
+
+        match = MODEL_JSON_PATTERN.search(prompt)
+        model = json.loads(match.group(1)) if match else {}
+        info = da.analyze_model(model)
+        tables = [table.get('table_name') for table in model.get('tables', []) if table.get('table_name')]
+        lines = ["**핵심 테이블**: " + (", ".join(tables) or "없음"), "", "**관계**:"]
+        relations = [
+            f"- {child} → {parent}"
+            for child, parents in info['dependencies'].items() for parent in parents
+        ]
+        lines.extend(relations or ["- 테이블 간 참조 관계가 없습니다."])
+        lines.append("")
+        if info['cycles']:
+            lines.append(f"**생성 순서**: 순환 참조가 있습니다 ({da.describe_cycles(info['cycles'])})")
+        else:
+            lines.append("**생성 순서**: " + " → ".join(info['order']))
+        text = self._truncate("\n".join(lines))
+        self._wait(estimate_tokens(text), timeout)
+        return text
+
+    def stream_chat(self, messages, timeout):
+        last_user = next((message for message in reversed(messages) if message.get('role') == 'user'), None)
+        prompt = last_user['parts'][0] if last_user else ""
+        failure, rng = self._begin(prompt)
+        if failure == 'blocked':
+            raise RuntimeError("Response blocked by safety filter (local backend)")
+        if failure:
+            self._fail(failure, timeout)
+
+        model = {"tables": [
+            {"table_name": "users", "columns": [
+                {"column_name": "user_id", "data_type": "INT", "description": "사용자 ID"},
+                {"column_name": "name", "data_type": "VARCHAR(100)", "description": "사용자 이름"},
+            ]},
+            {"table_name": "orders", "columns": [
+                {"column_name": "order_id", "data_type": "INT", "description": "주문 ID"},
+                {"column_name": "user_id", "data_type": "INT", "description": "주문한 사용자"},
+                {"column_name": "memo", "data_type": "TEXT", "description": "[LLM] 주문 메모"},
+            ]},
+        ]}
+        text = self._truncate(
+            f"요청하신 내용을 바탕으로 모델을 제안합니다. {markov_text(rng)}.\n\n"
+            f"```json\n{json.dumps(model, ensure_ascii=False, indent=2)}\n```"
+        )
+        # 단어 단위로 나눠 스트리밍 (첫 조각 전에 고정 지연, 이후 토큰당 지연)
+        self._wait(0, timeout)
+        for piece in re.findall(r"\S+\s*|\s+", text):
+            if self.latency_per_token:
+                time.sleep(self.latency_per_token * estimate_tokens(piece))
+            yield piece
+
+    def count_tokens(self, contents):
+        return sum(estimate_tokens(str(content)) for content in contents)
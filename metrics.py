@@ -0,0 +1,223 @@
+# metrics.py
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# 지표 정의: 이름 -> (유형, 설명, 라벨 이름)
+METRICS = {
+    'datagen_table_seconds_total': ('counter', "테이블 행 생성에 걸린 시간 (초)", ('table',)),
+    'datagen_table_rows_total': ('counter', "생성한 행 수", ('table',)),
+    'datagen_column_seconds_total': ('counter', "컬럼 값 생성에 걸린 시간 (초)", ('table', 'column', 'rule')),
+    'datagen_column_rows_total': ('counter', "컬럼별 생성한 값 수", ('table', 'column', 'rule')),
+    'datagen_llm_request_seconds': ('histogram', "Gemini 요청 지연 시간 (초, 동시 요청 한도 대기 제외)", ('status',)),
+    'datagen_llm_queue_seconds': ('histogram', "LLM 동시 요청 한도 대기 시간 (초)", ()),
+    'datagen_llm_retries_total': ('counter', "LLM 요청 재시도 횟수", ('reason',)),
+    'datagen_llm_fallbacks_total': ('counter', "LLM 생성 실패로 Faker로 대체한 횟수 (컬럼, 청크 단위)", ('column',)),
+    'datagen_llm_tokens_total': ('counter', "LLM 토큰 사용량", ('kind',)),
+    'datagen_llm_values_total': ('counter', "LLM 컬럼 값 수 (캐시 재사용/새로 생성)", ('source',)),
+    'datagen_llm_cache_skipped_total': ('counter', "캐시 한도보다 커서 저장하지 않은 LLM 값 풀 조각 수", ()),
+    'datagen_write_seconds_total': ('counter', "출력 파일 쓰기 시간 (초)", ('table', 'format')),
+    'datagen_bytes_written_total': ('counter', "출력 파일에 기록한 바이트 수", ('table', 'format')),
+    'datagen_writer_stall_seconds_total': ('counter', "기록 큐가 가득 차 청크 생성이 기다린 시간 (초)", ('table',)),
+    'datagen_retained_key_bytes': ('gauge', "자식 테이블용으로 보관 중인 부모 키 컬럼 크기 (바이트)", ()),
+    'datagen_jobs': ('gauge', "상태별 생성 작업 수", ('status',)),
+}
+
+# 히스토그램 버킷 상한 (초)
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+class MetricsRegistry:
+    """
+    카운터/게이지/히스토그램 모음. 여러 스레드에서 함께 갱신할 수 있습니다.
+    워커 프로세스는 drain()으로 누적분을 꺼내 부모 프로세스로 보내고, 부모는 merge()로 합칩니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = {}
+        self._histograms = {}
+
+    @staticmethod
+    def _key(name, labels):
+        return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def inc(self, name, value=1, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set(self, name, value, **labels):
+        with self._lock:
+            self._values[self._key(name, labels)] = value
+
+    def observe(self, name, value, **labels):
+        key = self._key(name, labels)
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = [[0] * (len(LATENCY_BUCKETS) + 1), 0.0, 0, 0.0]
+            histogram[0][bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+            histogram[1] += value
+            histogram[2] += 1
+            histogram[3] = max(histogram[3], value)
+
+    @staticmethod
+    def _export(values, histograms):
+        return {
+            'values': [[name, list(map(list, labels)), value] for (name, labels), value in values.items()],
+            'histograms': [
+                [name, list(map(list, labels)), list(buckets), total, count, maximum]
+                for (name, labels), (buckets, total, count, maximum) in histograms.items()
+            ],
+        }
+
+    def snapshot(self):
+        """프로세스 간 전달 가능한 형태(리스트/dict)로 복사합니다."""
+        with self._lock:
+            return self._export(self._values, self._histograms)
+
+    def drain(self):
+        """스냅샷을 반환하고 비웁니다."""
+        with self._lock:
+            values, histograms = self._values, self._histograms
+            self._values, self._histograms = {}, {}
+        return self._export(values, histograms)
+
+    def merge(self, snapshot):
+        """다른 레지스트리의 스냅샷을 더합니다. (게이지는 덮어씀)"""
+        with self._lock:
+            for name, labels, value in snapshot.get('values', []):
+                key = (name, tuple(map(tuple, labels)))
+                if METRICS.get(name, ('counter',))[0] == 'gauge':
+                    self._values[key] = value
+                else:
+                    self._values[key] = self._values.get(key, 0) + value
+            for name, labels, buckets, total, count, maximum in snapshot.get('histograms', []):
+                key = (name, tuple(map(tuple, labels)))
+                histogram = self._histograms.get(key)
+                if histogram is None:
+                    self._histograms[key] = [list(buckets), total, count, maximum]
+                    continue
+                histogram[0] = [a + b for a, b in zip(histogram[0], buckets)]
+                histogram[1] += total
+                histogram[2] += count
+                histogram[3] = max(histogram[3], maximum)
+
+    def reset(self):
+        with self._lock:
+            self._values, self._histograms = {}, {}
+
+    def render_prometheus(self):
+        """Prometheus 텍스트 형식(0.0.4)으로 출력합니다."""
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: (list(buckets), total, count) for key, (buckets, total, count, _) in self._histograms.items()}
+
+        lines = []
+        for name, (metric_type, help_text, _) in METRICS.items():
+            series = sorted((labels, value) for (metric_name, labels), value in values.items() if metric_name == name)
+            hist_series = sorted(
+                (labels, data) for (metric_name, labels), data in histograms.items() if metric_name == name
+            )
+            if not series and not hist_series:
+                continue
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for labels, value in series:
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+            for labels, (buckets, total, count) in hist_series:
+                cumulative = 0
+                for upper, bucket_count in zip(LATENCY_BUCKETS + ('+Inf',), buckets):
+                    cumulative += bucket_count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', str(upper)),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(total)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def table_summary(self, table_name):
+        """
+        SSE 'metrics' 이벤트용 테이블 요약: 컬럼별 생성 시간/처리량, LLM 지연 시간, 재시도/대체 횟수, 쓰기 시간/바이트.
+        """
+        with self._lock:
+            values = dict(self._values)
+            histograms = {key: list(data) for key, data in self._histograms.items()}
+
+        def labeled(name):
+            return [(dict(labels), value) for (metric_name, labels), value in values.items() if metric_name == name]
+
+        def table_total(name):
+            return sum(value for labels, value in labeled(name) if labels.get('table') == table_name)
+
+        columns = {}
+        for labels, seconds in labeled('datagen_column_seconds_total'):
+            if labels.get('table') == table_name:
+                columns[labels['column']] = {'rule': labels['rule'], 'seconds': round(seconds, 4)}
+        for labels, rows in labeled('datagen_column_rows_total'):
+            column = columns.get(labels.get('column')) if labels.get('table') == table_name else None
+            if column is not None:
+                column['rows_per_sec'] = int(rows / column['seconds']) if column['seconds'] > 0 else None
+
+        llm_count, llm_total, llm_max, llm_errors = 0, 0.0, 0.0, 0
+        for (metric_name, labels), (_, total, count, maximum) in histograms.items():
+            if metric_name == 'datagen_llm_request_seconds':
+                llm_count += count
+                llm_total += total
+                llm_max = max(llm_max, maximum)
+                if dict(labels).get('status') != 'ok':
+                    llm_errors += count
+
+        rows = table_total('datagen_table_rows_total')
+        seconds = table_total('datagen_table_seconds_total')
+        return {
+            'rows': rows,
+            'generate_seconds': round(seconds, 4),
+            'rows_per_sec': int(rows / seconds) if seconds > 0 else None,
+            'columns': columns,
+            'llm': {
+                'requests': llm_count,
+                'errors': llm_errors,
+                'latency_avg': round(llm_total / llm_count, 4) if llm_count else None,
+                'latency_max': round(llm_max, 4) if llm_count else None,
+                'retries': sum(value for _, value in labeled('datagen_llm_retries_total')),
+                'fallbacks': sum(value for _, value in labeled('datagen_llm_fallbacks_total')),
+                'cache_skipped': sum(value for _, value in labeled('datagen_llm_cache_skipped_total')),
+            },
+            'write': {
+                'seconds': round(table_total('datagen_write_seconds_total'), 4),
+                'bytes': table_total('datagen_bytes_written_total'),
+                'stall_seconds': round(table_total('datagen_writer_stall_seconds_total'), 4),
+            },
+        }
+
+
+def _escape_label_value(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape_label_value(value)}"' for key, value in labels) + "}"
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+# 프로세스 기본 레지스트리 (워커 프로세스는 청크마다 drain해 부모로 보냄)
+registry = MetricsRegistry()
+
+def inc(name, value=1, **labels):
+    registry.inc(name, value, **labels)
+
+def observe(name, value, **labels):
+    registry.observe(name, value, **labels)
+
+@contextmanager
+def timed(name, **labels):
+    """블록 실행 시간(초)을 카운터 name에 더합니다."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        registry.inc(name, time.perf_counter() - started, **labels)
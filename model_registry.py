@@ -0,0 +1,132 @@
+# model_registry.py
+import json
+import os
+import threading
+from collections import OrderedDict
+
+import analysis_cache
+import dependency_analyzer as da
+
+# 파싱한 모델을 메모리에 보관할 최대 개수 (LRU)
+MODEL_CACHE_SIZE = int(os.getenv('MODEL_CACHE_SIZE', 128))
+# 생성기 화면에 표시할 모델 파일 이름 형식
+MODEL_FILE_PREFIX = 'model_'
+MODEL_FILE_SUFFIX = '.json'
+
+
+class ModelEntry:
+    """
+    파싱된 모델 파일 하나. (path, mtime, size)가 같으면 다시 읽지 않고 재사용합니다.
+    model은 여러 요청이 함께 쓰는 객체이므로 수정하면 안 됩니다.
+    """
+
+    def __init__(self, filename, model_str, model, stat_key):
+        self.filename = filename
+        self.model_str = model_str
+        self.model = model
+        self.stat_key = stat_key
+        self._content_hash = None
+        self._dependency_info = None
+
+    @property
+    def content_hash(self):
+        """analysis_cache의 캐시 키 (처음 요청할 때 한 번만 계산)."""
+        if self._content_hash is None:
+            self._content_hash = analysis_cache.model_content_hash(self.model_str)
+        return self._content_hash
+
+    @property
+    def dependency_info(self):
+        """da.analyze_model 결과 (처음 요청할 때 한 번만 계산)."""
+        if self._dependency_info is None:
+            self._dependency_info = da.analyze_model(self.model)
+        return self._dependency_info
+
+
+class ModelRegistry:
+    """
+    models/ 디렉터리의 모델 파일 목록과 파싱 결과를 캐시합니다.
+
+    - 목록: 디렉터리 mtime이 바뀔 때만 다시 스캔 (파일 추가/삭제/이름 변경 시)
+    - 모델: 파일의 mtime/크기가 바뀔 때만 다시 파싱. 같은 모델을 반복 요청하면 stat 한 번으로 끝남
+    """
+
+    def __init__(self, models_dir, cache_size=MODEL_CACHE_SIZE):
+        self.models_dir = models_dir
+        self.cache_size = cache_size
+        self._entries = OrderedDict()
+        self._index = None
+        self._index_key = None
+        self._lock = threading.Lock()
+
+    def _path(self, filename):
+        # models/ 밖의 파일은 열지 않음
+        if not filename or os.path.basename(filename) != filename or filename.startswith('.'):
+            raise FileNotFoundError(filename)
+        return os.path.join(self.models_dir, filename)
+
+    @staticmethod
+    def _stat_key(stat_result):
+        return (stat_result.st_mtime_ns, stat_result.st_size)
+
+    def list_models(self):
+        """생성기에 표시할 모델 파일 이름 목록 (이름순)."""
+        try:
+            index_key = self._stat_key(os.stat(self.models_dir))
+        except OSError:
+            return []
+        with self._lock:
+            if self._index is not None and self._index_key == index_key:
+                return list(self._index)
+        with os.scandir(self.models_dir) as entries:
+            names = sorted(
+                entry.name for entry in entries
+                if entry.name.startswith(MODEL_FILE_PREFIX) and entry.name.endswith(MODEL_FILE_SUFFIX) and entry.is_file()
+            )
+        with self._lock:
+            self._index, self._index_key = names, index_key
+        return list(names)
+
+    def get(self, filename):
+        """
+        모델 파일을 캐시에서 반환하고, 없거나 파일이 바뀌었으면 다시 읽습니다.
+
+        Raises:
+            FileNotFoundError: 파일이 없는 경우
+            ValueError: JSON 파싱 오류
+        """
+        path = self._path(filename)
+        stat_key = self._stat_key(os.stat(path))
+        with self._lock:
+            entry = self._entries.get(filename)
+            if entry is not None and entry.stat_key == stat_key:
+                self._entries.move_to_end(filename)
+                return entry
+
+        with open(path, 'r', encoding='utf-8') as f:
+            model_str = f.read()
+        entry = ModelEntry(filename, model_str, json.loads(model_str), stat_key)
+        self._remember(entry)
+        return entry
+
+    def save(self, filename, model):
+        """모델을 저장하고(임시 파일에 쓴 뒤 이름 변경) 캐시와 목록에 바로 반영합니다."""
+        path = self._path(filename)
+        os.makedirs(self.models_dir, exist_ok=True)
+        model_str = json.dumps(model, ensure_ascii=False, indent=4)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(model_str)
+        os.replace(tmp_path, path)
+        entry = ModelEntry(filename, model_str, json.loads(model_str), self._stat_key(os.stat(path)))
+        self._remember(entry)
+        with self._lock:
+            self._index = None
+        return entry
+
+    def _remember(self, entry):
+        with self._lock:
+            self._entries[entry.filename] = entry
+            self._entries.move_to_end(entry.filename)
+            while len(self._entries) > self.cache_size:
+                self._entries.popitem(last=False)
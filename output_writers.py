@@ -0,0 +1,400 @@
+# output_writers.py
+import collections
+import multiprocessing
+import os
+import queue
+import re
+import threading
+import time
+
+# 출력 형식별 파일 확장자
+OUTPUT_FORMATS = {
+    'csv': '.csv',
+    'parquet': '.parquet',
+    'feather': '.arrow',
+}
+
+# 기존 파일 뒤에 이어 쓸 수 있는 형식 (Parquet/Arrow는 파일을 닫을 때 footer를 기록하므로 불가)
+APPENDABLE_FORMATS = ('csv',)
+
+# 형식별 지원 압축 방식 (첫 번째 값이 기본값)
+COMPRESSIONS = {
+    'csv': (None,),
+    'parquet': ('zstd', 'snappy', 'gzip', 'none'),
+    'feather': ('zstd', 'lz4', 'none'),
+}
+
+DECIMAL_TYPE_PATTERN = re.compile(r'(?:decimal|numeric)\s*\(\s*(\d+)\s*,\s*(\d+)\s*\)', re.IGNORECASE)
+
+
+def _require_pyarrow():
+    """Parquet/Arrow 출력에만 필요한 pyarrow를 지연 로딩합니다."""
+    try:
+        import pyarrow
+        return pyarrow
+    except ImportError:
+        raise RuntimeError("Parquet/Arrow 출력에는 pyarrow 패키지가 필요합니다. (pip install pyarrow)")
+
+def output_file_name(table_name, output_format='csv', shard_index=0, shard_count=1):
+    """출력 파일명. 샤드로 나누어 생성하면 'orders.part-00001-of-00004.csv' 형식을 사용합니다."""
+    if shard_count > 1:
+        return f"{table_name}.part-{shard_index:05d}-of-{shard_count:05d}{OUTPUT_FORMATS[output_format]}"
+    return f"{table_name}{OUTPUT_FORMATS[output_format]}"
+
+def resolve_compression(output_format, compression=None):
+    """요청된 압축 방식을 검증하고, 지정하지 않았으면 형식별 기본값을 반환합니다."""
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"지원하지 않는 출력 형식입니다: {output_format} (가능: {', '.join(OUTPUT_FORMATS)})")
+    supported = COMPRESSIONS[output_format]
+    if not compression:
+        return supported[0]
+    if compression not in supported:
+        raise ValueError(f"{output_format} 형식은 '{compression}' 압축을 지원하지 않습니다. (가능: {', '.join(supported)})")
+    return None if compression == 'none' else compression
+
+def _decimal_columns(columns_details):
+    """DECIMAL(p,s)로 선언된 컬럼의 (precision, scale)을 반환합니다."""
+    decimals = {}
+    for col_detail in columns_details or []:
+        match = DECIMAL_TYPE_PATTERN.search(col_detail.get('data_type', ''))
+        if match and col_detail.get('column_name'):
+            decimals[col_detail['column_name']] = (int(match.group(1)), int(match.group(2)))
+    return decimals
+
+
+class CsvTableWriter:
+    """
+    청크를 CSV 파일에 이어 씁니다. BOM과 헤더는 첫 청크에만 기록합니다.
+    header=False면 BOM/헤더 없이 기록하므로, 첫 샤드 뒤에 그대로 이어 붙일 수 있습니다.
+    append=True면 기존 파일 끝에 이어 씁니다. (체크포인트에서 재개)
+    """
+
+    def __init__(self, file_path, columns_details=None, header=True, append=False):
+        self.file_path = file_path
+        self.header = header
+        self.append = append
+        self._chunks_written = 0
+
+    def write(self, df):
+        first_write = self._chunks_written == 0 and not self.append
+        if first_write and self.header:
+            df.to_csv(self.file_path, index=False, encoding='utf-8-sig')
+        else:
+            mode = 'w' if first_write else 'a'
+            df.to_csv(self.file_path, mode=mode, header=False, index=False, encoding='utf-8')
+        self._chunks_written += 1
+
+    def close(self):
+        pass
+
+    @property
+    def bytes_written(self):
+        return os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class _ArrowTableWriter:
+    """
+    Arrow 기반 writer 공통 로직.
+    첫 청크로 스키마를 정하고(DECIMAL 컬럼은 decimal128로 지정), 이후 청크는 같은 스키마로 변환합니다.
+    """
+
+    def __init__(self, file_path, columns_details=None, compression=None):
+        self.pa = _require_pyarrow()
+        self.file_path = file_path
+        self.compression = compression
+        self._decimal_columns = _decimal_columns(columns_details)
+        self._schema = None
+        self._writer = None
+
+    def _to_arrow(self, df):
+        table = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self._schema is None:
+            fields = []
+            for field in table.schema:
+                if field.name in self._decimal_columns and (self.pa.types.is_floating(field.type) or self.pa.types.is_integer(field.type)):
+                    precision, scale = self._decimal_columns[field.name]
+                    field = field.with_type(self.pa.decimal128(precision, scale))
+                elif self.pa.types.is_timestamp(field.type):
+                    # Spark 등 다운스트림 호환을 위해 마이크로초 단위로 저장
+                    field = field.with_type(self.pa.timestamp('us'))
+                elif self.pa.types.is_dictionary(field.type):
+                    # 범주형 컬럼은 일반 문자열 컬럼으로 저장 (Parquet은 어차피 사전 인코딩하고,
+                    # Arrow IPC 파일은 청크마다 사전이 다르면 쓸 수 없음)
+                    field = field.with_type(field.type.value_type)
+                fields.append(field)
+            self._schema = self.pa.schema(fields)
+        for i, field in enumerate(table.schema):
+            target_type = self._schema.field(field.name).type
+            if self.pa.types.is_integer(field.type) and self.pa.types.is_decimal(target_type):
+                # 정수 -> decimal 직접 변환은 precision 제약이 있어 float64를 거쳐 변환
+                table = table.set_column(i, field.name, table.column(i).cast(self.pa.float64()))
+            elif self.pa.types.is_integer(field.type) and self.pa.types.is_integer(target_type) and field.type != target_type:
+                # 첫 청크보다 넓은 정수(범위를 넘어 int32로 줄이지 못한 키 등)는 값이 잘리지 않도록 검사하며 변환
+                table = table.set_column(i, field.name, table.column(i).cast(target_type, safe=True))
+        return table.cast(self._schema, safe=False)
+
+    def write(self, df):
+        table = self._to_arrow(df)
+        if self._writer is None:
+            self._writer = self._open(self._schema)
+        self._write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    @property
+    def bytes_written(self):
+        return os.path.getsize(self.file_path) if os.path.exists(self.file_path) else 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+class ParquetTableWriter(_ArrowTableWriter):
+    """청크 하나를 Parquet row group 하나로 기록합니다."""
+
+    def _open(self, schema):
+        import pyarrow.parquet as pq
+        return pq.ParquetWriter(self.file_path, schema, compression=self.compression or 'none')
+
+    def _write_table(self, table):
+        self._writer.write_table(table, row_group_size=max(table.num_rows, 1))
+
+
+class FeatherTableWriter(_ArrowTableWriter):
+    """청크를 Arrow IPC(Feather v2) 파일의 record batch로 기록합니다."""
+
+    def _open(self, schema):
+        options = self.pa.ipc.IpcWriteOptions(compression=self.compression)
+        return self.pa.ipc.new_file(self.file_path, schema, options=options)
+
+    def _write_table(self, table):
+        self._writer.write_table(table)
+
+
+class _ChunkSink:
+    """기록 스레드/프로세스 안에서 writer를 열고 청크를 기록합니다. 실패한 뒤의 청크는 버립니다."""
+
+    def __init__(self, open_writer, portable_errors=False):
+        self.open_writer = open_writer
+        self.portable_errors = portable_errors
+        self.writer = None
+        self.error = None
+
+    def _fail(self, error):
+        if self.portable_errors:
+            # 프로세스 간에 전달할 수 없는 예외가 있으므로 메시지만 전달
+            error = RuntimeError(f"{type(error).__name__}: {error}")
+        self.error = error
+        return 'failed', error
+
+    def write(self, df):
+        """청크를 기록하고 ack(('written', (기록 시간, 누적 바이트)) 또는 ('failed', 예외))를 반환합니다."""
+        if self.error is not None:
+            return None
+        try:
+            if self.writer is None:
+                self.writer = self.open_writer()
+            started = time.perf_counter()
+            self.writer.write(df)
+            return 'written', (time.perf_counter() - started, self.writer.bytes_written)
+        except Exception as e:
+            return self._fail(e)
+
+    def close(self):
+        ack = None
+        if self.writer is not None:
+            try:
+                self.writer.close()
+            except Exception as e:
+                ack = self._fail(e) if self.error is None else None
+        return ack, ('closed', self.writer.bytes_written if self.writer is not None else 0)
+
+def _consume_chunks(open_writer, requests, acks, portable_errors=False):
+    """기록 스레드/프로세스 본체: requests에서 청크를 꺼내 기록하고 결과를 acks에 넣습니다. (None을 받으면 종료)"""
+    sink = _ChunkSink(open_writer, portable_errors)
+    while True:
+        df = requests.get()
+        if df is None:
+            break
+        ack = sink.write(df)
+        if ack is not None:
+            acks.put(ack)
+    for ack in sink.close():
+        if ack is not None:
+            acks.put(ack)
+
+
+class _DirectAcks:
+    """기록 스레드가 결과를 큐 대신 바로 처리하도록 하는 어댑터"""
+
+    def __init__(self, handle):
+        self.put = handle
+
+
+class BackgroundWriter:
+    """
+    크기 제한 큐를 두고 별도 스레드/프로세스에서 청크를 기록합니다. 생성 쪽은 청크를 큐에 넣고 바로 다음 청크를
+    생성하므로 인코딩/압축/디스크 기록이 다음 청크 생성과 겹쳐 실행됩니다.
+    큐가 가득 차면 write()가 기다리며(backpressure), 기다린 시간은 stall_seconds에 누적됩니다.
+
+    mode:
+        'thread'   기록 스레드 (pyarrow처럼 GIL을 놓는 writer에 적합)
+        'process'  기록 프로세스 (pandas CSV 인코딩처럼 GIL을 잡는 writer. 청크는 pickle되어 전달)
+        'sync'     write()에서 바로 기록 (max_queue가 0일 때도 같음)
+
+    open_writer()는 기록하는 쪽에서 table writer를 엽니다. (process 모드에서는 pickle 가능해야 함)
+    청크 기록이 끝날 때마다 on_written(기록 시간, 누적 바이트, *context)를 write() 순서대로 호출합니다.
+    (체크포인트/진행 이벤트처럼 기록이 끝난 뒤에 해야 하는 일. context는 이 프로세스에만 보관)
+    """
+
+    def __init__(self, open_writer, on_written=None, max_queue=2, mode='thread'):
+        self.on_written = on_written
+        self.stall_seconds = 0.0
+        self.bytes_written = 0
+        self._error = None
+        self._contexts = collections.deque()
+        self._done = threading.Event()
+        self._worker = None
+        self._dispatcher = None
+        if mode == 'sync' or max_queue <= 0:
+            self._sink, self._requests = _ChunkSink(open_writer), None
+        elif mode == 'process':
+            context = multiprocessing.get_context()
+            self._requests = context.Queue(maxsize=max_queue)
+            acks = context.Queue()
+            self._worker = context.Process(target=_consume_chunks, args=(open_writer, self._requests, acks, True),
+                                           name='chunk-writer', daemon=True)
+            self._worker.start()
+            self._dispatcher = threading.Thread(target=self._dispatch, args=(acks,), name='chunk-writer-acks', daemon=True)
+            self._dispatcher.start()
+        elif mode == 'thread':
+            self._requests = queue.Queue(maxsize=max_queue)
+            self._worker = threading.Thread(target=_consume_chunks, args=(open_writer, self._requests, _DirectAcks(self._handle)),
+                                            name='chunk-writer', daemon=True)
+            self._worker.start()
+        else:
+            raise ValueError(f"지원하지 않는 기록 방식입니다: {mode}")
+
+    @property
+    def queue_depth(self):
+        """아직 기록이 끝나지 않은 청크 수 (기록 중인 청크 포함)"""
+        return len(self._contexts)
+
+    def _handle(self, ack):
+        kind, payload = ack
+        if kind == 'failed':
+            self._error = self._error or payload
+        elif kind == 'closed':
+            self.bytes_written = payload
+            self._done.set()
+        elif self._error is None:
+            seconds, self.bytes_written = payload
+            context = self._contexts.popleft()
+            if self.on_written is not None:
+                try:
+                    self.on_written(seconds, self.bytes_written, *context)
+                except Exception as e:
+                    self._error = e
+
+    def _dispatch(self, acks):
+        """기록 프로세스의 결과를 받아 처리합니다. (프로세스가 비정상 종료하면 오류로 기록)"""
+        while not self._done.is_set():
+            try:
+                self._handle(acks.get(timeout=0.5))
+            except queue.Empty:
+                if not self._worker.is_alive():
+                    self._error = self._error or RuntimeError(f"기록 프로세스가 종료되었습니다. (exit code {self._worker.exitcode})")
+                    self._done.set()
+
+    def _put(self, item):
+        while True:
+            try:
+                self._requests.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                if not self._worker.is_alive() or self._done.is_set():
+                    raise self._error or RuntimeError("기록 스레드/프로세스가 종료되었습니다.")
+
+    def write(self, df, *context):
+        if self._error is not None:
+            raise self._error
+        self._contexts.append(context)
+        if self._requests is None:
+            ack = self._sink.write(df)
+            if ack is not None:
+                self._handle(ack)
+            return
+        try:
+            self._requests.put_nowait(df)
+        except queue.Full:
+            started = time.perf_counter()
+            self._put(df)
+            self.stall_seconds += time.perf_counter() - started
+
+    def close(self):
+        """큐에 남은 청크를 모두 기록하고 writer를 닫을 때까지 기다립니다. 기록 중 오류가 있었으면 다시 발생시킵니다."""
+        if self._requests is None:
+            for ack in self._sink.close():
+                if ack is not None:
+                    self._handle(ack)
+        elif self._worker is not None:
+            if self._worker.is_alive():
+                self._put(None)
+            self._worker.join()
+            if self._dispatcher is not None:
+                self._dispatcher.join()
+            self._worker = None
+        if self._error is not None:
+            raise self._error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+            return
+        # 생성 중 오류/취소: 이미 넘긴 청크는 기록하고 원래 예외를 그대로 전달
+        try:
+            self.close()
+        except Exception:
+            pass
+
+
+def open_table_writer(output_dir, table_name, output_format='csv', compression=None, columns_details=None,
+                      shard_index=0, shard_count=1, append=False):
+    """
+    테이블 하나(또는 그 샤드 하나)를 청크 단위로 기록할 writer를 생성합니다.
+
+    Args:
+        output_dir (str): 출력 디렉터리
+        table_name (str): 테이블 이름 (파일명으로 사용)
+        output_format (str): 'csv' | 'parquet' | 'feather'
+        compression (str): 압축 방식 (None이면 형식별 기본값)
+        columns_details (list): 모델의 컬럼 정의 (DECIMAL 정밀도 등 타입 매핑에 사용)
+        shard_index (int), shard_count (int): 샤드 번호/개수. CSV는 첫 샤드에만 헤더를 기록하므로
+            샤드 파일을 순서대로 이어 붙이면 단일 실행 결과와 바이트 단위로 같습니다.
+            Parquet/Arrow 샤드는 각각 완결된 파일이며 데이터셋으로 함께 읽으면 됩니다.
+        append (bool): 기존 파일 뒤에 이어 쓰기 (APPENDABLE_FORMATS만 지원)
+    """
+    compression = resolve_compression(output_format, compression)
+    if append and output_format not in APPENDABLE_FORMATS:
+        raise ValueError(f"{output_format} 형식은 기존 파일에 이어 쓸 수 없습니다.")
+    file_path = os.path.join(output_dir, output_file_name(table_name, output_format, shard_index, shard_count))
+    if output_format == 'parquet':
+        return ParquetTableWriter(file_path, columns_details, compression)
+    if output_format == 'feather':
+        return FeatherTableWriter(file_path, columns_details, compression)
+    return CsvTableWriter(file_path, columns_details, header=shard_index == 0, append=append)
@@ -0,0 +1,84 @@
+# tests/conftest.py
+import copy
+import hashlib
+import os
+import sys
+
+# 테스트는 네트워크/API 키 없이 실행: 로컬 LLM 백엔드, LLM 값 캐시 끔 (모듈 import 전에 설정)
+os.environ.setdefault('LLM_BACKEND', 'local')
+os.environ.setdefault('LLM_CACHE_ENABLED', '0')
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+import dependency_analyzer as da
+import generation_runner as runner
+
+REFERENCE_TIME = '2026-01-01T00:00:00'
+
+# LLM 컬럼이 없는 이커머스 모델 (users -> orders -> order_items <- products, reviews)
+ECOMMERCE_MODEL = {"tables": [
+    {"table_name": "users", "columns": [
+        {"column_name": "user_id", "data_type": "INT", "description": "사용자 ID"},
+        {"column_name": "name", "data_type": "VARCHAR(100)", "description": "이름"},
+        {"column_name": "email", "data_type": "VARCHAR(100)", "description": "이메일"},
+        {"column_name": "created_at", "data_type": "TIMESTAMP", "description": "가입일"},
+    ]},
+    {"table_name": "products", "columns": [
+        {"column_name": "product_id", "data_type": "INT", "description": "상품 ID"},
+        {"column_name": "product_name", "data_type": "VARCHAR(100)", "description": "상품명"},
+        {"column_name": "price", "data_type": "DECIMAL(10,2)", "description": "가격"},
+        {"column_name": "category", "data_type": "VARCHAR(50)", "description": "카테고리"},
+    ]},
+    {"table_name": "orders", "columns": [
+        {"column_name": "order_id", "data_type": "INT", "description": "주문 ID"},
+        {"column_name": "user_id", "data_type": "INT", "description": "사용자"},
+        {"column_name": "order_date", "data_type": "TIMESTAMP", "description": "주문일"},
+        {"column_name": "status", "data_type": "VARCHAR(20)", "description": "상태"},
+    ]},
+    {"table_name": "order_items", "columns": [
+        {"column_name": "order_item_id", "data_type": "INT", "description": "ID"},
+        {"column_name": "order_id", "data_type": "INT", "description": "주문"},
+        {"column_name": "product_id", "data_type": "INT", "description": "상품"},
+        {"column_name": "quantity", "data_type": "INT", "description": "수량"},
+    ]},
+    {"table_name": "reviews", "columns": [
+        {"column_name": "review_id", "data_type": "INT", "description": "ID"},
+        {"column_name": "user_id", "data_type": "INT", "description": "사용자"},
+        {"column_name": "product_id", "data_type": "INT", "description": "상품"},
+        {"column_name": "rating", "data_type": "INT", "description": "평점"},
+        {"column_name": "created_at", "data_type": "TIMESTAMP", "description": "작성일"},
+    ]},
+]}
+
+QUANTITIES = {"users": 700, "products": 60, "orders": 1500, "order_items": 2600, "reviews": 400}
+
+
+@pytest.fixture
+def model():
+    return copy.deepcopy(ECOMMERCE_MODEL)
+
+def generate(model, output_dir, quantities=QUANTITIES, options=None, **kwargs):
+    """run_generation을 끝까지 실행하고 마지막 이벤트(complete 또는 cancelled)를 반환합니다."""
+    kwargs.setdefault('chunk_size', 250)
+    kwargs.setdefault('seed', 42)
+    kwargs.setdefault('reference_time', REFERENCE_TIME)
+    kwargs.setdefault('max_workers', 2)
+    final_event = None
+    for event in runner.run_generation(model, da.get_generation_levels(model), quantities, options or {},
+                                       output_dir=str(output_dir), **kwargs):
+        final_event = event
+    return final_event
+
+def table_bytes(output_dir, table_name):
+    """테이블의 CSV 출력(샤드 파일이면 순서대로 이어 붙인 내용)을 반환합니다."""
+    files = sorted(name for name in os.listdir(output_dir) if name.split('.')[0] == table_name)
+    content = b''
+    for name in files:
+        with open(os.path.join(output_dir, name), 'rb') as f:
+            content += f.read()
+    return content
+
+def output_digest(output_dir, table_names):
+    return {name: hashlib.sha256(table_bytes(output_dir, name)).hexdigest() for name in table_names}
@@ -0,0 +1,44 @@
+# tests/test_analysis_cache.py
+import json
+
+import pytest
+
+import analysis_cache
+import gemini_service
+
+from conftest import ECOMMERCE_MODEL
+
+
+@pytest.fixture
+def analyzed(tmp_path, monkeypatch):
+    """Gemini 분석 요청으로 보낸 모델 JSON 목록."""
+    requests = []
+
+    def get_model_analysis_and_strategy(model_json_str):
+        requests.append(model_json_str)
+        return {"status": "ok", "analysis": f"분석 {len(requests)}"}
+
+    monkeypatch.setattr(gemini_service, 'get_model_analysis_and_strategy', get_model_analysis_and_strategy)
+    monkeypatch.setattr(analysis_cache, 'ANALYSIS_CACHE_DIR', str(tmp_path / 'analysis'))
+    monkeypatch.setattr(analysis_cache, '_memory_cache', type(analysis_cache._memory_cache)())
+    return requests
+
+
+def test_large_models_are_simplified_under_the_original_key(analyzed):
+    tables = [dict(table, table_name=f"{table['table_name']}_{i}") for i in range(3) for table in ECOMMERCE_MODEL['tables']]
+    model_str = json.dumps({"tables": tables, "notes": "x" * analysis_cache.ANALYSIS_MAX_MODEL_CHARS}, ensure_ascii=False)
+    content_key = analysis_cache.model_content_hash(model_str)
+
+    first = analysis_cache.get_model_analysis(model_str, content_key)
+    sent = json.loads(analyzed[0])
+    assert [table['table_name'] for table in sent['tables']] == [table['table_name'] for table in tables[:analysis_cache.ANALYSIS_MAX_TABLES]]
+    assert 'notes' not in sent
+
+    # 데이터 생성 경로(get_model_analysis_text)도 같은 키로 캐시된 결과를 사용
+    assert analysis_cache.get_model_analysis_text(model_str, content_key) == first['analysis']
+    assert len(analyzed) == 1
+
+def test_small_models_are_sent_unchanged(analyzed):
+    model_str = json.dumps(ECOMMERCE_MODEL, ensure_ascii=False)
+    analysis_cache.get_model_analysis(model_str)
+    assert analyzed == [model_str]
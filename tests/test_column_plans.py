@@ -0,0 +1,139 @@
+# tests/test_column_plans.py
+import numpy as np
+import pandas as pd
+import pytest
+from faker import Faker
+
+import column_plans as cp
+import data_generator as dg
+
+FAKE = Faker('ko_KR')
+
+
+def _generate(column_detail, num_rows, options=None, table_name='users', start_index=1, seed=0):
+    generator = cp.compile_column_plan(table_name, column_detail, options)
+    return generator, generator.generate(num_rows, {}, np.random.default_rng(seed), FAKE, start_index)
+
+
+def test_compiled_plan_is_cached_per_definition():
+    column = {"column_name": "email", "data_type": "VARCHAR(100)", "description": "이메일"}
+    assert cp.compile_column_plan('users', column) is cp.compile_column_plan('users', dict(column))
+    assert cp.compile_column_plan('users', column, {'unique': True}) is not cp.compile_column_plan('users', column)
+
+
+@pytest.mark.parametrize("column, rule, dtype", [
+    ({"column_name": "user_id", "data_type": "INT"}, 'primary_key', 'int32'),
+    ({"column_name": "email", "data_type": "VARCHAR(100)"}, 'faker:email', cp.STRING_DTYPE),
+    ({"column_name": "status", "data_type": "VARCHAR(20)"}, 'status', cp.STRING_DTYPE),
+    ({"column_name": "quantity", "data_type": "SMALLINT"}, 'quantity', 'int16'),
+    ({"column_name": "created_at", "data_type": "TIMESTAMP"}, 'datetime:last_2_years', cp.DATETIME_DTYPE),
+    ({"column_name": "total", "data_type": "DECIMAL(10,2)"}, 'decimal', 'float64'),
+])
+def test_rule_and_dtype_matching(column, rule, dtype):
+    generator = cp.compile_column_plan('users', column)
+    assert generator.rule == rule
+    assert generator.dtype == dtype
+
+
+def test_vectorized_columns_have_declared_dtypes():
+    _, ids = _generate({"column_name": "user_id", "data_type": "INT"}, 100, start_index=501)
+    assert ids.dtype == np.int32
+    assert ids.tolist() == list(range(501, 601))
+
+    _, quantities = _generate({"column_name": "quantity", "data_type": "INT"}, 1000)
+    assert quantities.dtype == np.int32
+    assert quantities.min() >= 1 and quantities.max() <= 10
+
+    _, dates = _generate({"column_name": "order_date", "data_type": "DATE"}, 100,
+                         options={"startDate": "2024-01-01", "endDate": "2024-12-31"})
+    assert dates.dtype == np.dtype(cp.DATETIME_DTYPE)
+    assert dates.min() >= pd.Timestamp('2024-01-01') and dates.max() <= pd.Timestamp('2024-12-31')
+
+    _, statuses = _generate({"column_name": "status", "data_type": "VARCHAR(20)"}, 100)
+    assert isinstance(statuses, pd.Categorical)
+    assert set(statuses) <= set(cp.STATUS_VALUES)
+
+
+def test_same_seed_generates_same_values():
+    column = {"column_name": "status", "data_type": "VARCHAR(20)"}
+    _, first = _generate(column, 500, seed=3)
+    _, second = _generate(column, 500, seed=3)
+    assert list(first) == list(second)
+
+
+def test_options_list_and_range():
+    _, values = _generate({"column_name": "grade", "data_type": "VARCHAR(5)"}, 200, options={"list": ["A", "B", "C"]})
+    assert set(values) <= {"A", "B", "C"}
+    _, values = _generate({"column_name": "score", "data_type": "INT"}, 200, options={"min": 50, "max": 60})
+    assert values.min() >= 50 and values.max() <= 60
+
+
+def test_describe_table_plan_reports_rules():
+    columns = [{"column_name": "user_id", "data_type": "INT"}, {"column_name": "bio", "data_type": "TEXT", "description": "[LLM] 소개"}]
+    described = cp.describe_table_plan(cp.build_table_plan('users', columns))
+    assert [column['rule'] for column in described] == ['primary_key', 'llm']
+
+
+# --- 고유 값 컬럼 ---
+def test_permute_rows_is_a_bijection():
+    for domain, split in ((10_000, None), (1_000_003, None), (36 ** 4, 36 ** 2), (10 ** 6, 10 ** 3)):
+        values = cp.permute_rows(np.arange(domain), domain, salt=12345, split=split)
+        assert values.min() >= 0 and values.max() < domain
+        assert len(np.unique(values)) == domain
+
+def test_permute_rows_rejects_rows_beyond_domain():
+    with pytest.raises(ValueError):
+        cp.permute_rows(np.arange(11), 10)
+
+
+@pytest.mark.parametrize("column, options", [
+    ({"column_name": "email", "data_type": "VARCHAR(100)", "description": "이메일 [UNIQUE]"}, None),
+    ({"column_name": "phone", "data_type": "VARCHAR(20) UNIQUE"}, None),
+    ({"column_name": "nickname", "data_type": "VARCHAR(30)"}, {"unique": True, "type": "name"}),
+    ({"column_name": "member_no", "data_type": "INT"}, {"unique": True}),
+    ({"column_name": "code", "data_type": "BIGINT"}, {"unique": True, "min": 100, "max": 10 ** 12}),
+])
+def test_unique_columns_have_no_duplicates_across_chunks(column, options):
+    generator = cp.compile_column_plan('members', column, options)
+    assert generator.detail.get('unique') is True
+    rng = np.random.default_rng(0)
+    chunks = [generator.generate(5_000, {}, rng, FAKE, start) for start in range(1, 40_001, 5_000)]
+    values = [value for chunk in chunks for value in chunk]
+    assert len(values) == 40_000
+    assert len(set(values)) == len(values)
+
+def test_unique_values_depend_only_on_row_number():
+    generator = cp.compile_column_plan('members', {"column_name": "member_no", "data_type": "INT"}, {"unique": True})
+    whole = generator.generate(1_000, {}, np.random.default_rng(0), None, 1)
+    tail = generator.generate(400, {}, np.random.default_rng(9), None, 601)
+    assert whole[600:].tolist() == tail.tolist()
+
+def test_unique_email_keeps_address_shape():
+    _, values = _generate({"column_name": "email", "data_type": "VARCHAR(100) UNIQUE"}, 1_000)
+    for value in values:
+        local, domain = value.split('@')
+        assert local and '.' in domain
+
+def test_unique_range_keeps_generator_step():
+    column = {"column_name": "price", "data_type": "INT"}
+    plain = cp.compile_column_plan('products', column)
+    unique = cp.compile_column_plan('products', column, {'unique': True})
+    values = unique.generate(unique.detail['capacity'], {}, np.random.default_rng(0), None, 1)
+    assert unique.detail['capacity'] == (plain.detail['max'] - plain.detail['min']) // plain.detail['step'] + 1
+    assert values.min() == plain.detail['min'] and values.max() == plain.detail['max']
+    assert (values % plain.detail['step'] == 0).all()
+    assert len(np.unique(values)) == len(values)
+
+def test_unique_capacity_is_checked_before_generation():
+    columns = [
+        {"column_name": "item_id", "data_type": "INT"},
+        {"column_name": "quantity", "data_type": "INT", "description": "수량 [UNIQUE]"},
+    ]
+    df, _, _ = dg.generate_table_data('items', columns, 10)
+    assert sorted(df['quantity']) == list(range(1, 11))
+    with pytest.raises(ValueError, match='items.quantity'):
+        dg.generate_table_data('items', columns, 11)
+
+def test_unsupported_unique_rule_keeps_original_generator():
+    column = {"column_name": "status", "data_type": "VARCHAR(20)"}
+    assert cp.compile_column_plan('orders', column, {'unique': True}).rule == 'status'
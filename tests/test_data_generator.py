@@ -0,0 +1,46 @@
+# tests/test_data_generator.py
+import numpy as np
+import pandas as pd
+
+import data_generator as dg
+
+ORDER_COLUMNS = [
+    {"column_name": "order_id", "data_type": "INT", "description": "주문 ID"},
+    {"column_name": "user_id", "data_type": "INT", "description": "사용자"},
+    {"column_name": "status", "data_type": "VARCHAR(20)", "description": "상태"},
+    {"column_name": "quantity", "data_type": "INT", "description": "수량"},
+    {"column_name": "total", "data_type": "DECIMAL(10,2)", "description": "금액"},
+    {"column_name": "order_date", "data_type": "TIMESTAMP", "description": "주문일"},
+]
+
+
+def test_table_has_requested_rows_and_column_order():
+    df, _, _ = dg.generate_table_data('orders', ORDER_COLUMNS, 1_000)
+    assert len(df) == 1_000
+    assert list(df.columns) == [c['column_name'] for c in ORDER_COLUMNS]
+    assert df['order_id'].tolist() == list(range(1, 1_001))
+
+def test_rule_based_columns_stay_in_range():
+    df, _, _ = dg.generate_table_data('orders', ORDER_COLUMNS, 2_000)
+    assert df['quantity'].between(1, 10).all()
+    assert set(df['status']) <= {'completed', 'shipped', 'pending', 'cancelled'}
+    assert pd.api.types.is_datetime64_any_dtype(df['order_date'])
+
+def test_foreign_keys_are_drawn_from_parent_table():
+    users = pd.DataFrame({'user_id': np.arange(1, 51)})
+    df, _, _ = dg.generate_table_data('orders', ORDER_COLUMNS, 2_000, related_data={'users': users})
+    assert set(df['user_id']) <= set(range(1, 51))
+
+def test_column_options_override_rules():
+    options = {'orders': {'status': {'list': ['A', 'B']}, 'quantity': {'min': 50, 'max': 60},
+                          'order_date': {'startDate': '2024-01-01', 'endDate': '2024-12-31'}}}
+    df, _, _ = dg.generate_table_data('orders', ORDER_COLUMNS, 500, options=options)
+    assert set(df['status']) <= {'A', 'B'}
+    assert df['quantity'].between(50, 60).all()
+    assert df['order_date'].min() >= pd.Timestamp('2024-01-01')
+    assert df['order_date'].max() <= pd.Timestamp('2024-12-31 23:59:59')
+
+def test_chunks_continue_row_numbers():
+    chunks = [df for df, _, _ in dg.iter_table_chunks('orders', ORDER_COLUMNS, 1_050, chunk_size=200)]
+    assert [len(df) for df in chunks] == [200] * 5 + [50]
+    assert pd.concat(chunks)['order_id'].tolist() == list(range(1, 1_051))
@@ -0,0 +1,72 @@
+# tests/test_foreign_keys.py
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import column_plans as cp
+import foreign_keys as fk
+
+PARENT_KEYS = np.arange(1001, 1501, dtype=np.int32)
+
+
+@pytest.mark.parametrize("params", [
+    {"distribution": "uniform"},
+    {"distribution": "zipf", "skew": 1.3},
+    {"distribution": "fixed", "children_per_parent": 3},
+])
+def test_sampled_keys_are_parent_members(params):
+    index = fk.ForeignKeyIndex(PARENT_KEYS)
+    keys = index.sample(20_000, np.random.default_rng(0), **params)
+    assert len(keys) == 20_000
+    assert np.isin(keys, PARENT_KEYS).all()
+
+def test_fixed_distribution_continues_across_chunks():
+    index = fk.ForeignKeyIndex(PARENT_KEYS)
+    rng = np.random.default_rng(0)
+    whole = index.sample(1_500, rng, distribution='fixed', children_per_parent=3)
+    chunks = [index.sample(300, rng, distribution='fixed', children_per_parent=3, start_index=start)
+              for start in range(1, 1_501, 300)]
+    assert np.concatenate(chunks).tolist() == whole.tolist()
+    assert (np.unique(whole, return_counts=True)[1] == 3).all()
+
+def test_zipf_prefers_few_parents():
+    keys = fk.ForeignKeyIndex(PARENT_KEYS).sample(50_000, np.random.default_rng(0), distribution='zipf', skew=1.5)
+    counts = np.sort(np.unique(keys, return_counts=True)[1])[::-1]
+    assert counts[:10].sum() > 0.5 * len(keys)
+
+def test_mapped_index_matches_in_memory_index(tmp_path):
+    mapped = fk.save_keys(str(tmp_path / 'users_user_id.npy'), PARENT_KEYS)
+    restored = pickle.loads(pickle.dumps(mapped))
+    assert len(pickle.dumps(mapped)) < 1_000
+    in_memory = fk.ForeignKeyIndex(PARENT_KEYS)
+    for params in ({"distribution": "uniform"}, {"distribution": "zipf", "skew": 1.1}):
+        assert (restored.sample(1_000, np.random.default_rng(5), **params).tolist()
+                == in_memory.sample(1_000, np.random.default_rng(5), **params).tolist())
+
+def test_save_keys_skips_non_numeric_keys(tmp_path):
+    assert fk.save_keys(str(tmp_path / 'codes.npy'), np.array(['a', 'b'], dtype=object)) is None
+
+def test_get_foreign_key_index_from_frame_and_mapping(tmp_path):
+    frame = pd.DataFrame({'user_id': PARENT_KEYS})
+    index = fk.get_foreign_key_index({'users': frame}, ('users', 'user'), 'user_id')
+    assert index is fk.get_foreign_key_index({'users': frame}, ('users', 'user'), 'user_id')
+    assert index.keys.tolist() == PARENT_KEYS.tolist()
+
+    mapped = {'user_id': fk.save_keys(str(tmp_path / 'keys.npy'), PARENT_KEYS)}
+    assert fk.get_foreign_key_index({'user': mapped}, ('users', 'user'), 'user_id') is mapped['user_id']
+    assert fk.get_foreign_key_index({}, ('users', 'user'), 'user_id') is None
+    assert fk.get_foreign_key_index({'users': frame.iloc[:0]}, ('users', 'user'), 'user_id') is None
+
+def test_foreign_key_column_uses_distribution_options():
+    column = {"column_name": "user_id", "data_type": "INT"}
+    generator = cp.compile_column_plan('orders', column, {'distribution': 'fixed', 'children_per_parent': 2})
+    assert generator.rule == 'foreign_key'
+    related = {'users': pd.DataFrame({'user_id': PARENT_KEYS})}
+    keys = generator.generate(6, related, np.random.default_rng(0), None, 1)
+    assert keys.tolist() == [1001, 1001, 1002, 1002, 1003, 1003]
+
+def test_invalid_distribution_is_rejected():
+    with pytest.raises(ValueError):
+        fk.parse_distribution_options({'distribution': 'normal'})
@@ -0,0 +1,106 @@
+# tests/test_generation.py
+import io
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+import dependency_analyzer as da
+import generation_runner as runner
+from conftest import QUANTITIES, REFERENCE_TIME, generate, output_digest, table_bytes
+
+# (자식 테이블, 외래 키 컬럼, 부모 테이블)
+FOREIGN_KEYS = [
+    ('orders', 'user_id', 'users'),
+    ('order_items', 'order_id', 'orders'),
+    ('order_items', 'product_id', 'products'),
+    ('reviews', 'user_id', 'users'),
+    ('reviews', 'product_id', 'products'),
+]
+
+
+def _read_table(output_dir, table_name):
+    paths = [os.path.join(output_dir, name) for name in sorted(os.listdir(output_dir)) if name.split('.')[0] == table_name]
+    if paths[0].endswith('.csv'):
+        # CSV 샤드는 첫 샤드에만 헤더가 있으므로 이어 붙인 내용을 읽음
+        return pd.read_csv(io.BytesIO(table_bytes(output_dir, table_name)))
+    return pd.concat([pd.read_parquet(path) for path in paths], ignore_index=True)
+
+
+def test_same_seed_produces_identical_output(model, tmp_path):
+    generate(model, tmp_path / 'a')
+    generate(model, tmp_path / 'b')
+    generate(model, tmp_path / 'c', seed=7)
+    first, second = output_digest(tmp_path / 'a', QUANTITIES), output_digest(tmp_path / 'b', QUANTITIES)
+    assert first == second
+    assert output_digest(tmp_path / 'c', QUANTITIES)['users'] != first['users']
+
+@pytest.mark.parametrize("chunk_size", [333, 10_000])
+def test_row_counts_and_primary_keys_span_chunks(model, tmp_path, chunk_size):
+    final_event = generate(model, tmp_path, chunk_size=chunk_size)
+    assert final_event['type'] == 'complete'
+    for table_name, rows in QUANTITIES.items():
+        df = _read_table(tmp_path, table_name)
+        assert len(df) == rows
+        assert df.iloc[:, 0].tolist() == list(range(1, rows + 1))
+
+@pytest.mark.parametrize("shard_count", [2, 3])
+def test_concatenated_shards_equal_single_process_output(model, tmp_path, shard_count):
+    generate(model, tmp_path / 'single')
+    generate(model, tmp_path / 'sharded', shard_count=shard_count)
+    assert any('.part-' in name for name in os.listdir(tmp_path / 'sharded'))
+    assert output_digest(tmp_path / 'sharded', QUANTITIES) == output_digest(tmp_path / 'single', QUANTITIES)
+
+@pytest.mark.parametrize("mode", ['sync', 'thread', 'process'])
+def test_writer_modes_produce_identical_output(model, tmp_path, monkeypatch, mode):
+    generate(model, tmp_path / 'sync')
+    monkeypatch.setattr(runner, 'WRITER_MODE', mode)
+    generate(model, tmp_path / mode)
+    assert output_digest(tmp_path / mode, QUANTITIES) == output_digest(tmp_path / 'sync', QUANTITIES)
+
+@pytest.mark.parametrize("output_format", ['csv', 'parquet'])
+def test_foreign_keys_reference_existing_parents(model, tmp_path, output_format):
+    options = {"reviews": {"user_id": {"distribution": "zipf", "skew": 1.2}},
+               "order_items": {"order_id": {"distribution": "fixed", "children_per_parent": 2}}}
+    generate(model, tmp_path, options=options, output_format=output_format, shard_count=2)
+    tables = {name: _read_table(tmp_path, name) for name in QUANTITIES}
+    for child, column, parent in FOREIGN_KEYS:
+        parent_keys = set(tables[parent][column])
+        assert set(tables[child][column]) <= parent_keys, f"{child}.{column}"
+
+def test_unique_columns_are_unique_across_chunks_and_shards(model, tmp_path):
+    model['tables'][0]['columns'].append({"column_name": "phone", "data_type": "VARCHAR(20) UNIQUE", "description": "전화"})
+    options = {"users": {"email": {"unique": True}, "name": {"unique": True}}}
+    quantities = {"users": 5_000}
+    generate(model, tmp_path / 'single', quantities=quantities, options=options, chunk_size=700)
+    generate(model, tmp_path / 'sharded', quantities=quantities, options=options, chunk_size=700, shard_count=3)
+    users = _read_table(tmp_path / 'single', 'users')
+    for column in ('email', 'name', 'phone'):
+        assert users[column].is_unique, column
+    assert table_bytes(tmp_path / 'sharded', 'users') == table_bytes(tmp_path / 'single', 'users')
+
+def test_unique_column_with_too_small_range_fails_before_writing(model, tmp_path):
+    options = {"order_items": {"quantity": {"unique": True}}}
+    with pytest.raises(ValueError, match='order_items.quantity'):
+        generate(model, tmp_path, options=options)
+    assert not os.listdir(tmp_path)
+
+def test_resumed_generation_equals_uninterrupted_run(model, tmp_path):
+    generate(model, tmp_path / 'full')
+
+    output_dir, checkpoint_dir = tmp_path / 'resumed', tmp_path / 'checkpoint'
+    cancel_event = threading.Event()
+    events = []
+    for event in runner.run_generation(model, da.get_generation_levels(model), QUANTITIES, {},
+                                       output_dir=str(output_dir), chunk_size=250, seed=42, reference_time=REFERENCE_TIME,
+                                       max_workers=2, cancel_event=cancel_event, checkpoint_dir=str(checkpoint_dir)):
+        events.append(event)
+        if event['type'] == 'progress' and event['table'] == 'orders':
+            cancel_event.set()
+    assert events[-1]['type'] == 'cancelled'
+    assert table_bytes(output_dir, 'order_items') == b''
+
+    final_event = generate(model, output_dir, checkpoint_dir=str(checkpoint_dir))
+    assert final_event['type'] == 'complete'
+    assert output_digest(output_dir, QUANTITIES) == output_digest(tmp_path / 'full', QUANTITIES)
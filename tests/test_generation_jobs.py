@@ -0,0 +1,70 @@
+# tests/test_generation_jobs.py
+import os
+import subprocess
+import sys
+import textwrap
+from datetime import datetime
+
+import checkpoints
+import dependency_analyzer as da
+import generation_jobs
+
+
+def _write_partial_job(output_root, job_id):
+    checkpoint_dir = os.path.join(output_root, 'jobs', f"{job_id}.partial", generation_jobs.CHECKPOINT_DIR_NAME)
+    checkpoints.save_job_manifest(checkpoint_dir, {'job_id': job_id, 'model_name': 'model.json', 'job_quantities': {'users': 10}})
+    return checkpoint_dir
+
+def _hold_owner(checkpoint_dir):
+    """다른 서버 프로세스가 작업을 실행 중인 상태를 흉내 냅니다."""
+    code = textwrap.dedent(f"""
+        import sys, checkpoints
+        handle = checkpoints.acquire_job_owner({checkpoint_dir!r})
+        print('locked' if handle else 'busy', flush=True)
+        sys.stdin.read()
+    """)
+    process = subprocess.Popen([sys.executable, '-c', code], stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+                               cwd=os.path.dirname(os.path.abspath(checkpoints.__file__)))
+    assert process.stdout.readline().strip() == 'locked'
+    return process
+
+
+def test_jobs_owned_by_a_live_process_are_not_adopted(tmp_path):
+    checkpoint_dir = _write_partial_job(str(tmp_path), 'running')
+    owner = _hold_owner(checkpoint_dir)
+    try:
+        assert checkpoints.job_owner_alive(checkpoint_dir)
+        manager = generation_jobs.JobManager(str(tmp_path))
+        assert manager.get('running') is None
+        assert checkpoints.acquire_job_owner(checkpoint_dir) is None
+    finally:
+        owner.communicate('')
+    assert not checkpoints.job_owner_alive(checkpoint_dir)
+    job = generation_jobs.JobManager(str(tmp_path)).get('running')
+    assert job.status == 'interrupted' and job.resumable
+
+def test_discard_keeps_jobs_taken_over_by_another_process(tmp_path):
+    checkpoint_dir = _write_partial_job(str(tmp_path), 'taken')
+    manager = generation_jobs.JobManager(str(tmp_path))
+    owner = _hold_owner(checkpoint_dir)
+    try:
+        assert not manager.discard('taken')
+        assert os.path.exists(checkpoint_dir)
+    finally:
+        owner.communicate('')
+    assert manager.discard('taken')
+    assert not os.path.exists(os.path.dirname(checkpoint_dir))
+
+def test_reference_time_is_truncated_only_for_seeded_jobs(model, tmp_path, monkeypatch):
+    manager = generation_jobs.JobManager(str(tmp_path))
+    started = []
+    monkeypatch.setattr(manager, '_start', lambda job, manifest, model_analysis: started.append(manifest))
+    levels = da.get_generation_levels(model)
+    submitted_at = datetime.now().replace(microsecond=0)
+    for seed in (7, None):
+        job = manager.submit('model.json', model, levels, {'users': 10}, {}, seed=seed)
+        checkpoints.release_job_owner(job.owner)
+    seeded, unseeded = (datetime.fromisoformat(manifest['run_kwargs']['reference_time']) for manifest in started)
+    assert seeded == submitted_at.replace(hour=0, minute=0, second=0)
+    assert unseeded >= submitted_at
+    assert started[1]['run_kwargs']['seed'] is not None
@@ -0,0 +1,118 @@
+# tests/test_llm_values.py
+import json
+import os
+import re
+import time
+
+import pytest
+
+import data_generator as dg
+import gemini_service
+import llm_cache
+import local_llm
+
+COLUMN = {"column_name": "comment", "data_type": "TEXT", "description": "[LLM] 상품 리뷰 내용"}
+
+
+@pytest.fixture
+def backend():
+    local = local_llm.LocalBackend(latency=0)
+    previous = gemini_service.set_backend(local)
+    yield local
+    gemini_service.set_backend(previous)
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    value_cache = llm_cache.LLMValueCache(str(tmp_path / 'llm_values.sqlite3'))
+    monkeypatch.setattr(llm_cache, 'get_default_cache', lambda: value_cache)
+    return value_cache
+
+def _stored_pool(cache, count):
+    return cache.read_rows(llm_cache.make_cache_key(COLUMN, "", dg.LLM_PROMPT_VERSION), 0, count)
+
+
+def test_cached_pool_is_reused_without_llm_calls(backend, cache):
+    first, _, _ = dg.generate_llm_data_with_fallback(COLUMN, 5)
+    calls = backend.calls
+    stats = {}
+    again, prompt_tokens, _ = dg.generate_llm_data_with_fallback(COLUMN, 5, stats=stats)
+    assert again == first
+    assert backend.calls == calls
+    assert prompt_tokens == 0
+    assert stats == {'llm_cached_values': 5, 'llm_generated_values': 0}
+
+def test_pool_positions_follow_row_numbers(backend, cache):
+    first, _, _ = dg.generate_llm_data_with_fallback(COLUMN, 5, pool_offset=0)
+    later, _, _ = dg.generate_llm_data_with_fallback(COLUMN, 5, pool_offset=40)
+    pool = _stored_pool(cache, 45)
+    assert pool[0:5] == first
+    assert pool[40:45] == later
+    assert pool[5:40] == [None] * 35
+    # 새로 생성한 값은 풀에 있던 값과 겹치지 않음
+    assert not set(first) & set(later)
+
+def test_segments_reject_values_stored_at_other_rows(cache):
+    assert cache.put_segment('key', 0, ['a', 'b', None]) == []
+    assert cache.put_segment('key', 3, ['c', 'a', 'd']) == [1]
+    assert cache.read_rows('key', 0, 6) == ['a', 'b', None, 'c', None, 'd']
+    # 같은 위치에 다시 저장하는 값은 중복이 아님
+    assert cache.put_segment('key', 0, ['a', 'b', 'e']) == []
+    assert cache.known_values('key', ['a', 'e', 'z']) == {'a', 'e'}
+
+def test_filling_refreshes_pool_ttl(cache):
+    cache.ttl_seconds = 60
+    cache.put_segment('key', 0, ['a'])
+    time.sleep(0.01)
+    filled_at = time.time()
+    cache.put_segment('key', 1, ['b'])
+    with cache._connect() as conn:
+        assert all(row[0] >= filled_at for row in conn.execute("SELECT filled_at FROM pool_segments"))
+    cache.ttl_seconds = 0.001
+    time.sleep(0.01)
+    assert cache.read_rows('key', 0, 2) == [None, None]
+    assert cache.known_values('key', ['a', 'b']) == set()
+
+def test_oversized_segment_is_reported_and_skipped(cache, capsys):
+    cache.max_bytes = 10
+    assert cache.put_segment('key', 0, ['x' * 20], column_name='comment') == []
+    assert '캐시 한도' in capsys.readouterr().out
+    assert cache.read_rows('key', 0, 1) == [None]
+
+def test_fill_lock_removes_lock_file(cache):
+    lock_dir = os.path.join(os.path.dirname(cache.path), 'locks')
+    with cache.fill_lock('key', 0):
+        assert os.listdir(lock_dir) == ['key-0.lock']
+    assert os.listdir(lock_dir) == []
+    assert cache._fill_locks == {}
+
+def test_cache_key_changes_with_column_definition():
+    other = dict(COLUMN, description="[LLM] 배송 문의 내용")
+    assert llm_cache.make_cache_key(COLUMN, "", 1) != llm_cache.make_cache_key(other, "", 1)
+    assert llm_cache.make_cache_key(COLUMN, "", 1) != llm_cache.make_cache_key(COLUMN, "", 2)
+
+def test_local_backend_is_deterministic_and_injects_failures():
+    prompt = "Generate 8 realistic examples for column 'comment': 상품 리뷰 내용"
+    first = local_llm.LocalBackend(latency=0, seed=3).generate_content(prompt, timeout=1)
+    second = local_llm.LocalBackend(latency=0, seed=3).generate_content(prompt, timeout=1)
+    assert first == second
+    assert len(json.loads(first['text'])) == 8
+
+    failing = local_llm.LocalBackend(latency=0, failure_rate=1.0, failure_kinds=('blocked',))
+    assert failing.generate_content(prompt, timeout=1)['status'] == 'blocked'
+    assert failing.failures == 1
+
+def test_chunks_without_cache_do_not_repeat_values(monkeypatch):
+    monkeypatch.setattr(llm_cache, 'get_default_cache', lambda: None)
+    next_value = [0]
+
+    def request_llm_batch(prompt, max_retries):
+        # 요청한 개수만큼의 새 값 앞에 직전 응답의 마지막 값 3개를 다시 붙여 돌려주는 LLM
+        count = int(re.search(r"Generate (\d+)", prompt).group(1))
+        start, next_value[0] = next_value[0], next_value[0] + count
+        return [f"리뷰 {i}" for i in range(max(start - 3, 0), start + count)], 10, 10
+
+    monkeypatch.setattr(dg, '_request_llm_batch', request_llm_batch)
+    columns = [{"column_name": "review_id", "data_type": "INT"}, COLUMN]
+    comments = [value for df, _, _ in dg.iter_table_chunks('reviews', columns, 40, chunk_size=10) for value in df['comment']]
+    assert len(comments) == 40
+    assert len(set(comments)) == len(comments)
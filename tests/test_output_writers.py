@@ -0,0 +1,78 @@
+# tests/test_output_writers.py
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import output_writers as ow
+
+COLUMNS = [
+    {"column_name": "order_id", "data_type": "INT"},
+    {"column_name": "status", "data_type": "VARCHAR(20)"},
+    {"column_name": "total", "data_type": "DECIMAL(10,2)"},
+    {"column_name": "ordered_at", "data_type": "TIMESTAMP"},
+]
+
+
+def _chunk(start, rows, key_dtype=np.int32):
+    return pd.DataFrame({
+        "order_id": np.arange(start, start + rows, dtype=key_dtype),
+        "status": pd.Categorical.from_codes(np.arange(rows) % 2, categories=['pending', 'shipped']),
+        "total": np.arange(rows) / 4,
+        "ordered_at": pd.to_datetime(np.arange(rows) * 3600 + 1_700_000_000, unit='s'),
+    })
+
+
+@pytest.mark.parametrize("output_format", ['parquet', 'feather'])
+def test_arrow_writers_round_trip_chunks(tmp_path, output_format):
+    # 두 번째 청크는 첫 청크보다 넓은 정수 dtype (int32로 줄이지 못한 키)
+    chunks = [_chunk(1, 100), _chunk(101, 50, key_dtype=np.int64)]
+    with ow.open_table_writer(str(tmp_path), 'orders', output_format, columns_details=COLUMNS) as writer:
+        for chunk in chunks:
+            writer.write(chunk)
+    path = os.path.join(tmp_path, ow.output_file_name('orders', output_format))
+    df = pd.read_parquet(path) if output_format == 'parquet' else pd.read_feather(path)
+    assert df['order_id'].tolist() == list(range(1, 151))
+    assert df['status'].astype(str).tolist() == [str(v) for chunk in chunks for v in chunk['status']]
+    assert [float(v) for v in df['total']] == [v for chunk in chunks for v in chunk['total']]
+    assert df['ordered_at'].tolist() == [v for chunk in chunks for v in chunk['ordered_at']]
+
+def test_csv_writer_writes_header_once(tmp_path):
+    with ow.open_table_writer(str(tmp_path), 'orders', columns_details=COLUMNS) as writer:
+        writer.write(_chunk(1, 10))
+        writer.write(_chunk(11, 10))
+    df = pd.read_csv(tmp_path / 'orders.csv')
+    assert df['order_id'].tolist() == list(range(1, 21))
+
+def test_csv_shards_concatenate_to_single_file(tmp_path):
+    with ow.CsvTableWriter(str(tmp_path / 'single.csv')) as writer:
+        writer.write(_chunk(1, 10))
+        writer.write(_chunk(11, 10))
+    for shard_index, start in enumerate((1, 11)):
+        with ow.open_table_writer(str(tmp_path), 'orders', shard_index=shard_index, shard_count=2) as writer:
+            writer.write(_chunk(start, 10))
+    shard_files = sorted(name for name in os.listdir(tmp_path) if name.startswith('orders.part-'))
+    assert len(shard_files) == 2
+    sharded = b''.join(open(os.path.join(tmp_path, name), 'rb').read() for name in shard_files)
+    assert sharded == open(tmp_path / 'single.csv', 'rb').read()
+
+def test_unknown_compression_is_rejected():
+    with pytest.raises(ValueError):
+        ow.resolve_compression('parquet', 'rar')
+
+@pytest.mark.parametrize("mode", ['sync', 'thread', 'process'])
+def test_background_writer_reports_chunks_in_order(tmp_path, mode):
+    written = []
+    open_writer = lambda: ow.CsvTableWriter(str(tmp_path / f'{mode}.csv'))
+    with ow.BackgroundWriter(open_writer, on_written=lambda seconds, size, index: written.append((index, size)),
+                             max_queue=2, mode=mode) as writer:
+        for index in range(5):
+            writer.write(_chunk(index * 10 + 1, 10), index)
+    assert [index for index, _ in written] == list(range(5))
+    assert written[-1][1] == os.path.getsize(tmp_path / f'{mode}.csv')
+    assert len(pd.read_csv(tmp_path / f'{mode}.csv')) == 50
+
+def test_appending_to_arrow_formats_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        ow.open_table_writer(str(tmp_path), 'orders', 'parquet', append=True)